@@ -11,7 +11,7 @@ require_once __DIR__ . '/../helpers/code.php';
 header('Content-Type: application/json; charset=utf-8');
 header('Access-Control-Allow-Origin: *');
 header('Access-Control-Allow-Methods: GET, POST, OPTIONS');
-header('Access-Control-Allow-Headers: Content-Type, X-PIN-Code');
+header('Access-Control-Allow-Headers: Content-Type, X-PIN-Code, X-Sync-Key');
 
 if ($_SERVER['REQUEST_METHOD'] === 'OPTIONS') {
     http_response_code(204);
@@ -70,6 +70,15 @@ function verify_pin_if_needed(array $document, ?string $pin): void
     }
 }
 
+function require_sync_key(): void
+{
+    $expected = (string) (app_config()['sync_key'] ?? '');
+    $given = (string) ($_SERVER['HTTP_X_SYNC_KEY'] ?? '');
+    if ($expected === '' || !hash_equals($expected, $given)) {
+        json_response(['status' => 'error', 'message' => 'Доступ запрещен'], 403);
+    }
+}
+
 function log_verification(PDO $pdo, int $documentId, string $publicCode, string $status): void
 {
     $stmt = $pdo->prepare(
@@ -118,4 +127,44 @@ function fetch_document_by_code(PDO $pdo, string $publicCode): ?array
     return $doc;
 }
 
+function fetch_documents_by_codes(PDO $pdo, array $publicCodes): array
+{
+    if (!$publicCodes) {
+        return [];
+    }
+    $placeholders = implode(',', array_fill(0, count($publicCodes), '?'));
+    $stmt = $pdo->prepare(
+        "SELECT id, public_code, internal_code, document_type, issuer, issue_date, expiry_date, status, metadata, pin_hash 
+         FROM documents 
+         WHERE public_code IN ($placeholders)"
+    );
+    $stmt->execute(array_values($publicCodes));
 
+    $documents = [];
+    foreach ($stmt->fetchAll() as $doc) {
+        $doc['metadata'] = normalize_metadata($doc['metadata']);
+        $documents[$doc['public_code']] = $doc;
+    }
+    return $documents;
+}
+
+function log_verifications_batch(PDO $pdo, array $rows): void
+{
+    if (!$rows) {
+        return;
+    }
+    $ip = $_SERVER['REMOTE_ADDR'] ?? null;
+    $ua = $_SERVER['HTTP_USER_AGENT'] ?? null;
+
+    $placeholders = [];
+    $params = [];
+    foreach ($rows as [$documentId, $publicCode, $status]) {
+        $placeholders[] = '(?, ?, ?, ?, ?)';
+        array_push($params, $documentId, $publicCode, $status, $ip, $ua);
+    }
+    $stmt = $pdo->prepare(
+        'INSERT INTO verifications (document_id, public_code_used, status, ip_address, user_agent) 
+         VALUES ' . implode(', ', $placeholders)
+    );
+    $stmt->execute($params);
+}
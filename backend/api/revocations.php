@@ -0,0 +1,80 @@
+<?php
+/**
+ * Подписанный фильтр отозванных и недействительных документов для офлайн-режима.
+ *
+ * GET, заголовок If-None-Match - версия уже загруженного фильтра.
+ * Ответ - фильтр Блума по публичным кодам (формат helpers/bloom.php) и
+ * подпись Ed25519 (64 байта) в конце. Версия - время последнего изменения
+ * реестра старше sync_lag_seconds; фильтр каждой версии строится один раз и
+ * хранится в кэше.
+ */
+declare(strict_types=1);
+require_once __DIR__ . '/bootstrap.php';
+require_once __DIR__ . '/../helpers/bloom.php';
+
+if (($_SERVER['REQUEST_METHOD'] ?? 'GET') !== 'GET') {
+    json_response(['status' => 'error', 'message' => 'Method not allowed'], 405);
+}
+
+require_sync_key();
+
+$config = app_config();
+$secretKey = base64_decode((string) ($config['revocation_signing_key'] ?? ''), true);
+if (!function_exists('sodium_crypto_sign_detached')
+    || $secretKey === false
+    || strlen($secretKey) !== SODIUM_CRYPTO_SIGN_SECRETKEYBYTES) {
+    json_response(['status' => 'error', 'message' => 'Фильтр отзыва не настроен'], 503);
+}
+
+$pdo = db();
+// Версия - по изменениям старше лага, как водяной знак sync.php: секунда, в которую
+// еще идут записи, не становится версией, и файл этой версии не упустит изменение
+// той же секунды. Сам фильтр строится по всему реестру и может содержать больше.
+// MAX(updated_at) читается по индексу idx_updated_at
+$lag = max(1, (int) ($config['sync_lag_seconds'] ?? 5));
+$version = (int) $pdo->query(
+    'SELECT COALESCE(UNIX_TIMESTAMP(MAX(updated_at)), 0) FROM documents
+     WHERE updated_at < NOW() - INTERVAL ' . $lag . ' SECOND'
+)->fetchColumn();
+$etag = '"' . $version . '"';
+
+if (trim((string) ($_SERVER['HTTP_IF_NONE_MATCH'] ?? '')) === $etag) {
+    http_response_code(304);
+    header('ETag: ' . $etag);
+    exit;
+}
+
+$cacheDir = $config['revocation_cache_dir'] ?: sys_get_temp_dir();
+$cacheFile = $cacheDir . '/revocations_' . $version . '.bin';
+
+if (!is_file($cacheFile)) {
+    $statuses = "('revoked', 'invalid')";
+    $expected = (int) $pdo->query("SELECT COUNT(*) FROM documents WHERE status IN $statuses")->fetchColumn();
+    $filter = bloom_create($expected, (float) $config['revocation_fp_rate']);
+
+    // Коды читаются потоком, без буферизации всей выборки в памяти PHP
+    $pdo->setAttribute(PDO::MYSQL_ATTR_USE_BUFFERED_QUERY, false);
+    $stmt = $pdo->query("SELECT public_code FROM documents WHERE status IN $statuses");
+    while (($code = $stmt->fetchColumn()) !== false) {
+        bloom_add($filter, $code);
+    }
+    $stmt->closeCursor();
+
+    $body = bloom_serialize($filter, $version);
+    $payload = $body . sodium_crypto_sign_detached($body, $secretKey);
+
+    // Атомарная запись: параллельный запрос не увидит недописанный файл
+    $tmpFile = tempnam($cacheDir, 'revocations_');
+    file_put_contents($tmpFile, $payload);
+    rename($tmpFile, $cacheFile);
+    foreach (glob($cacheDir . '/revocations_*.bin') ?: [] as $stale) {
+        if ($stale !== $cacheFile) {
+            @unlink($stale);
+        }
+    }
+}
+
+header('Content-Type: application/octet-stream');
+header('Content-Length: ' . filesize($cacheFile));
+header('ETag: ' . $etag);
+readfile($cacheFile);
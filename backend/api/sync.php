@@ -0,0 +1,99 @@
+<?php
+/**
+ * Дельта-синхронизация реестра для офлайн-кэша устройств.
+ *
+ * GET ?since=<водяной знак>&limit=<n>&issuer=<издатель>
+ * Возвращает документы, измененные после водяного знака, в порядке (updated_at, id).
+ * Водяной знак "YYYY-MM-DD HH:MM:SS|id" берется из next_since предыдущего ответа.
+ * Изменения моложе sync_lag_seconds отдаются в следующих выгрузках.
+ */
+declare(strict_types=1);
+require_once __DIR__ . '/bootstrap.php';
+
+const SYNC_DEFAULT_LIMIT = 500;
+const SYNC_MAX_LIMIT = 2000;
+
+if (($_SERVER['REQUEST_METHOD'] ?? 'GET') !== 'GET') {
+    json_response(['status' => 'error', 'message' => 'Method not allowed'], 405);
+}
+
+require_sync_key();
+
+$since = (string) ($_GET['since'] ?? '');
+$sinceTime = '1970-01-01 00:00:00';
+$sinceId = 0;
+if ($since !== '') {
+    $parts = explode('|', $since, 2);
+    if (count($parts) !== 2
+        || DateTime::createFromFormat('Y-m-d H:i:s', $parts[0]) === false
+        || !ctype_digit($parts[1])) {
+        json_response(['status' => 'error', 'message' => 'Некорректный параметр since'], 400);
+    }
+    [$sinceTime, $sinceId] = [$parts[0], (int) $parts[1]];
+}
+
+$limit = (int) ($_GET['limit'] ?? SYNC_DEFAULT_LIMIT);
+$limit = max(1, min($limit, SYNC_MAX_LIMIT));
+$issuer = $_GET['issuer'] ?? null;
+// Строки моложе лага не отдаются: за это время дописываются изменения той же
+// секунды и транзакции, закоммиченные позже своего updated_at. Иначе водяной
+// знак ушел бы дальше них и они были бы пропущены навсегда
+$lag = max(1, (int) (app_config()['sync_lag_seconds'] ?? 5));
+
+$sql = 'SELECT id, public_code, document_type, issuer, issue_date, expiry_date, status, metadata,
+               pin_hash IS NOT NULL AS pin_required, updated_at
+        FROM documents
+        WHERE (updated_at > :since_time OR (updated_at = :since_time_eq AND id > :since_id))
+          AND updated_at < NOW() - INTERVAL ' . $lag . ' SECOND';
+$params = [
+    ':since_time' => $sinceTime,
+    ':since_time_eq' => $sinceTime,
+    ':since_id' => $sinceId,
+];
+if ($issuer !== null && $issuer !== '') {
+    $sql .= ' AND issuer = :issuer';
+    $params[':issuer'] = $issuer;
+}
+// Лишняя строка показывает, есть ли следующая страница
+$sql .= ' ORDER BY updated_at, id LIMIT ' . ($limit + 1);
+
+$stmt = db()->prepare($sql);
+$stmt->execute($params);
+$rows = $stmt->fetchAll();
+
+$hasMore = count($rows) > $limit;
+if ($hasMore) {
+    array_pop($rows);
+}
+
+$documents = [];
+foreach ($rows as $doc) {
+    $pinRequired = (bool) $doc['pin_required'];
+    $documents[] = [
+        'id' => (int) $doc['id'],
+        'public_code' => $doc['public_code'],
+        'document_type' => $doc['document_type'],
+        'issuer' => $doc['issuer'],
+        'issue_date' => $doc['issue_date'],
+        'expiry_date' => $doc['expiry_date'],
+        'status' => determine_status($doc),
+        'registry_status' => $doc['status'],
+        // Данные документов под PIN не раздаются без проверки PIN
+        'metadata' => $pinRequired ? null : normalize_metadata($doc['metadata']),
+        'pin_required' => $pinRequired,
+    ];
+}
+
+$last = end($rows);
+$nextSince = $last ? $last['updated_at'] . '|' . $last['id'] : $since;
+
+// Ответ сжимается, если клиент прислал Accept-Encoding: gzip
+ob_start('ob_gzhandler');
+json_response([
+    'status' => 'ok',
+    'data' => [
+        'documents' => $documents,
+        'next_since' => $nextSince,
+        'has_more' => $hasMore,
+    ],
+]);
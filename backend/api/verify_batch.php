@@ -0,0 +1,67 @@
+<?php
+/**
+ * Пакетная верификация: все коды, найденные в одном кадре/серии кадров.
+ */
+declare(strict_types=1);
+require_once __DIR__ . '/bootstrap.php';
+
+const MAX_BATCH_SIZE = 50;
+
+$method = $_SERVER['REQUEST_METHOD'] ?? 'GET';
+if ($method !== 'POST') {
+    json_response(['status' => 'error', 'message' => 'Method not allowed'], 405);
+}
+
+$data = read_json_body();
+$codes = $data['public_codes'] ?? null;
+$pin = $data['pin'] ?? null;
+
+if (!is_array($codes) || !$codes) {
+    json_response(['status' => 'error', 'message' => 'public_codes обязателен'], 400);
+}
+
+$codes = array_values(array_unique(array_filter($codes, 'is_string')));
+if (count($codes) > MAX_BATCH_SIZE) {
+    json_response([
+        'status' => 'error',
+        'message' => 'Слишком много кодов в запросе (максимум ' . MAX_BATCH_SIZE . ')',
+    ], 400);
+}
+
+$pdo = db();
+$documents = fetch_documents_by_codes($pdo, $codes);
+
+$results = [];
+$logRows = [];
+foreach ($codes as $publicCode) {
+    $doc = $documents[$publicCode] ?? null;
+    if (!$doc) {
+        $results[] = ['public_code' => $publicCode, 'status' => 'error', 'message' => 'Не является документом'];
+        continue;
+    }
+    // Один неверный PIN не должен ронять весь пакет
+    if (!empty($doc['pin_hash']) && (!$pin || !password_verify($pin, $doc['pin_hash']))) {
+        $results[] = ['public_code' => $publicCode, 'status' => 'error', 'message' => 'Неверный PIN или не указан'];
+        continue;
+    }
+
+    $resolvedStatus = determine_status($doc);
+    $logRows[] = [(int) $doc['id'], $publicCode, $resolvedStatus];
+    $results[] = [
+        'public_code' => $publicCode,
+        'status' => 'ok',
+        'data' => [
+            'public_code' => $doc['public_code'],
+            'document_type' => $doc['document_type'],
+            'issuer' => $doc['issuer'],
+            'issue_date' => $doc['issue_date'],
+            'expiry_date' => $doc['expiry_date'],
+            'status' => $resolvedStatus,
+            'metadata' => $doc['metadata'],
+        ],
+    ];
+}
+
+log_verifications_batch($pdo, $logRows);
+
+json_response(['status' => 'ok', 'data' => $results]);
@@ -10,6 +10,17 @@ return [
         'charset' => 'utf8mb4',
     ],
     'app_secret' => getenv('APP_SECRET') ?: 'APP_SECRET_CODE',
+    // Ключ устройств для выгрузки реестра (/api/sync.php); пустой - выгрузка запрещена
+    'sync_key' => getenv('SYNC_KEY') ?: '',
+    // Сколько секунд изменение документа выжидает перед выгрузкой в /api/sync.php
+    // и в версию фильтра отзыва (/api/revocations.php)
+    'sync_lag_seconds' => (int) (getenv('SYNC_LAG_SECONDS') ?: 5),
+    // Секретный ключ Ed25519 (base64) для подписи фильтра отзыва (/api/revocations.php):
+    // php -r '$k = sodium_crypto_sign_keypair(); echo base64_encode($k), PHP_EOL, base64_encode(sodium_crypto_sign_publickey($k)), PHP_EOL;'
+    // Вторая строка - открытый ключ для REVOCATION_PUBLIC_KEY на устройствах
+    'revocation_signing_key' => getenv('REVOCATION_SIGNING_KEY') ?: '',
+    'revocation_fp_rate' => (float) (getenv('REVOCATION_FP_RATE') ?: 0.0001),
+    'revocation_cache_dir' => getenv('REVOCATION_CACHE_DIR') ?: '',
 ];
 
 
@@ -0,0 +1,66 @@
+<?php
+/**
+ * Фильтр Блума для офлайн-проверки отзыва документов.
+ *
+ * Формат (все числа big-endian):
+ *   "RVBF" | формат u8 | число хэшей u32 | число бит u32 | элементов u32 | seed u32 | версия u64 | биты
+ * Позиции: h1, h2 - первые два u32 из sha256(seed . ключ), позиция i = (h1 + i * (h2 | 1)) mod бит.
+ * Клиентская реализация - services/revocation_filter.py.
+ */
+
+declare(strict_types=1);
+
+const BLOOM_MAGIC = 'RVBF';
+const BLOOM_FORMAT = 1;
+
+/**
+ * Пустой фильтр под ожидаемое число элементов и долю ложных срабатываний.
+ */
+function bloom_create(int $expected, float $fpRate): array
+{
+    $expected = max(1, $expected);
+    $bits = (int) ceil(-$expected * log($fpRate) / (M_LN2 * M_LN2));
+    $bits = max(64, 8 * (int) ceil($bits / 8));
+    $hashes = max(1, (int) round($bits / $expected * M_LN2));
+
+    return [
+        'hashes' => $hashes,
+        'bits' => $bits,
+        'count' => 0,
+        'seed' => random_int(0, 0xFFFFFFFF),
+        'data' => str_repeat("\0", intdiv($bits, 8)),
+    ];
+}
+
+/**
+ * Добавление ключа (публичного кода документа).
+ */
+function bloom_add(array &$filter, string $key): void
+{
+    $parts = unpack('N2', hash('sha256', pack('N', $filter['seed']) . $key, true));
+    $h1 = $parts[1];
+    $h2 = $parts[2] | 1;
+    for ($i = 0; $i < $filter['hashes']; $i++) {
+        $position = ($h1 + $i * $h2) % $filter['bits'];
+        $byte = $position >> 3;
+        $filter['data'][$byte] = chr(ord($filter['data'][$byte]) | (1 << ($position & 7)));
+    }
+    $filter['count']++;
+}
+
+/**
+ * Сериализация фильтра с версией (без подписи).
+ */
+function bloom_serialize(array $filter, int $version): string
+{
+    return pack(
+        'a4CNNNNJ',
+        BLOOM_MAGIC,
+        BLOOM_FORMAT,
+        $filter['hashes'],
+        $filter['bits'],
+        $filter['count'],
+        $filter['seed'],
+        $version
+    ) . $filter['data'];
+}
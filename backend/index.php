@@ -14,5 +14,5 @@ if (($_SERVER['REQUEST_METHOD'] ?? 'GET') === 'OPTIONS') {
 http_response_code(404);
 echo json_encode([
     'status' => 'error',
-    'message' => 'Используйте /api/verify.php, /api/document.php, /api/document_create.php, /api/document_rotate.php'
+    'message' => 'Используйте /api/verify.php, /api/verify_batch.php, /api/document.php, /api/sync.php, /api/revocations.php, /api/document_create.php, /api/document_rotate.php'
 ], JSON_UNESCAPED_UNICODE | JSON_UNESCAPED_SLASHES);
\ No newline at end of file
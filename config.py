@@ -9,10 +9,54 @@ API_BASE_URL = os.getenv("API_BASE_URL", "http://195.209.210.97:7777/sinai.hacka
 # Пути эндпоинтов
 API_VERIFY_PATH = os.getenv("API_VERIFY_PATH", "/api/verify.php")
 API_DOCUMENT_PATH = os.getenv("API_DOCUMENT_PATH", "/api/document.php")  # GET /?public_code=
+API_VERIFY_BATCH_PATH = os.getenv("API_VERIFY_BATCH_PATH", "/api/verify_batch.php")
+API_SYNC_PATH = os.getenv("API_SYNC_PATH", "/api/sync.php")  # GET /?since=&limit=&issuer=
+API_REVOCATIONS_PATH = os.getenv("API_REVOCATIONS_PATH", "/api/revocations.php")
 
 # HTTP таймауты и ретраи
 HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10.0"))  # seconds
 MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
 
+# Пакетное сканирование (несколько QR-кодов в кадре)
+MULTI_SCAN_BURST_SECONDS = float(os.getenv("MULTI_SCAN_BURST_SECONDS", "1.5"))  # сбор кодов после первого найденного
+MULTI_SCAN_MAX_CODES = int(os.getenv("MULTI_SCAN_MAX_CODES", "50"))  # совпадает с лимитом verify_batch.php
 
+# Кэш недавних результатов: повторное сканирование в пределах окна не идёт в сеть (секунды)
+RECENT_RESULT_TTL_VALID = float(os.getenv("RECENT_RESULT_TTL_VALID", "300"))
+RECENT_RESULT_TTL_WARNING = float(os.getenv("RECENT_RESULT_TTL_WARNING", "120"))
+RECENT_RESULT_TTL_INVALID = float(os.getenv("RECENT_RESULT_TTL_INVALID", "15"))
 
+# Сессионный кэш PIN-кода (секунды)
+PIN_IDLE_TIMEOUT = float(os.getenv("PIN_IDLE_TIMEOUT", "900"))  # сброс из памяти после простоя, 0 - без сброса
+PIN_STAT_INTERVAL = float(os.getenv("PIN_STAT_INTERVAL", "5"))  # проверка изменения secure_storage.json
+
+# Профилирование холодного старта (см. startup_profile.py)
+STARTUP_PROFILE = os.getenv("DOCCHECK_STARTUP_PROFILE", "0") == "1"  # запись времени импортов и экранов
+STARTUP_PROFILE_PATH = os.getenv("DOCCHECK_STARTUP_PROFILE_PATH", "startup_profile.json")
+STARTUP_IMPORT_BUDGET_MS = float(os.getenv("STARTUP_IMPORT_BUDGET_MS", "1500"))  # бюджет холодного импорта main
+
+# Камера
+CAMERA_PREVIEW_FPS = float(os.getenv("CAMERA_PREVIEW_FPS", "15"))  # частота кадров превью и распознавания
+CAMERA_IDLE_TIMEOUT = float(os.getenv("CAMERA_IDLE_TIMEOUT", "60"))  # секунды без сканирования до остановки, 0 - не останавливать
+
+# Пакетный экспорт PDF
+PDF_EXPORT_WORKERS = int(os.getenv("PDF_EXPORT_WORKERS", "0"))  # процессов рендера, 0 - по числу ядер
+
+# Синхронизация реестра в офлайн-кэш (см. services/registry_sync.py)
+SYNC_API_KEY = os.getenv("SYNC_API_KEY", "")  # ключ устройства (X-Sync-Key), пустой - синхронизация выключена
+REGISTRY_SYNC_ISSUER = os.getenv("REGISTRY_SYNC_ISSUER", "")  # издатель для предзагрузки, пустой - весь реестр
+REGISTRY_SYNC_PAGE_SIZE = int(os.getenv("REGISTRY_SYNC_PAGE_SIZE", "500"))
+REGISTRY_SYNC_ON_START = os.getenv("REGISTRY_SYNC_ON_START", "1") == "1"
+
+# Офлайн-кэш документов: вытеснение (см. OfflineCache.maintain)
+CACHE_MAX_DOCUMENTS = int(os.getenv("CACHE_MAX_DOCUMENTS", "5000"))  # документов из сканирования, 0 - без лимита
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(20 * 1024 * 1024)))  # объем записей, 0 - без лимита
+CACHE_MAX_AGE_DAYS = float(os.getenv("CACHE_MAX_AGE_DAYS", "30"))  # дней без обращений, 0 - не удалять по возрасту
+CACHE_HIT_BONUS_HOURS = float(os.getenv("CACHE_HIT_BONUS_HOURS", "24"))  # сдвиг в очереди вытеснения за каждое сканирование
+CACHE_HIT_BONUS_MAX = int(os.getenv("CACHE_HIT_BONUS_MAX", "8"))  # учитывается сканирований не больше
+CACHE_EVICTION_BATCH = int(os.getenv("CACHE_EVICTION_BATCH", "200"))  # строк на транзакцию
+CACHE_VACUUM_MIN_PAGES = int(os.getenv("CACHE_VACUUM_MIN_PAGES", "64"))  # свободных страниц до incremental_vacuum
+CACHE_MAINTENANCE_INTERVAL = float(os.getenv("CACHE_MAINTENANCE_INTERVAL", "900"))  # секунды, 0 - только при запуске
+
+# Фильтр отозванных документов (см. services/revocation_filter.py)
+REVOCATION_PUBLIC_KEY = os.getenv("REVOCATION_PUBLIC_KEY", "")  # открытый ключ Ed25519 (base64), пустой - фильтр не загружается
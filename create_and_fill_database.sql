@@ -8,10 +8,13 @@ DROP TABLE IF EXISTS verifications;
 DROP TABLE IF EXISTS documents;
 
 -- Создание таблицы documents
+-- Схема совпадает с моделями server/app/models (сверка: server/tests/test_schema.py).
+-- Уникальные ключи служат и индексами поиска, отдельных индексов по тем же
+-- колонкам нет.
 CREATE TABLE documents (
     id INT AUTO_INCREMENT PRIMARY KEY,
-    public_code VARCHAR(64) NOT NULL UNIQUE,
-    internal_code VARCHAR(255) NOT NULL UNIQUE,
+    public_code VARCHAR(64) NOT NULL,
+    internal_code VARCHAR(255) NOT NULL,
     document_type VARCHAR(100),
     issuer VARCHAR(255),
     issue_date DATE,
@@ -21,25 +24,39 @@ CREATE TABLE documents (
     pin_hash VARBINARY(255) NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-    INDEX idx_public_code (public_code),
-    INDEX idx_internal_code (internal_code),
+    UNIQUE KEY uq_documents_public_code (public_code),
+    UNIQUE KEY uq_documents_internal_code (internal_code),
     INDEX idx_status (status),
-    INDEX idx_expiry_date (expiry_date)
+    INDEX idx_expiry_date (expiry_date),
+    INDEX idx_updated_at (updated_at, id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- Создание таблицы verifications
+-- Журнал секционирован по месяцам verified_at: запросы за период читают
+-- только свои секции, старые месяцы удаляются DROP PARTITION.
+-- Секционированные таблицы InnoDB не поддерживают внешние ключи, а колонка
+-- секционирования входит в первичный ключ. Следующие месяцы добавляет
+-- server/maintain_partitions.py (из p_future), он же удаляет секции
+-- старше срока хранения.
 CREATE TABLE verifications (
-    id INT AUTO_INCREMENT PRIMARY KEY,
+    id INT AUTO_INCREMENT,
     document_id INT NOT NULL,
     public_code_used VARCHAR(64) NULL,
     status VARCHAR(20) NOT NULL,
     ip_address VARCHAR(45) NULL,
     user_agent TEXT NULL,
-    verified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    verified_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, verified_at),
     INDEX idx_verifications_document (document_id),
-    INDEX idx_verifications_date (verified_at),
-    CONSTRAINT fk_verifications_document FOREIGN KEY (document_id) REFERENCES documents(id) ON DELETE CASCADE
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+    INDEX idx_verifications_date (verified_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+PARTITION BY RANGE (UNIX_TIMESTAMP(verified_at)) (
+    PARTITION p202610 VALUES LESS THAN (UNIX_TIMESTAMP('2026-11-01 00:00:00')),
+    PARTITION p202611 VALUES LESS THAN (UNIX_TIMESTAMP('2026-12-01 00:00:00')),
+    PARTITION p202612 VALUES LESS THAN (UNIX_TIMESTAMP('2027-01-01 00:00:00')),
+    PARTITION p202701 VALUES LESS THAN (UNIX_TIMESTAMP('2027-02-01 00:00:00')),
+    PARTITION p_future VALUES LESS THAN MAXVALUE
+);
 
 -- ============================================
 -- Заполнение тестовыми данными
@@ -1,18 +1,32 @@
 """
 Главный файл приложения - Верификатор подлинности электронных документов
 """
+import time
+
+_PROCESS_START = time.perf_counter()
+
+import startup_profile
+startup_profile.install()
+
 from kivy.app import App
-from kivy.uix.screenmanager import ScreenManager
+from kivy.clock import Clock
 from kivy.core.window import Window
 from kivy.logger import Logger
 
-from view.scanner_screen import ScannerScreen
-from view.history_screen import HistoryScreen
-from view.settings_screen import SettingsScreen
+from view.screen_manager import LazyScreenManager
 from view.login_screen import LoginScreen
-from view.statistics_screen import StatisticsScreen
-from view.document_detail_screen import DocumentDetailScreen
-from view.search_screen import SearchScreen
+
+_IMPORTS_DONE = time.perf_counter()
+
+# Экраны, создаваемые при первом переходе: (имя, модуль, класс)
+LAZY_SCREENS = [
+    ('scanner', 'view.scanner_screen', 'ScannerScreen'),
+    ('history', 'view.history_screen', 'HistoryScreen'),
+    ('settings', 'view.settings_screen', 'SettingsScreen'),
+    ('statistics', 'view.statistics_screen', 'StatisticsScreen'),
+    ('document_detail', 'view.document_detail_screen', 'DocumentDetailScreen'),
+    ('search', 'view.search_screen', 'SearchScreen'),
+]
 
 
 class DocumentVerifierApp(App):
@@ -42,28 +56,88 @@ class DocumentVerifierApp(App):
         Window.bind(on_resize=self.on_window_resize)
         
         # Создание менеджера экранов
-        sm = ScreenManager()
+        sm = LazyScreenManager()
         
-        # Добавление экранов
+        # Экран входа создается сразу, остальные - при первом переходе
+        login_started = time.perf_counter()
         sm.add_widget(LoginScreen(name='login'))
-        sm.add_widget(ScannerScreen(name='scanner'))
-        sm.add_widget(HistoryScreen(name='history'))
-        sm.add_widget(SettingsScreen(name='settings'))
-        sm.add_widget(StatisticsScreen(name='statistics'))
-        sm.add_widget(DocumentDetailScreen(name='document_detail'))
-        sm.add_widget(SearchScreen(name='search'))
+        sm.build_times['login'] = time.perf_counter() - login_started
+        for name, module, class_name in LAZY_SCREENS:
+            sm.register(name, module=module, class_name=class_name)
         
         # Установка начального экрана
         sm.current = 'login'
         
+        self._build_done = time.perf_counter()
         return sm
     
     def on_start(self):
         """Вызывается при запуске приложения"""
         Logger.info("App: Приложение запущено")
+        # Первый кадр отрисован на следующем тике после on_start
+        Clock.schedule_once(self._log_startup_profile, 0)
+        Clock.schedule_once(self._start_registry_sync, 1)
+        self._schedule_cache_maintenance()
+    
+    def _start_registry_sync(self, dt):
+        """Фоновая догрузка изменений реестра в офлайн-кэш"""
+        import config
+        if not (config.REGISTRY_SYNC_ON_START and config.SYNC_API_KEY):
+            return
+        from services.registry_sync import RegistrySync
+        RegistrySync().sync_in_background(config.REGISTRY_SYNC_ISSUER or None)
+    
+    def _schedule_cache_maintenance(self):
+        """Вытеснение из офлайн-кэша в фоне: вскоре после запуска и по расписанию"""
+        import config
+        Clock.schedule_once(self._maintain_offline_cache, 5)
+        if config.CACHE_MAINTENANCE_INTERVAL:
+            Clock.schedule_interval(self._maintain_offline_cache, config.CACHE_MAINTENANCE_INTERVAL)
+    
+    def _maintain_offline_cache(self, dt):
+        from services.offline_cache import OfflineCache
+        OfflineCache().maintain_in_background()
+    
+    def _log_startup_profile(self, dt):
+        """Отчет о времени холодного старта"""
+        first_frame = time.perf_counter()
+        self._startup_phases = {
+            'imports': _IMPORTS_DONE - _PROCESS_START,
+            'build': self._build_done - _IMPORTS_DONE,
+            'first_frame': first_frame - _PROCESS_START,
+        }
+        # Импорты после первого кадра к холодному старту не относятся
+        startup_profile.uninstall()
+        report_path = startup_profile.write_report(self._startup_phases, self.root.build_times)
+        if report_path:
+            Logger.info(f"App: Отчет о запуске записан в {report_path}")
+        Logger.info(
+            "App: Профиль запуска: "
+            f"импорт {(_IMPORTS_DONE - _PROCESS_START) * 1000:.0f} мс, "
+            f"build() {(self._build_done - _IMPORTS_DONE) * 1000:.0f} мс, "
+            f"первый кадр {(first_frame - _PROCESS_START) * 1000:.0f} мс"
+        )
+    
+    def on_pause(self):
+        """Приложение свернуто: PIN сбрасывается из памяти, камера освобождается"""
+        from security.session_credentials import get_session_credentials
+        get_session_credentials().wipe()
+        screen = self.root.current_screen if self.root else None
+        if screen is not None and hasattr(screen, 'on_app_pause'):
+            screen.on_app_pause()
+        return True
+    
+    def on_resume(self):
+        """Приложение развернуто"""
+        screen = self.root.current_screen if self.root else None
+        if screen is not None and hasattr(screen, 'on_app_resume'):
+            screen.on_app_resume()
     
     def on_stop(self):
         """Вызывается при закрытии приложения"""
+        # Дописываем время экранов, созданных за сессию
+        if hasattr(self, '_startup_phases'):
+            startup_profile.write_report(self._startup_phases, self.root.build_times)
         Logger.info("App: Приложение закрыто")
     
     def on_window_resize(self, window, width, height):
@@ -1,12 +1,44 @@
 """
 Модель данных документа
 """
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Optional
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from sys import intern
+from typing import Optional, Union
 
 
-@dataclass
+class DocumentStatus:
+    """Статусы документа; значения - единственные экземпляры строк"""
+    VALID = 'valid'
+    WARNING = 'warning'
+    INVALID = 'invalid'
+
+
+# Статус -> канонический объект строки: проверка за один поиск в словаре,
+# и тысячи записей журнала ссылаются на три строки вместо копий из БД
+_STATUSES = {status: status for status in (DocumentStatus.VALID, DocumentStatus.WARNING, DocumentStatus.INVALID)}
+
+# Признак "дата еще не разобрана" (None - даты нет или она некорректна);
+# Ellipsis - синглтон и при pickle (записи уходят в процессы экспорта PDF)
+_UNPARSED = ...
+
+
+def intern_status(status: str) -> str:
+    """Канонический экземпляр известного статуса (неизвестный возвращается как есть)"""
+    return _STATUSES.get(status, status)
+
+
+def _parse_date(value) -> Optional[date]:
+    """Дата из 'YYYY-MM-DD' (или с временем) либо None"""
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+@dataclass(slots=True)
 class DocumentModel:
     """Модель электронного документа"""
     document_id: str
@@ -16,22 +48,111 @@ class DocumentModel:
     issue_date: Optional[str] = None
     expiry_date: Optional[str] = None
     metadata: Optional[dict] = None
+    _expiry: object = field(default=_UNPARSED, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """Валидация данных после инициализации"""
-        if self.status not in ['valid', 'warning', 'invalid']:
+        try:
+            self.status = _STATUSES[self.status]
+        except (KeyError, TypeError):
             raise ValueError(f"Неверный статус документа: {self.status}")
+    
+    @property
+    def expiry(self) -> Optional[date]:
+        """Срок действия как date (разбирается при первом обращении)"""
+        if self._expiry is _UNPARSED:
+            self._expiry = _parse_date(self.expiry_date) if self.expiry_date else None
+        return self._expiry
 
 
-@dataclass
 class VerificationRecord:
-    """Запись о верификации документа"""
-    id: Optional[int] = None
-    document_id: str = ""
-    status: str = ""
-    timestamp: Optional[datetime] = None
-    document_type: Optional[str] = None
-    issuer: Optional[str] = None
+    """
+    Запись о верификации документа
+    
+    Даты из БД хранятся строкой ISO и разбираются при первом обращении к
+    timestamp/last_seen: списки журнала строятся без datetime.fromisoformat
+    на каждую строку, а сортировка и выборки идут по самой строке.
+    """
+    
+    __slots__ = ('id', 'document_id', 'status', 'document_type', 'issuer', 'seen_count',
+                 '_timestamp', '_timestamp_iso', '_last_seen', '_last_seen_iso')
+    
+    def __init__(
+        self,
+        id: Optional[int] = None,
+        document_id: str = "",
+        status: str = "",
+        timestamp: Union[datetime, str, None] = None,
+        document_type: Optional[str] = None,
+        issuer: Optional[str] = None,
+        seen_count: int = 1,  # Сколько раз документ отсканирован в окне кэша
+        last_seen: Union[datetime, str, None] = None
+    ):
+        self.id = id
+        self.document_id = document_id
+        self.status = _STATUSES.get(status, status)
+        # Тип и издатель повторяются в тысячах записей: одна строка на значение
+        self.document_type = intern(document_type) if document_type else document_type
+        self.issuer = intern(issuer) if issuer else issuer
+        self.seen_count = seen_count or 1
+        self.timestamp = timestamp
+        self.last_seen = last_seen
+    
+    @classmethod
+    def from_row(cls, cursor, row) -> 'VerificationRecord':
+        """
+        row_factory для sqlite3: строка выборки сразу в запись
+        
+        Колонки: id, document_id, status, timestamp, document_type, issuer, seen_count, last_seen
+        """
+        return cls(*row)
+    
+    @property
+    def timestamp(self) -> Optional[datetime]:
+        if self._timestamp is _UNPARSED:
+            self._timestamp = datetime.fromisoformat(self._timestamp_iso)
+        return self._timestamp
+    
+    @timestamp.setter
+    def timestamp(self, value: Union[datetime, str, None]):
+        if isinstance(value, str):
+            self._timestamp, self._timestamp_iso = _UNPARSED, value
+        else:
+            self._timestamp, self._timestamp_iso = value, None
+    
+    @property
+    def timestamp_iso(self) -> Optional[str]:
+        """timestamp строкой ISO без разбора даты"""
+        if self._timestamp_iso is None and self._timestamp is not None:
+            return self._timestamp.isoformat()
+        return self._timestamp_iso
+    
+    @property
+    def last_seen(self) -> Optional[datetime]:
+        if self._last_seen is _UNPARSED:
+            self._last_seen = datetime.fromisoformat(self._last_seen_iso)
+        return self._last_seen
+    
+    @last_seen.setter
+    def last_seen(self, value: Union[datetime, str, None]):
+        if isinstance(value, str):
+            self._last_seen, self._last_seen_iso = _UNPARSED, value
+        else:
+            self._last_seen, self._last_seen_iso = value, None
+    
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return (
+            f"VerificationRecord(id={self.id!r}, document_id={self.document_id!r}, status={self.status!r}, "
+            f"timestamp={self.timestamp_iso!r}, document_type={self.document_type!r}, issuer={self.issuer!r}, "
+            f"seen_count={self.seen_count!r}, last_seen={self._last_seen_iso or self._last_seen!r})"
+        )
     
     def to_dict(self) -> dict:
         """Преобразование в словарь для сохранения"""
@@ -39,27 +160,23 @@ class VerificationRecord:
             'id': self.id,
             'document_id': self.document_id,
             'status': self.status,
-            'timestamp': self.timestamp.isoformat() if self.timestamp else None,
+            'timestamp': self.timestamp_iso,
             'document_type': self.document_type,
-            'issuer': self.issuer
+            'issuer': self.issuer,
+            'seen_count': self.seen_count,
+            'last_seen': self._last_seen_iso or (self._last_seen.isoformat() if self._last_seen else None)
         }
     
     @classmethod
     def from_dict(cls, data: dict) -> 'VerificationRecord':
-        """Создание из словаря"""
-        timestamp = None
-        if data.get('timestamp'):
-            timestamp = datetime.fromisoformat(data['timestamp'])
-        
+        """Создание из словаря (даты разбираются при обращении)"""
         return cls(
             id=data.get('id'),
             document_id=data.get('document_id', ''),
             status=data.get('status', ''),
-            timestamp=timestamp,
+            timestamp=data.get('timestamp') or None,
             document_type=data.get('document_type'),
-            issuer=data.get('issuer')
+            issuer=data.get('issuer'),
+            seen_count=data.get('seen_count', 1),
+            last_seen=data.get('last_seen') or None
         )
-
-
-
-
@@ -0,0 +1,227 @@
+"""
+Колоночный снимок журнала верификаций для статистики
+
+Журнал хранится в массивах NumPy: время - int64 (секунды от 1970-01-01
+по локальным часам, как в БД), статус, тип документа и издатель -
+коды словарей. Снимок догружается из Storage по id, группировки и
+фильтры по периоду выполняются векторно.
+"""
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from kivy.logger import Logger
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_DATE = date(1970, 1, 1)
+# 1970-01-01 - четверг: (день + 3) % 7 дает 0 для понедельника
+_WEEKDAY_SHIFT = 3
+
+
+class _Categories:
+    """Словарь значений колонки: значение <-> код"""
+    
+    __slots__ = ('values', 'codes')
+    
+    def __init__(self):
+        self.values: List[Optional[str]] = []
+        self.codes: Dict[Optional[str], int] = {}
+    
+    def encode(self, value: Optional[str]) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+    
+    def __len__(self):
+        return len(self.values)
+
+
+class HistorySnapshot:
+    """Журнал верификаций в колонках NumPy"""
+    
+    COLUMNS = ('status', 'document_type', 'issuer')
+    
+    def __init__(self, storage, page_size: int = 20000):
+        """
+        Args:
+            storage: Storage, из которого загружается журнал
+            page_size: Строк за один запрос при догрузке
+        """
+        self.storage = storage
+        self.page_size = page_size
+        self._lock = threading.Lock()
+        self.generation = storage.deletion_generation
+        self._reset()
+    
+    def _reset(self):
+        self.last_id = 0
+        self.timestamps = np.empty(0, dtype=np.int64)
+        self.categories = {name: _Categories() for name in self.COLUMNS}
+        self.codes = {name: np.empty(0, dtype=np.int32) for name in self.COLUMNS}
+    
+    def __len__(self) -> int:
+        return len(self.timestamps)
+    
+    def refresh(self) -> int:
+        """
+        Догрузка записей, добавленных после прошлого обновления
+        
+        Если с прошлого обновления записи удалялись (Storage.deletion_generation),
+        снимок строится заново.
+        
+        Returns:
+            Количество добавленных записей
+        """
+        with self._lock:
+            if self.generation != self.storage.deletion_generation:
+                if self.last_id:
+                    Logger.info("HistorySnapshot: Записи журнала удалялись, снимок строится заново")
+                self._reset()
+                self.generation = self.storage.deletion_generation
+            
+            chunks = []
+            while True:
+                rows = self.storage.get_rows_after(self.last_id, self.page_size)
+                if not rows:
+                    break
+                chunks.append(self._encode(rows))
+                self.last_id = rows[-1][0]
+                if len(rows) < self.page_size:
+                    break
+            
+            if chunks:
+                self.timestamps = np.concatenate([self.timestamps] + [chunk[0] for chunk in chunks])
+                for index, name in enumerate(self.COLUMNS, start=1):
+                    self.codes[name] = np.concatenate([self.codes[name]] + [chunk[index] for chunk in chunks])
+            return sum(len(chunk[0]) for chunk in chunks)
+    
+    def _encode(self, rows: List[tuple]) -> Tuple:
+        """Строки (id, timestamp, status, document_type, issuer) в массивы"""
+        _, timestamps, *columns = zip(*rows)
+        encoded = [
+            np.array(timestamps, dtype='datetime64[us]').astype('datetime64[s]').astype(np.int64)
+        ]
+        for name, values in zip(self.COLUMNS, columns):
+            encode = self.categories[name].encode
+            encoded.append(np.fromiter((encode(value) for value in values), dtype=np.int32, count=len(values)))
+        return tuple(encoded)
+    
+    @staticmethod
+    def _seconds(moment: datetime) -> int:
+        return int((moment - _EPOCH).total_seconds())
+    
+    def mask(self, start: Optional[datetime] = None, end: Optional[datetime] = None, **equals):
+        """
+        Маска записей за период [start, end) с фильтрами по колонкам
+        
+        Args:
+            start: Начало периода (включительно)
+            end: Конец периода (не включительно)
+            equals: status=, document_type=, issuer= - точное совпадение
+            
+        Returns:
+            Булев массив длины len(self)
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None:
+            mask &= self.timestamps >= self._seconds(start)
+        if end is not None:
+            mask &= self.timestamps < self._seconds(end)
+        for name, value in equals.items():
+            code = self.categories[name].codes.get(value)
+            if code is None:
+                return np.zeros(len(self), dtype=bool)
+            mask &= self.codes[name] == code
+        return mask
+    
+    def count_by(self, column: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                 **equals) -> Dict[Optional[str], int]:
+        """
+        Количество записей по значениям колонки
+        
+        Args:
+            column: 'status', 'document_type' или 'issuer'
+            
+        Returns:
+            {значение: количество} без нулевых значений
+        """
+        categories = self.categories[column]
+        codes = self.codes[column][self.mask(start, end, **equals)]
+        counts = np.bincount(codes, minlength=len(categories))
+        return {categories.values[code]: int(counts[code]) for code in np.flatnonzero(counts)}
+    
+    def count_by_day(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                     **equals) -> Dict[date, int]:
+        """Количество записей по дням"""
+        days = self.timestamps[self.mask(start, end, **equals)] // 86400
+        values, counts = np.unique(days, return_counts=True)
+        return {_EPOCH_DATE + timedelta(days=int(day)): int(count) for day, count in zip(values, counts)}
+    
+    def hourly_heatmap(self, start: Optional[datetime] = None, end: Optional[datetime] = None, **equals):
+        """
+        Тепловая карта активности
+        
+        Returns:
+            Массив 7x24: день недели (0 - понедельник) x час
+        """
+        seconds = self.timestamps[self.mask(start, end, **equals)]
+        weekday = (seconds // 86400 + _WEEKDAY_SHIFT) % 7
+        hour = seconds % 86400 // 3600
+        return np.bincount(weekday * 24 + hour, minlength=7 * 24).reshape(7, 24)
+    
+    def failure_rates(self, column: str = 'issuer', start: Optional[datetime] = None,
+                      end: Optional[datetime] = None, min_total: int = 1) -> List[Tuple[Optional[str], int, int, float]]:
+        """
+        Доля недействительных результатов по значениям колонки
+        
+        Args:
+            column: 'issuer' или 'document_type'
+            min_total: Не учитывать значения с меньшим числом проверок
+            
+        Returns:
+            [(значение, всего, недействительных, доля)] по убыванию доли
+        """
+        categories = self.categories[column]
+        mask = self.mask(start, end)
+        codes = self.codes[column]
+        totals = np.bincount(codes[mask], minlength=len(categories))
+        invalid_code = self.categories['status'].codes.get('invalid')
+        if invalid_code is None:
+            failures = np.zeros_like(totals)
+        else:
+            failures = np.bincount(codes[mask & (self.codes['status'] == invalid_code)], minlength=len(categories))
+        
+        rates = [
+            (categories.values[code], int(totals[code]), int(failures[code]),
+             float(failures[code] / totals[code]))
+            for code in np.flatnonzero(totals >= max(min_total, 1))
+        ]
+        rates.sort(key=lambda item: (-item[3], -item[1]))
+        return rates
+
+
+_snapshots: Dict[str, HistorySnapshot] = {}
+_snapshots_lock = threading.Lock()
+
+
+def get_history_snapshot(storage) -> Optional[HistorySnapshot]:
+    """
+    Общий снимок журнала для базы storage
+    
+    Returns:
+        HistorySnapshot или None, если NumPy не установлен
+    """
+    if not NUMPY_AVAILABLE:
+        return None
+    with _snapshots_lock:
+        snapshot = _snapshots.get(storage.db_path)
+        if snapshot is None:
+            snapshot = _snapshots[storage.db_path] = HistorySnapshot(storage)
+        return snapshot
@@ -2,7 +2,7 @@
 Репозиторий: обращается к внешнему PHP API, без прямого доступа к БД.
 """
 import time
-from typing import Optional
+from typing import Optional, List
 from kivy.logger import Logger
 
 from model.document_model import DocumentModel
@@ -40,12 +40,56 @@ class ApiRepository:
                     Logger.info(f"Repository: Ожидание {wait_time} секунд перед повтором")
                     time.sleep(wait_time)
                     continue
+                cached = self._lookup_offline(document_id)
+                if cached is not None:
+                    return cached
                 return DocumentModel(
                     document_id=document_id,
                     status='invalid',
                     metadata={'error': str(e)}
                 )
     
+    @staticmethod
+    def _lookup_offline(document_id: str) -> Optional[DocumentModel]:
+        """
+        Ответ из офлайн-кэша, когда API недоступен
+        
+        PIN-код офлайн не проверяется и на диск не пишется: документы под PIN
+        кэш возвращает с ошибкой "нужна сеть".
+        """
+        try:
+            from services.offline_cache import OfflineCache
+            cache = OfflineCache()
+            document = cache.get_cached_document(document_id)
+            if document is None:
+                return None
+            Logger.info(f"Repository: Документ {document_id} проверен по офлайн-кэшу")
+            return document
+        except Exception as e:
+            Logger.warning(f"Repository: Офлайн-кэш недоступен: {e}")
+            return None
+    
+    def verify_documents(
+        self,
+        document_ids: List[str],
+        pin_code: Optional[str] = None
+    ) -> List[DocumentModel]:
+        """
+        Пакетная верификация через внешний API (повторы выполняет клиент).
+        """
+        try:
+            return self.client.verify_documents(document_ids, pin_code)
+        except Exception as e:
+            Logger.error(f"Repository: Ошибка пакетного запроса к API: {e}")
+            return [
+                DocumentModel(
+                    document_id=document_id,
+                    status='invalid',
+                    metadata={'error': str(e)}
+                )
+                for document_id in document_ids
+            ]
+    
     def get_document_types(self) -> list:
         """
         Типы документов недоступны без БД; возвращаем пусто.
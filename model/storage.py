@@ -2,15 +2,19 @@
 Локальное хранилище для журнала верификаций
 """
 import sqlite3
-import json
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional
 from pathlib import Path
 from kivy.logger import Logger
 
 from model.document_model import VerificationRecord
 
 
+# Счетчик удалений по пути базы: снимки журнала (model/history_snapshot.py)
+# по нему понимают, что догрузки по id недостаточно
+_deletions: Dict[str, int] = {}
+
+
 class Storage:
     """Класс для работы с локальной базой данных"""
     
@@ -38,10 +42,32 @@ class Storage:
                     timestamp TEXT NOT NULL,
                     document_type TEXT,
                     issuer TEXT,
-                    metadata TEXT
+                    metadata TEXT,
+                    seen_count INTEGER NOT NULL DEFAULT 1,
+                    last_seen TEXT
                 )
             ''')
             
+            # Миграция журналов, созданных до появления счетчика повторов
+            cursor.execute('PRAGMA table_info(verifications)')
+            columns = {row[1] for row in cursor.fetchall()}
+            if 'seen_count' not in columns:
+                cursor.execute('ALTER TABLE verifications ADD COLUMN seen_count INTEGER NOT NULL DEFAULT 1')
+            if 'last_seen' not in columns:
+                cursor.execute('ALTER TABLE verifications ADD COLUMN last_seen TEXT')
+            
+            # В metadata раньше дублировалась вся запись (record.to_dict()); колонка
+            # оставлена для произвольных метаданных, дубли очищаются один раз
+            cursor.execute('PRAGMA user_version')
+            if cursor.fetchone()[0] < 1:
+                cursor.execute('UPDATE verifications SET metadata = NULL WHERE metadata IS NOT NULL')
+                cursor.execute('PRAGMA user_version = 1')
+            
+            # Постраничная выборка по времени для отчетов
+            cursor.execute(
+                'CREATE INDEX IF NOT EXISTS idx_verifications_timestamp ON verifications(timestamp, id)'
+            )
+            
             conn.commit()
             conn.close()
             Logger.info("Storage: База данных инициализирована")
@@ -63,19 +89,17 @@ class Storage:
             cursor = conn.cursor()
             
             timestamp = record.timestamp or datetime.now()
-            metadata_json = json.dumps(record.to_dict())
             
             cursor.execute('''
                 INSERT INTO verifications 
-                (document_id, status, timestamp, document_type, issuer, metadata)
-                VALUES (?, ?, ?, ?, ?, ?)
+                (document_id, status, timestamp, document_type, issuer)
+                VALUES (?, ?, ?, ?, ?)
             ''', (
                 record.document_id,
                 record.status,
                 timestamp.isoformat(),
                 record.document_type,
-                record.issuer,
-                metadata_json
+                record.issuer
             ))
             
             record_id = cursor.lastrowid
@@ -88,6 +112,76 @@ class Storage:
             Logger.error(f"Storage: Ошибка сохранения записи: {e}")
             return -1
     
+    def save_verifications(self, records: List[VerificationRecord]) -> List[int]:
+        """
+        Сохранение нескольких записей одной транзакцией
+        
+        Args:
+            records: Записи о верификации
+            
+        Returns:
+            ID сохраненных записей в порядке records
+        """
+        if not records:
+            return []
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            
+            now = datetime.now()
+            record_ids = []
+            for record in records:
+                timestamp = record.timestamp or now
+                cursor.execute('''
+                    INSERT INTO verifications 
+                    (document_id, status, timestamp, document_type, issuer)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (
+                    record.document_id,
+                    record.status,
+                    timestamp.isoformat(),
+                    record.document_type,
+                    record.issuer
+                ))
+                record_ids.append(cursor.lastrowid)
+            
+            conn.commit()
+            conn.close()
+            
+            Logger.info(f"Storage: Сохранено записей: {len(record_ids)}")
+            return record_ids
+        except Exception as e:
+            Logger.error(f"Storage: Ошибка сохранения записей: {e}")
+            return []
+    
+    def mark_seen_again(self, record_id: int) -> bool:
+        """
+        Учет повторного сканирования без создания новой записи
+        
+        Args:
+            record_id: ID записи, к которой относится повтор
+            
+        Returns:
+            True если успешно
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                UPDATE verifications
+                SET seen_count = seen_count + 1, last_seen = ?
+                WHERE id = ?
+            ''', (datetime.now().isoformat(), record_id))
+            
+            updated = cursor.rowcount > 0
+            conn.commit()
+            conn.close()
+            return updated
+        except Exception as e:
+            Logger.error(f"Storage: Ошибка обновления счетчика повторов: {e}")
+            return False
+    
     def get_all_verifications(self, limit: Optional[int] = None) -> List[VerificationRecord]:
         """
         Получение всех записей верификации
@@ -102,32 +196,150 @@ class Storage:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
-            query = 'SELECT * FROM verifications ORDER BY timestamp DESC'
+            query = '''
+                SELECT id, document_id, status, timestamp, document_type, issuer, seen_count, last_seen
+                FROM verifications ORDER BY timestamp DESC
+            '''
             if limit:
                 query += f' LIMIT {limit}'
             
+            # Строки сразу собираются в записи, даты разбираются при обращении
+            cursor.row_factory = VerificationRecord.from_row
             cursor.execute(query)
-            rows = cursor.fetchall()
+            records = cursor.fetchall()
             conn.close()
             
-            records = []
-            for row in rows:
-                record = VerificationRecord(
-                    id=row[0],
-                    document_id=row[1],
-                    status=row[2],
-                    timestamp=datetime.fromisoformat(row[3]),
-                    document_type=row[4],
-                    issuer=row[5]
-                )
-                records.append(record)
-            
             Logger.info(f"Storage: Получено {len(records)} записей")
             return records
         except Exception as e:
             Logger.error(f"Storage: Ошибка получения записей: {e}")
             return []
     
+    @staticmethod
+    def _period_clause(start: Optional[datetime], end: Optional[datetime]):
+        """Условия WHERE для периода [start, end)"""
+        conditions = []
+        params = []
+        if start is not None:
+            conditions.append('timestamp >= ?')
+            params.append(start.isoformat())
+        if end is not None:
+            conditions.append('timestamp < ?')
+            params.append(end.isoformat())
+        return conditions, params
+    
+    def count_verifications(self, start: Optional[datetime] = None,
+                            end: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Количество записей за период по статусам
+        
+        Args:
+            start: Начало периода (включительно)
+            end: Конец периода (не включительно)
+        
+        Returns:
+            Словарь {статус: количество}
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            
+            conditions, params = self._period_clause(start, end)
+            query = 'SELECT status, COUNT(*) FROM verifications'
+            if conditions:
+                query += ' WHERE ' + ' AND '.join(conditions)
+            query += ' GROUP BY status'
+            
+            cursor.execute(query, params)
+            counts = {row[0]: row[1] for row in cursor.fetchall()}
+            conn.close()
+            return counts
+        except Exception as e:
+            Logger.error(f"Storage: Ошибка подсчета записей: {e}")
+            return {}
+    
+    def iter_verifications(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                           page_size: int = 500) -> Iterator[VerificationRecord]:
+        """
+        Постраничный обход записей за период в хронологическом порядке
+        
+        Страницы выбираются по ключу (timestamp, id): в памяти одновременно
+        не больше page_size записей, соединение между страницами закрыто.
+        
+        Args:
+            start: Начало периода (включительно)
+            end: Конец периода (не включительно)
+            page_size: Размер страницы
+        
+        Yields:
+            Записи о верификации
+        """
+        last_key = None
+        while True:
+            conditions, params = self._period_clause(start, end)
+            if last_key is not None:
+                conditions.append('(timestamp > ? OR (timestamp = ? AND id > ?))')
+                params.extend([last_key[0], last_key[0], last_key[1]])
+            
+            query = '''
+                SELECT id, document_id, status, timestamp, document_type, issuer, seen_count, last_seen
+                FROM verifications
+            '''
+            if conditions:
+                query += ' WHERE ' + ' AND '.join(conditions)
+            query += ' ORDER BY timestamp, id LIMIT ?'
+            params.append(page_size)
+            
+            try:
+                conn = sqlite3.connect(self.db_path)
+                cursor = conn.cursor()
+                cursor.row_factory = VerificationRecord.from_row
+                cursor.execute(query, params)
+                records = cursor.fetchall()
+                conn.close()
+            except Exception as e:
+                Logger.error(f"Storage: Ошибка постраничной выборки: {e}")
+                return
+            
+            yield from records
+            
+            if len(records) < page_size:
+                return
+            last_key = (records[-1].timestamp_iso, records[-1].id)
+    
+    @property
+    def deletion_generation(self) -> int:
+        """Номер поколения: растет при каждом удалении записей в этом процессе"""
+        return _deletions.get(self.db_path, 0)
+    
+    def _record_deletion(self):
+        _deletions[self.db_path] = _deletions.get(self.db_path, 0) + 1
+    
+    def get_rows_after(self, after_id: int, limit: int = 20000) -> List[tuple]:
+        """
+        Строки журнала для колоночного снимка (model/history_snapshot.py)
+        
+        Args:
+            after_id: Последний уже загруженный ID
+            limit: Максимальное количество строк
+            
+        Returns:
+            Кортежи (id, timestamp, status, document_type, issuer) по возрастанию id
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id, timestamp, status, document_type, issuer
+                FROM verifications WHERE id > ? ORDER BY id LIMIT ?
+            ''', (after_id, limit))
+            rows = cursor.fetchall()
+            conn.close()
+            return rows
+        except Exception as e:
+            Logger.error(f"Storage: Ошибка выборки строк для снимка: {e}")
+            return []
+    
     def delete_verification(self, record_id: int) -> bool:
         """
         Удаление записи о верификации
@@ -145,6 +357,7 @@ class Storage:
             cursor.execute('DELETE FROM verifications WHERE id = ?', (record_id,))
             conn.commit()
             conn.close()
+            self._record_deletion()
             
             Logger.info(f"Storage: Запись {record_id} удалена")
             return True
@@ -166,6 +379,7 @@ class Storage:
             cursor.execute('DELETE FROM verifications')
             conn.commit()
             conn.close()
+            self._record_deletion()
             
             Logger.info("Storage: Все записи удалены")
             return True
@@ -0,0 +1,64 @@
+"""
+Сравнение последовательного и параллельного пакетного экспорта PDF
+
+    python pdf_benchmark.py [число документов] [число процессов]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import config
+from model.document_model import DocumentModel
+from services.pdf_export import PDFExportService
+
+
+def make_documents(count: int):
+    """Синтетические документы для замера"""
+    statuses = ('valid', 'warning', 'invalid')
+    return [
+        DocumentModel(
+            document_id=f"BENCH-{index:06d}",
+            status=statuses[index % len(statuses)],
+            document_type='Диплом',
+            issuer='Тестовый вуз',
+            issue_date='2020-06-30',
+            metadata={'series': 'БМ', 'number': index}
+        )
+        for index in range(count)
+    ]
+
+
+def run(count: int = 200, workers: int = 0) -> dict:
+    """
+    Замер пропускной способности
+
+    Returns:
+        {'serial': документов/с, 'parallel': документов/с, 'workers': процессов}
+    """
+    documents = make_documents(count)
+    output_dir = tempfile.mkdtemp(prefix='pdf_bench_')
+    try:
+        service = PDFExportService(output_dir)
+        results = {}
+        for label, pool_size in (('serial', 1), ('parallel', workers or None)):
+            started = time.perf_counter()
+            paths = service.export_batch(documents, workers=pool_size, subdir=label)
+            elapsed = time.perf_counter() - started
+            if not all(paths):
+                raise RuntimeError(f"{label}: не все документы экспортированы")
+            results[label] = count / elapsed
+            print(f"{label:>8}: {elapsed:.2f} с, {results[label]:.1f} док/с")
+
+        results['workers'] = workers or config.PDF_EXPORT_WORKERS or os.cpu_count() or 1
+        print(f"Ускорение: x{results['parallel'] / results['serial']:.2f}")
+        return results
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    run(count, workers)
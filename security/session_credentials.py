@@ -0,0 +1,168 @@
+"""
+Сессионный провайдер учетных данных
+PIN-код расшифровывается один раз после входа и держится в памяти
+"""
+import os
+import threading
+import time
+from typing import Optional
+from kivy.logger import Logger
+
+import config
+from security.pin_storage import PinStorage
+
+
+class SessionCredentials:
+    """
+    Кэш расшифрованного PIN-кода на время сессии
+    
+    Ключ шифрования и Fernet создаются один раз (через единственный PinStorage).
+    PIN сбрасывается из памяти после простоя и при блокировке; изменение
+    файла хранилища другим экземпляром PinStorage замечается по stat().
+    Строки Python неизменяемы, поэтому "затирание" означает только сброс ссылки.
+    """
+    
+    def __init__(
+        self,
+        pin_storage: Optional[PinStorage] = None,
+        idle_timeout: Optional[float] = None,
+        stat_interval: Optional[float] = None
+    ):
+        """
+        Инициализация провайдера
+        
+        Args:
+            pin_storage: Хранилище PIN (по умолчанию создается одно на процесс)
+            idle_timeout: Время простоя в секундах, после которого PIN сбрасывается
+            stat_interval: Как часто (в секундах) проверять изменение файла хранилища
+        """
+        self.pin_storage = pin_storage or PinStorage()
+        self.idle_timeout = config.PIN_IDLE_TIMEOUT if idle_timeout is None else idle_timeout
+        self.stat_interval = config.PIN_STAT_INTERVAL if stat_interval is None else stat_interval
+        
+        self._pin: Optional[str] = None
+        self._loaded = False
+        self._locked = True
+        self._last_access = 0.0
+        self._last_stat_check = 0.0
+        self._file_signature = None
+        self._lock = threading.Lock()
+    
+    @property
+    def is_locked(self) -> bool:
+        """Заблокирована ли сессия (PIN не выдается до входа)"""
+        return self._locked
+    
+    def _storage_signature(self):
+        """Отпечаток файла хранилища: (mtime_ns, size) или None"""
+        try:
+            stat = os.stat(self.pin_storage.storage_path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+    
+    def _load(self):
+        """Чтение и расшифровка PIN с диска (под блокировкой)"""
+        self._file_signature = self._storage_signature()
+        self._pin = self.pin_storage.get_pin() if self._file_signature else None
+        self._loaded = True
+        self._last_stat_check = time.monotonic()
+    
+    def unlock(self, pin: Optional[str] = None):
+        """
+        Начало сессии после входа
+        
+        Args:
+            pin: Введенный PIN (сохраняется на диск); если None - читается сохраненный
+        """
+        with self._lock:
+            if pin:
+                self.pin_storage.save_pin(pin)
+            self._load()
+            self._locked = False
+            self._last_access = time.monotonic()
+        Logger.info("SessionCredentials: Сессия разблокирована")
+    
+    def get_pin(self) -> Optional[str]:
+        """
+        Получение PIN-кода без обращения к диску в обычном случае
+        
+        Returns:
+            PIN-код или None (нет PIN или сессия заблокирована)
+        """
+        with self._lock:
+            if self._locked:
+                return None
+            
+            now = time.monotonic()
+            if self._loaded and self.idle_timeout > 0 and now - self._last_access > self.idle_timeout:
+                Logger.info("SessionCredentials: PIN сброшен из памяти по простою")
+                self._pin = None
+                self._loaded = False
+            
+            if self._loaded and now - self._last_stat_check >= self.stat_interval:
+                self._last_stat_check = now
+                if self._storage_signature() != self._file_signature:
+                    Logger.info("SessionCredentials: Файл хранилища изменился, PIN перечитан")
+                    self._loaded = False
+            
+            if not self._loaded:
+                self._load()
+            
+            self._last_access = now
+            return self._pin
+    
+    def set_pin(self, pin: str) -> bool:
+        """
+        Сохранение нового PIN на диск и в память
+        
+        Returns:
+            True если успешно
+        """
+        with self._lock:
+            saved = self.pin_storage.save_pin(pin)
+            if saved:
+                self._pin = pin
+                self._loaded = True
+                self._file_signature = self._storage_signature()
+                self._last_access = time.monotonic()
+            return saved
+    
+    def delete_pin(self) -> bool:
+        """
+        Удаление PIN с диска и из памяти
+        
+        Returns:
+            True если успешно
+        """
+        with self._lock:
+            deleted = self.pin_storage.delete_pin()
+            self._pin = None
+            self._loaded = True
+            self._file_signature = self._storage_signature()
+            return deleted
+    
+    def wipe(self):
+        """Сброс PIN из памяти; при следующем запросе он будет перечитан"""
+        with self._lock:
+            self._pin = None
+            self._loaded = False
+    
+    def lock(self):
+        """Блокировка сессии: PIN сбрасывается и не выдается до unlock()"""
+        with self._lock:
+            self._pin = None
+            self._loaded = False
+            self._locked = True
+        Logger.info("SessionCredentials: Сессия заблокирована")
+
+
+_session_credentials: Optional[SessionCredentials] = None
+
+
+def get_session_credentials() -> SessionCredentials:
+    """Общий для приложения провайдер учетных данных"""
+    global _session_credentials
+    if _session_credentials is None:
+        _session_credentials = SessionCredentials()
+    return _session_credentials
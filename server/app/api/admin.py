@@ -0,0 +1,173 @@
+"""
+Административные endpoints: потоковая выгрузка реестра и журнала верификаций
+"""
+import hmac
+import json
+import zlib
+from datetime import datetime
+from typing import Iterator, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.document import Document
+from app.models.verification import Verification
+
+router = APIRouter()
+
+# Размер страницы keyset-пагинации и порция строк, читаемая курсором драйвера
+EXPORT_PAGE_SIZE = 10000
+EXPORT_YIELD_PER = 1000
+# Строки склеиваются в куски примерно такого размера перед отправкой
+EXPORT_CHUNK_BYTES = 64 * 1024
+# Значение API_SECRET_KEY из примера настроек: с ним выгрузка закрыта
+DEFAULT_SECRET_KEY = "change-this-in-production"
+
+
+def require_admin(x_admin_key: Optional[str] = Header(None, alias="X-Admin-Key")):
+    """Доступ только с административным ключом"""
+    expected = settings.API_SECRET_KEY
+    if not expected or expected == DEFAULT_SECRET_KEY:
+        raise HTTPException(status_code=503, detail="Административный ключ не настроен")
+    if not x_admin_key or not hmac.compare_digest(x_admin_key.encode('utf-8'), expected.encode('utf-8')):
+        raise HTTPException(status_code=403, detail="Требуется административный ключ")
+
+
+def _keyset_rows(query, id_column) -> Iterator[dict]:
+    """
+    Обход выборки страницами по id с серверным курсором внутри страницы
+
+    Каждая страница - отдельный запрос WHERE id > последний id, поэтому
+    ни приложение, ни БД не держат весь результат; память не зависит
+    от размера выгрузки.
+    """
+    db = SessionLocal()
+    try:
+        last_id = 0
+        while True:
+            page = (
+                query.where(id_column > last_id)
+                .order_by(id_column)
+                .limit(EXPORT_PAGE_SIZE)
+                .execution_options(yield_per=EXPORT_YIELD_PER)
+            )
+            count = 0
+            for row in db.execute(page).mappings():
+                count += 1
+                last_id = row['id']
+                yield row
+            if count < EXPORT_PAGE_SIZE:
+                return
+    finally:
+        db.close()
+
+
+def _json_default(value):
+    """Даты в ISO 8601, остальное строкой"""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def _ndjson_chunks(rows: Iterator[dict]) -> Iterator[bytes]:
+    """Строки выборки в NDJSON, склеенные в куски для отправки"""
+    buffer = []
+    size = 0
+    for row in rows:
+        line = (json.dumps(dict(row), ensure_ascii=False, default=_json_default) + '\n').encode('utf-8')
+        buffer.append(line)
+        size += len(line)
+        if size >= EXPORT_CHUNK_BYTES:
+            yield b''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def _gzip_chunks(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Сжатие потока gzip на лету"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # 31 - формат gzip
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _export_response(request: Request, rows: Iterator[dict], name: str) -> StreamingResponse:
+    """NDJSON-ответ, сжатый gzip, если клиент его принимает"""
+    chunks = _ndjson_chunks(rows)
+    headers = {
+        'Content-Disposition': f'attachment; filename="{name}_{datetime.now():%Y%m%d_%H%M%S}.ndjson"'
+    }
+    if 'gzip' in request.headers.get('accept-encoding', ''):
+        chunks = _gzip_chunks(chunks)
+        headers['Content-Encoding'] = 'gzip'
+        headers['Vary'] = 'Accept-Encoding'
+    return StreamingResponse(chunks, media_type='application/x-ndjson', headers=headers)
+
+
+@router.get("/documents/export", dependencies=[Depends(require_admin)])
+def export_documents(
+    request: Request,
+    status: Optional[str] = None,
+    issuer: Optional[str] = None,
+    updated_from: Optional[datetime] = None,
+    updated_to: Optional[datetime] = None
+):
+    """
+    Выгрузка реестра документов в NDJSON
+
+    - **status**: Фильтр по статусу
+    - **issuer**: Фильтр по издателю
+    - **updated_from** / **updated_to**: Диапазон updated_at [from, to)
+    """
+    table = Document.__table__
+    # Хэш PIN не выгружается: вместо него - признак наличия PIN, как в sync.php
+    columns = [column for column in table.c if column.name != 'pin_hash']
+    query = select(*columns, table.c.pin_hash.isnot(None).label('pin_required'))
+    if status:
+        query = query.where(table.c.status == status)
+    if issuer:
+        query = query.where(table.c.issuer == issuer)
+    if updated_from:
+        query = query.where(table.c.updated_at >= updated_from)
+    if updated_to:
+        query = query.where(table.c.updated_at < updated_to)
+
+    return _export_response(request, _keyset_rows(query, table.c.id), 'documents')
+
+
+@router.get("/verifications/export", dependencies=[Depends(require_admin)])
+def export_verifications(
+    request: Request,
+    status: Optional[str] = None,
+    issuer: Optional[str] = None,
+    verified_from: Optional[datetime] = None,
+    verified_to: Optional[datetime] = None
+):
+    """
+    Выгрузка журнала верификаций в NDJSON
+
+    - **status**: Фильтр по результату проверки
+    - **issuer**: Фильтр по издателю проверенного документа
+    - **verified_from** / **verified_to**: Диапазон verified_at [from, to)
+    """
+    table = Verification.__table__
+    query = select(table)
+    if issuer:
+        documents = Document.__table__
+        query = query.join(documents, documents.c.id == table.c.document_id)
+        query = query.where(documents.c.issuer == issuer)
+    if status:
+        query = query.where(table.c.status == status)
+    if verified_from:
+        query = query.where(table.c.verified_at >= verified_from)
+    if verified_to:
+        query = query.where(table.c.verified_at < verified_to)
+
+    return _export_response(request, _keyset_rows(query, table.c.id), 'verifications')
@@ -1,21 +1,73 @@
 """
 API endpoints для работы с документами
 """
-from fastapi import APIRouter, Depends, HTTPException, Header
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Header, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+from sqlalchemy import update
+from sqlalchemy.orm import Session, load_only
 from typing import Optional
 
 from app.database import get_db
 from app.models.document import Document
 from app.schemas.document import DocumentVerifyRequest, DocumentResponse, DocumentErrorResponse
 from app.services.verification_service import VerificationService
+from app.services.certificate_service import get_certificate_service
+from app.services.pin_service import PinVerdict, get_pin_service
 
 router = APIRouter()
 
+# Проекция верификации: статус, срок и версия документа (плюс id) - без
+# разбора JSON-метаданных, пока ответ может прийти из кэша сертификатов
+VERIFY_COLUMNS = (Document.public_code, Document.status, Document.expiry_date, Document.updated_at)
+
+
+async def require_pin(document: Document, pin_code: Optional[str], http_request: Request, db: Session):
+    """
+    Проверка PIN документа, защищенного PIN-кодом
+    
+    Raises:
+        HTTPException: 401 - PIN неверен или не указан, 429 - исчерпан
+            лимит попыток, 503 - очередь проверок переполнена
+    """
+    if not document.pin_hash:
+        return
+    
+    # Соединение возвращается в пул до KDF: при переборе сотни ожидающих
+    # запросов не должны держать все соединения (загруженные поля остаются)
+    db.close()
+    client_ip = http_request.client.host if http_request.client else None
+    check = await get_pin_service().check(document.public_code, document.pin_hash, pin_code, client_ip)
+    
+    if check.verdict == PinVerdict.LOCKED:
+        raise HTTPException(
+            status_code=429,
+            detail="Слишком много попыток ввода PIN-кода",
+            headers={"Retry-After": str(check.retry_after)}
+        )
+    if check.verdict == PinVerdict.BUSY:
+        raise HTTPException(
+            status_code=503,
+            detail="Проверка PIN-кода временно недоступна",
+            headers={"Retry-After": str(check.retry_after)}
+        )
+    if check.verdict != PinVerdict.OK:
+        raise HTTPException(
+            status_code=401,
+            detail="Неверный PIN или не указан"
+        )
+    if check.new_hash:
+        # Параметры KDF изменились: хэш пересчитан с текущими
+        db.execute(
+            update(Document).where(Document.id == document.id).values(pin_hash=check.new_hash.encode('ascii'))
+        )
+        db.commit()
+
 
 @router.post("/verify", response_model=DocumentResponse)
 @router.get("/verify", response_model=DocumentResponse)
 async def verify_document(
+    http_request: Request,
     request: Optional[DocumentVerifyRequest] = None,
     document_id: Optional[str] = None,  # Для GET запросов
     pin_code: Optional[str] = Header(None, alias="X-PIN-Code"),
@@ -27,7 +79,7 @@ async def verify_document(
     Поддерживает как POST (с JSON телом), так и GET (с query параметром document_id)
     
     - **document_id**: ID документа из QR-кода
-    - **X-PIN-Code**: PIN-код для аутентификации (опционально)
+    - **X-PIN-Code**: PIN-код документа (обязателен, если документ защищен PIN)
     """
     # Определяем document_id из запроса
     doc_id = document_id or (request.document_id if request else None)
@@ -38,9 +90,9 @@ async def verify_document(
             detail="document_id обязателен"
         )
     
-    # Поиск документа в БД
+    # Поиск документа в БД (document_id API - public_code документа)
     document = db.query(Document).filter(
-        Document.document_id == doc_id
+        Document.public_code == doc_id
     ).first()
     
     if not document:
@@ -50,28 +102,63 @@ async def verify_document(
             error="Документ не найден в реестре"
         )
     
-    # Проверка PIN (если требуется)
-    if pin_code:
-        # Здесь можно добавить проверку PIN
-        # Для примера просто проверяем, что PIN не пустой
-        if not pin_code or len(pin_code) < 4:
-            raise HTTPException(
-                status_code=401,
-                detail="Неверный PIN-код"
-            )
+    # Проверка PIN (если документ им защищен)
+    await require_pin(document, pin_code, http_request, db)
     
     # Определение статуса документа
     status = VerificationService.determine_status(document)
     
     return DocumentResponse(
-        document_id=document.document_id,
+        document_id=document.public_code,
         status=status,
         document_type=document.document_type,
         issuer=document.issuer,
         issue_date=document.issue_date,
         expiry_date=document.expiry_date,
-        metadata=document.metadata or {}
+        metadata=document.metadata_ or {}
     )
 
 
-
+@router.get("/{document_id}/certificate.pdf", response_class=FileResponse)
+async def get_certificate(
+    document_id: str,
+    http_request: Request,
+    pin_code: Optional[str] = Header(None, alias="X-PIN-Code"),
+    db: Session = Depends(get_db)
+):
+    """
+    PDF-сертификат верификации документа
+    
+    Файл рендерится один раз для каждой версии документа
+    (document_id, updated_at, статус) и дальше отдается с диска.
+    Для попадания в кэш хватает проекции верификации (и pin_hash для
+    документов с PIN); строка с JSON-метаданными читается только перед рендером.
+    
+    - **X-PIN-Code**: PIN-код документа (обязателен, если документ защищен PIN)
+    """
+    document = db.query(Document).options(load_only(*VERIFY_COLUMNS, Document.pin_hash)).filter(
+        Document.public_code == document_id
+    ).first()
+    
+    if not document:
+        raise HTTPException(
+            status_code=404,
+            detail="Документ не найден в реестре"
+        )
+    
+    await require_pin(document, pin_code, http_request, db)
+    
+    status = VerificationService.determine_status(document)
+    service = get_certificate_service()
+    
+    path = service.cache_path(document, status)
+    if not path.exists():
+        document = db.query(Document).populate_existing().filter(Document.id == document.id).one()
+        # reportlab блокирует поток: рендер вне event loop
+        path = await run_in_threadpool(service.get_certificate, document, status)
+    
+    return FileResponse(
+        path,
+        media_type="application/pdf",
+        filename=f"certificate_{document.public_code}.pdf"
+    )
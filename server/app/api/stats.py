@@ -0,0 +1,99 @@
+"""
+Статистика проверок для панели операторов
+
+Ответы строятся по часовым агрегатам (app/services/stats_service.py) и
+кэшируются на STATS_CACHE_TTL секунд. Границы периода округляются до часа.
+"""
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+
+from app.api.admin import require_admin
+from app.config import settings
+from app.services.stats_service import get_stats_service
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+def _hour(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0, tzinfo=None)
+
+
+def _period(date_from: Optional[datetime], date_to: Optional[datetime], default_hours: int) -> Tuple[datetime, datetime]:
+    """Период [from, to) по границам часов; по умолчанию - последние default_hours часов"""
+    end = _hour(date_to) if date_to else _hour(datetime.now()) + timedelta(hours=1)
+    start = _hour(date_from) if date_from else end - timedelta(hours=default_hours)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="Начало периода должно быть раньше конца")
+    return start, end
+
+
+def _cache_headers(response: Response):
+    response.headers['Cache-Control'] = f"private, max-age={settings.STATS_CACHE_TTL}"
+
+
+@router.get("/hourly")
+async def verifications_per_hour(
+    response: Response,
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    status: Optional[str] = None
+):
+    """
+    Проверок по часам (по умолчанию за последние сутки)
+
+    - **from** / **to**: Период [from, to)
+    - **status**: Только проверки с этим результатом
+    """
+    start, end = _period(date_from, date_to, 24)
+    _cache_headers(response)
+    items = await run_in_threadpool(get_stats_service().hourly, start, end, status)
+    return {'from': start, 'to': end, 'items': items}
+
+
+@router.get("/status")
+async def verifications_per_status(
+    response: Response,
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to")
+):
+    """Проверок по результату (по умолчанию за 30 дней)"""
+    start, end = _period(date_from, date_to, 24 * 30)
+    _cache_headers(response)
+    items = await run_in_threadpool(get_stats_service().by_column, 'status', start, end)
+    return {'from': start, 'to': end, 'items': items}
+
+
+@router.get("/document-types")
+async def verifications_per_document_type(
+    response: Response,
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to")
+):
+    """Проверок по типу документа (по умолчанию за 30 дней; '' - документ не найден)"""
+    start, end = _period(date_from, date_to, 24 * 30)
+    _cache_headers(response)
+    items = await run_in_threadpool(get_stats_service().by_column, 'document_type', start, end)
+    return {'from': start, 'to': end, 'items': items}
+
+
+@router.get("/invalid-issuers")
+async def top_invalid_issuers(
+    response: Response,
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    limit: int = Query(10, ge=1, le=100),
+    min_total: int = Query(1, ge=1)
+):
+    """
+    Издатели с наибольшим числом недействительных результатов (по умолчанию за 30 дней)
+
+    - **limit**: Сколько издателей вернуть
+    - **min_total**: Минимум проверок издателя за период
+    """
+    start, end = _period(date_from, date_to, 24 * 30)
+    _cache_headers(response)
+    items = await run_in_threadpool(get_stats_service().top_invalid_issuers, start, end, limit, min_total)
+    return {'from': start, 'to': end, 'items': items}
@@ -30,8 +30,47 @@ class Settings(BaseSettings):
     # CORS
     ALLOWED_ORIGINS: List[str] = ["*"]
     
-    # Rate limiting
-    RATE_LIMIT_PER_MINUTE: int = 60
+    # Rate limiting (token bucket на клиента, app/middleware/rate_limit.py)
+    RATE_LIMIT_PER_MINUTE: int = 60  # 0 - без ограничения
+    RATE_LIMIT_BURST: int = 20  # запросов подряд без ожидания, 0 - равно RATE_LIMIT_PER_MINUTE
+    RATE_LIMIT_BACKEND: str = "memory"  # memory - в процессе, redis - общий для воркеров
+    RATE_LIMIT_REDIS_TIMEOUT: float = 0.2  # секунд; при недоступном Redis запросы пропускаются
+    RATE_LIMIT_EXEMPT_PATHS: List[str] = ["/health", "/docs", "/redoc", "/openapi.json"]
+    
+    # Пакетный импорт документов
+    IMPORT_CHUNK_SIZE: int = 1000
+    
+    # PDF-сертификаты
+    CERTIFICATE_CACHE_DIR: str = "cache/certificates"
+    PDF_FONT_PATHS: List[str] = [
+        "fonts/DejaVuSans.ttf",
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    ]
+    
+    # Статистика: агрегаты журнала верификаций
+    STATS_ROLLUP_INTERVAL: float = 60.0  # секунд между пересчетами, 0 - фоновый пересчет выключен
+    STATS_ROLLUP_BATCH: int = 50000  # записей журнала на транзакцию
+    STATS_ROLLUP_LAG_SECONDS: int = 30  # свежие записи ждут фиксации параллельных транзакций
+    STATS_CACHE_TTL: int = 30  # секунд жизни ответа /v1/stats
+    
+    # Журнал верификаций: помесячные секции (maintain_partitions.py)
+    VERIFICATIONS_PARTITIONS_AHEAD: int = 3  # месяцев вперед, для которых секции создаются заранее
+    VERIFICATIONS_RETENTION_MONTHS: int = 24  # срок хранения в месяцах, 0 - хранить всегда
+    VERIFICATIONS_ARCHIVE_DIR: str = ""  # каталог NDJSON.gz-архивов удаляемых секций, пусто - без архива
+    
+    # PIN-коды документов (хэши password_hash() PHP: argon2id или bcrypt)
+    PIN_HASH_SCHEME: str = "argon2"  # схема новых хэшей: argon2 или bcrypt
+    PIN_ARGON2_TIME_COST: int = 4  # параметры по умолчанию совпадают с PHP
+    PIN_ARGON2_MEMORY_KB: int = 65536
+    PIN_ARGON2_PARALLELISM: int = 1
+    PIN_BCRYPT_ROUNDS: int = 10
+    PIN_HASH_WORKERS: int = 4  # потоков для KDF
+    PIN_HASH_MAX_PENDING: int = 32  # проверок в пуле и очереди, сверх - 503
+    PIN_CACHE_TTL: int = 300  # секунд, сколько помнится успешная проверка
+    PIN_CACHE_SIZE: int = 10000
+    PIN_ATTEMPT_WINDOW: int = 900  # окно счетчиков попыток, секунд
+    PIN_MAX_ATTEMPTS_PER_DOCUMENT: int = 10
+    PIN_MAX_ATTEMPTS_PER_IP: int = 30
     
     # Redis (опционально)
     REDIS_HOST: str = "localhost"
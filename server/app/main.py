@@ -1,6 +1,8 @@
 """
 Главный файл FastAPI приложения
 """
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -8,7 +10,10 @@ import uvicorn
 
 from app.config import settings
 from app.database import engine, Base
-from app.api import documents, types
+from app.api import documents, types, admin, stats
+from app.middleware.rate_limit import RateLimitMiddleware, create_backend
+from app.models import stats as stats_models  # noqa: F401 - таблицы агрегатов для create_all
+from app.services.stats_service import get_stats_service
 
 # Создание таблиц БД
 Base.metadata.create_all(bind=engine)
@@ -22,6 +27,15 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+# Ограничение частоты запросов (внутри CORS: ответ 429 тоже с CORS-заголовками)
+rate_limit_backend = create_backend()
+if rate_limit_backend is not None:
+    app.add_middleware(
+        RateLimitMiddleware,
+        backend=rate_limit_backend,
+        exempt_paths=settings.RATE_LIMIT_EXEMPT_PATHS
+    )
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -34,6 +48,17 @@ app.add_middleware(
 # Подключение роутеров
 app.include_router(documents.router, prefix="/v1/documents", tags=["documents"])
 app.include_router(types.router, prefix="/v1", tags=["types"])
+app.include_router(admin.router, prefix="/v1/admin", tags=["admin"])
+app.include_router(stats.router, prefix="/v1/stats", tags=["stats"])
+
+
+@app.on_event("startup")
+async def start_stats_rollup():
+    """Фоновый пересчет агрегатов статистики"""
+    if settings.STATS_ROLLUP_INTERVAL > 0:
+        app.state.stats_rollup = asyncio.create_task(
+            get_stats_service().rollup_forever(settings.STATS_ROLLUP_INTERVAL)
+        )
 
 
 @app.get("/health")
@@ -0,0 +1,190 @@
+"""
+Ограничение частоты запросов (token bucket)
+
+У каждого клиента (по умолчанию - IP) своя корзина на RATE_LIMIT_BURST
+токенов, пополняемая со скоростью RATE_LIMIT_PER_MINUTE в минуту; запрос
+забирает токен, при пустой корзине - ответ 429 с Retry-After.
+
+Хранилища:
+- memory: корзины в процессе. Корзина, простоявшая дольше времени полного
+  пополнения, неотличима от новой и удаляется; проверка идет от самых
+  давних корзин, каждая удаляется не более одного раза - O(1) амортизированно.
+- redis: общие корзины для нескольких воркеров; пополнение и списание -
+  один Lua-скрипт по времени Redis. При недоступности Redis запросы
+  пропускаются (лимит - защита пула БД, а не авторизация).
+"""
+import json
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+from app.config import settings
+
+try:
+    import redis.asyncio as redis_asyncio
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Сколько давних корзин проверяется на удаление за один запрос
+CLEANUP_STEP = 2
+# Не чаще раза в столько секунд пишется предупреждение о недоступном Redis
+REDIS_ERROR_LOG_INTERVAL = 60.0
+
+_REJECT_BODY = json.dumps({'detail': 'Слишком много запросов'}, ensure_ascii=False).encode('utf-8')
+_REJECT_HEADERS = [
+    (b'content-type', b'application/json; charset=utf-8'),
+    (b'content-length', str(len(_REJECT_BODY)).encode('ascii')),
+]
+
+
+class MemoryBackend:
+    """Корзины в памяти процесса"""
+
+    def __init__(self, per_minute: int, burst: int):
+        self.rate = per_minute / 60.0  # токенов в секунду
+        self.burst = float(burst)
+        self.full_after = self.burst / self.rate  # секунд до полного пополнения
+        # ключ -> [токены, время последнего обращения]; порядок - по времени обращения
+        self._buckets: 'OrderedDict[str, list]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    async def take(self, key: str, now: Optional[float] = None) -> float:
+        """
+        Списание токена
+
+        Returns:
+            0 - запрос разрешен, иначе секунд до появления токена
+        """
+        now = time.monotonic() if now is None else now
+        buckets = self._buckets
+
+        for _ in range(CLEANUP_STEP):
+            if not buckets:
+                break
+            oldest_key, oldest = next(iter(buckets.items()))
+            if now - oldest[1] < self.full_after:
+                break
+            del buckets[oldest_key]
+
+        bucket = buckets.get(key)
+        if bucket is None:
+            buckets[key] = [self.burst - 1, now]
+            return 0.0
+
+        tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        buckets.move_to_end(key)
+        if tokens >= 1:
+            bucket[0] = tokens - 1
+            return 0.0
+        bucket[0] = tokens
+        return (1 - tokens) / self.rate
+
+
+class RedisBackend:
+    """Общие корзины в Redis (или совместимом хранилище с Lua)"""
+
+    SCRIPT = """
+    local rate = tonumber(ARGV[1])
+    local burst = tonumber(ARGV[2])
+    local time = redis.call('TIME')
+    local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(bucket[1]) or burst
+    local ts = tonumber(bucket[2]) or now
+    tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+    local wait = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+    else
+        wait = (1 - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+    return tostring(wait)
+    """
+
+    def __init__(self, per_minute: int, burst: int, client=None, prefix: str = 'ratelimit:'):
+        if client is None:
+            if not REDIS_AVAILABLE:
+                raise RuntimeError("Пакет redis не установлен")
+            client = redis_asyncio.Redis(
+                host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=settings.REDIS_DB,
+                socket_timeout=settings.RATE_LIMIT_REDIS_TIMEOUT,
+                socket_connect_timeout=settings.RATE_LIMIT_REDIS_TIMEOUT
+            )
+        self.client = client
+        self.rate = per_minute / 60.0
+        self.burst = float(burst)
+        self.prefix = prefix
+        self._script = client.register_script(self.SCRIPT)
+        self._last_error_log = 0.0
+
+    async def take(self, key: str, now: Optional[float] = None) -> float:
+        """Списание токена (время берется на стороне Redis)"""
+        try:
+            wait = await self._script(keys=[self.prefix + key], args=[self.rate, self.burst])
+        except Exception as e:
+            if time.monotonic() - self._last_error_log >= REDIS_ERROR_LOG_INTERVAL:
+                self._last_error_log = time.monotonic()
+                logger.warning("Redis недоступен, лимит запросов не применяется: %s", e)
+            return 0.0
+        return float(wait)
+
+
+def client_ip(scope) -> str:
+    """Ключ клиента по умолчанию - IP (за nginx - uvicorn --proxy-headers)"""
+    client = scope.get('client')
+    return client[0] if client else 'unknown'
+
+
+class RateLimitMiddleware:
+    """ASGI middleware: 429 с Retry-After при исчерпании корзины клиента"""
+
+    def __init__(self, app, backend, exempt_paths: Optional[List[str]] = None,
+                 key_func: Callable = client_ip):
+        """
+        Args:
+            app: ASGI-приложение
+            backend: MemoryBackend или RedisBackend
+            exempt_paths: Пути без ограничения (точное совпадение)
+            key_func: Ключ клиента по ASGI scope
+        """
+        self.app = app
+        self.backend = backend
+        self.exempt_paths = frozenset(exempt_paths or ())
+        self.key_func = key_func
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        wait = await self.backend.take(self.key_func(scope))
+        if not wait:
+            await self.app(scope, receive, send)
+            return
+
+        await send({
+            'type': 'http.response.start',
+            'status': 429,
+            'headers': _REJECT_HEADERS + [(b'retry-after', str(max(1, math.ceil(wait))).encode('ascii'))],
+        })
+        await send({'type': 'http.response.body', 'body': _REJECT_BODY})
+
+
+def create_backend():
+    """Хранилище корзин по настройкам (None - ограничение выключено)"""
+    if settings.RATE_LIMIT_PER_MINUTE <= 0:
+        return None
+    burst = settings.RATE_LIMIT_BURST or settings.RATE_LIMIT_PER_MINUTE
+    if settings.RATE_LIMIT_BACKEND == 'redis':
+        return RedisBackend(settings.RATE_LIMIT_PER_MINUTE, burst)
+    return MemoryBackend(settings.RATE_LIMIT_PER_MINUTE, burst)
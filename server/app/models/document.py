@@ -1,7 +1,11 @@
 """
 Модель документа в БД
+
+Схема совпадает с рабочей БД (create_and_fill_database.sql) и PHP API:
+код из QR-кода - public_code (в API сервера он называется document_id).
 """
-from sqlalchemy import Column, Integer, String, Date, JSON, DateTime, Index
+from sqlalchemy import Column, Integer, String, Date, JSON, TIMESTAMP, LargeBinary, Index, UniqueConstraint
+from sqlalchemy.dialects.mysql import VARBINARY
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -10,22 +14,26 @@ class Document(Base):
     """Модель документа"""
     __tablename__ = "documents"
     
-    id = Column(Integer, primary_key=True, index=True)
-    document_id = Column(String(255), unique=True, nullable=False, index=True)
+    id = Column(Integer, primary_key=True)
+    public_code = Column(String(64), nullable=False)  # код из QR-кода
+    internal_code = Column(String(255), nullable=False)  # номер документа у издателя
     document_type = Column(String(100))
     issuer = Column(String(255))
     issue_date = Column(Date)
-    expiry_date = Column(Date, index=True)
-    status = Column(String(20), nullable=False, index=True)  # valid, warning, invalid, revoked
-    metadata = Column(JSON)
-    created_at = Column(DateTime, server_default=func.now())  # MySQL TIMESTAMP
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())  # MySQL TIMESTAMP
+    expiry_date = Column(Date)
+    status = Column(String(20), nullable=False, server_default='valid')  # valid, warning, invalid, revoked
+    # Атрибут metadata зарезервирован декларативной базой SQLAlchemy
+    metadata_ = Column('metadata', JSON)
+    pin_hash = Column(LargeBinary().with_variant(VARBINARY(255), 'mysql'))  # password_hash() PHP
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
     
+    # Каждый индекс объявлен один раз: уникальные ключи уже служат индексами
+    # поиска, отдельные индексы по тем же колонкам только удорожали запись
     __table_args__ = (
-        Index('idx_document_id', 'document_id'),
+        UniqueConstraint('public_code', name='uq_documents_public_code'),
+        UniqueConstraint('internal_code', name='uq_documents_internal_code'),
         Index('idx_status', 'status'),
         Index('idx_expiry_date', 'expiry_date'),
+        Index('idx_updated_at', 'updated_at', 'id'),  # курсор синхронизации реестра
     )
-
-
-
@@ -0,0 +1,26 @@
+"""
+Агрегаты журнала верификаций для статистики
+"""
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, TIMESTAMP
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class VerificationRollupHourly(Base):
+    """Число проверок за час по статусу, типу документа и издателю"""
+    __tablename__ = "verification_rollup_hourly"
+    
+    bucket = Column(DateTime, primary_key=True)  # начало часа
+    status = Column(String(20), primary_key=True)
+    document_type = Column(String(100), primary_key=True, default='')  # '' - неизвестен
+    issuer = Column(String(255), primary_key=True, default='')  # '' - неизвестен
+    count = Column(Integer, nullable=False, default=0)
+
+
+class StatsRollupState(Base):
+    """Водяной знак: id последней записи verifications, учтенной в агрегатах"""
+    __tablename__ = "stats_rollup_state"
+    
+    name = Column(String(50), primary_key=True)
+    last_id = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
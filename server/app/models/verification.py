@@ -0,0 +1,31 @@
+"""
+Модель журнала верификаций в БД
+"""
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class Verification(Base):
+    """
+    Запись журнала верификаций
+    
+    В MySQL таблица секционирована по месяцам verified_at (миграция 003):
+    первичный ключ там (id, verified_at), внешнего ключа на documents нет -
+    секционированные таблицы InnoDB их не поддерживают. Записи пишет и
+    PHP API (log_verification), схема общая.
+    """
+    __tablename__ = "verifications"
+    
+    id = Column(Integer, primary_key=True)
+    document_id = Column(Integer, nullable=False)  # documents.id
+    public_code_used = Column(String(64))  # код, по которому проверяли
+    status = Column(String(20), nullable=False)  # valid, warning, invalid
+    ip_address = Column(String(45))  # IPv6 может быть до 45 символов
+    user_agent = Column(Text)
+    verified_at = Column(TIMESTAMP, nullable=False, server_default=func.now())  # ключ секционирования
+    
+    __table_args__ = (
+        Index('idx_verifications_document', 'document_id'),
+        Index('idx_verifications_date', 'verified_at'),
+    )
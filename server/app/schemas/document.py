@@ -1,9 +1,10 @@
 """
 Схемы для валидации данных документов
 """
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from pydantic import AliasChoices, BaseModel, Field, field_validator, model_validator
+from typing import Optional, Dict, Any, Literal
 from datetime import date
+import json
 
 
 class DocumentVerifyRequest(BaseModel):
@@ -32,4 +33,29 @@ class DocumentErrorResponse(BaseModel):
     error: str
 
 
-
+class DocumentImportRow(BaseModel):
+    """Строка пакетного импорта (ограничения совпадают с колонками Document)"""
+    public_code: str = Field(..., min_length=1, max_length=64,
+                             validation_alias=AliasChoices('public_code', 'document_id'))
+    internal_code: Optional[str] = Field(None, min_length=1, max_length=255)
+    document_type: Optional[str] = Field(None, max_length=100)
+    issuer: Optional[str] = Field(None, max_length=255)
+    issue_date: Optional[date] = None
+    expiry_date: Optional[date] = None
+    status: Literal['valid', 'warning', 'invalid', 'revoked'] = 'valid'
+    metadata: Optional[Dict[str, Any]] = None
+    
+    @field_validator('metadata', mode='before')
+    @classmethod
+    def parse_metadata(cls, value):
+        """В CSV метаданные передаются JSON-строкой"""
+        if isinstance(value, str):
+            return json.loads(value)
+        return value
+    
+    @model_validator(mode='after')
+    def default_internal_code(self):
+        """Без внутреннего номера документ учитывается под своим кодом"""
+        if not self.internal_code:
+            self.internal_code = self.public_code
+        return self
@@ -0,0 +1,228 @@
+"""
+Сервис генерации PDF-сертификатов верификации
+
+Макет повторяет клиентский экспорт (services/pdf_export.py): заголовок,
+QR-код с ID документа и таблица параметров. Готовые файлы кэшируются на
+диске по ключу (public_code, updated_at, status) и отдаются как статика.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime
+from io import BytesIO
+from pathlib import Path
+from typing import Optional, Tuple
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import mm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import Image, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from app.config import settings
+from app.models.document import Document
+
+try:
+    import qrcode
+    QRCODE_AVAILABLE = True
+except ImportError:
+    QRCODE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+STATUS_TEXT = {
+    'valid': 'Подлинный',
+    'warning': 'Предупреждение',
+    'invalid': 'Недействителен',
+}
+
+_fonts_lock = threading.Lock()
+_fonts: Optional[Tuple[str, str]] = None
+
+
+def _get_fonts() -> Tuple[str, str]:
+    """Регистрация шрифта с кириллицей (один раз на процесс)"""
+    global _fonts
+    with _fonts_lock:
+        if _fonts is None:
+            _fonts = ("Helvetica", "Helvetica-Bold")
+            for font_path in settings.PDF_FONT_PATHS:
+                if not Path(font_path).exists():
+                    continue
+                try:
+                    pdfmetrics.registerFont(TTFont("DocSans", font_path))
+                    _fonts = ("DocSans", "DocSans")
+                    break
+                except Exception as e:
+                    logger.warning("Не удалось зарегистрировать шрифт %s: %s", font_path, e)
+        return _fonts
+
+
+class CertificateService:
+    """Генерация и дисковый кэш PDF-сертификатов"""
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = Path(cache_dir or settings.CERTIFICATE_CACHE_DIR)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _digest(value: str) -> str:
+        return hashlib.sha256(value.encode('utf-8')).hexdigest()[:24]
+
+    def cache_path(self, document: Document, status: str) -> Path:
+        """
+        Путь к файлу кэша для версии документа
+
+        Имя начинается с хэша public_code, чтобы при смене версии
+        можно было найти и удалить устаревшие файлы этого документа.
+        """
+        updated_at = document.updated_at.isoformat() if document.updated_at else ''
+        version = self._digest(f"{document.public_code}|{updated_at}|{status}")
+        return self.cache_dir / f"{self._digest(document.public_code)}_{version}.pdf"
+
+    def get_certificate(self, document: Document, status: str) -> Path:
+        """
+        Путь к сертификату: из кэша или после рендера
+
+        Рендер пишет во временный файл и атомарно переименовывает его,
+        поэтому параллельные запросы не видят недописанный PDF.
+
+        Args:
+            document: Строка documents
+            status: Вычисленный статус (VerificationService.determine_status)
+
+        Returns:
+            Путь к PDF
+        """
+        path = self.cache_path(document, status)
+        if path.exists():
+            return path
+
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        os.close(fd)
+        try:
+            self.render(document, status, tmp_name)
+            os.replace(tmp_name, path)
+        except Exception:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            raise
+
+        self._remove_stale(path)
+        return path
+
+    def _remove_stale(self, current: Path):
+        """Удаление сертификатов предыдущих версий того же документа"""
+        prefix = current.name.split('_', 1)[0]
+        for stale in self.cache_dir.glob(f"{prefix}_*.pdf"):
+            if stale != current:
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
+
+    def render(self, document: Document, status: str, output_path: str):
+        """Рендер сертификата в файл"""
+        font_name, font_bold_name = _get_fonts()
+        styles = getSampleStyleSheet()
+
+        doc = SimpleDocTemplate(
+            output_path,
+            pagesize=A4,
+            rightMargin=20*mm,
+            leftMargin=20*mm,
+            topMargin=20*mm,
+            bottomMargin=20*mm,
+            title=f"Сертификат {document.public_code}"
+        )
+
+        story = []
+        title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor=colors.HexColor('#1E88E5'),
+            spaceAfter=30,
+            alignment=TA_CENTER,
+            fontName=font_bold_name
+        )
+        story.append(Paragraph("Результат верификации документа", title_style))
+        story.append(Spacer(1, 12*mm))
+
+        if QRCODE_AVAILABLE:
+            qr = qrcode.QRCode(
+                version=1,
+                error_correction=qrcode.constants.ERROR_CORRECT_L,
+                box_size=10,
+                border=4,
+            )
+            qr.add_data(document.public_code)
+            qr.make(fit=True)
+            buffer = BytesIO()
+            qr.make_image(fill_color="black", back_color="white").save(buffer, format="PNG")
+            buffer.seek(0)
+            story.append(Image(buffer, width=60*mm, height=60*mm))
+            story.append(Spacer(1, 5*mm))
+
+        doc_data = [
+            ['Параметр', 'Значение'],
+            ['ID документа', document.public_code],
+            ['Статус', STATUS_TEXT.get(status, status)],
+        ]
+        if document.document_type:
+            doc_data.append(['Тип документа', document.document_type])
+        if document.issuer:
+            doc_data.append(['Выдан', document.issuer])
+        if document.issue_date:
+            doc_data.append(['Дата выдачи', str(document.issue_date)])
+        if document.expiry_date:
+            doc_data.append(['Срок действия', str(document.expiry_date)])
+        doc_data.append(['Дата формирования', datetime.now().strftime("%d.%m.%Y %H:%M")])
+
+        table = Table(doc_data, colWidths=[60*mm, 100*mm])
+        table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1E88E5')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), font_bold_name),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+            ('FONTNAME', (0, 1), (-1, -1), font_name),
+            ('FONTSIZE', (0, 1), (-1, -1), 11),
+        ]))
+        story.append(table)
+        story.append(Spacer(1, 10*mm))
+
+        if document.metadata_:
+            meta_style = ParagraphStyle(
+                'MetaStyle',
+                parent=styles['Normal'],
+                fontSize=10,
+                textColor=colors.HexColor('#666666'),
+                alignment=TA_LEFT,
+                fontName=font_name
+            )
+            story.append(Paragraph("Дополнительная информация:\n" + escape(str(document.metadata_)), meta_style))
+
+        doc.build(story)
+        logger.info("Сертификат %s отрисован", document.public_code)
+
+
+_certificate_service: Optional[CertificateService] = None
+
+
+def get_certificate_service() -> CertificateService:
+    """Общий экземпляр сервиса сертификатов"""
+    global _certificate_service
+    if _certificate_service is None:
+        _certificate_service = CertificateService()
+    return _certificate_service
@@ -0,0 +1,286 @@
+"""
+Пакетный импорт документов в реестр из CSV/JSONL
+
+Файл читается потоково, строки проверяются схемой DocumentImportRow и
+записываются пачками одним многострочным upsert на транзакцию. После
+каждой пачки сохраняется контрольная точка (смещение в файле), поэтому
+прерванный импорт продолжается с места остановки.
+"""
+import codecs
+import csv
+import json
+import os
+import time
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.database import engine as default_engine
+from app.models.document import Document
+from app.schemas.document import DocumentImportRow
+
+# Колонки, которые обновляются при совпадении public_code (ключи - имена колонок таблицы)
+UPSERT_COLUMNS = ('internal_code', 'document_type', 'issuer', 'issue_date', 'expiry_date', 'status', 'metadata')
+
+
+@dataclass
+class ImportProgress:
+    """Состояние импорта, оно же содержимое файла контрольной точки"""
+    source: str
+    offset: int = 0
+    rows_read: int = 0
+    imported: int = 0
+    rejected: int = 0
+    elapsed: float = 0.0
+    header: List[str] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_read / self.elapsed if self.elapsed else 0.0
+
+
+class _OffsetLines:
+    """Итератор строк бинарного файла с учетом смещения после каждой строки"""
+
+    def __init__(self, handle, encoding: str = 'utf-8'):
+        self.handle = handle
+        self.encoding = encoding
+        self.offset = handle.tell()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        at_start = self.offset == 0
+        line = self.handle.readline()
+        if not line:
+            raise StopIteration
+        self.offset += len(line)
+        if at_start and line.startswith(codecs.BOM_UTF8):
+            # Excel сохраняет CSV в UTF-8 с BOM: иначе он попал бы в первую колонку заголовка
+            line = line[len(codecs.BOM_UTF8):]
+        return line.decode(self.encoding)
+
+
+class DocumentImporter:
+    """Потоковый импорт с upsert пачками и контрольными точками"""
+
+    def __init__(self, source: str, fmt: Optional[str] = None, chunk_size: Optional[int] = None,
+                 engine: Optional[Engine] = None, report=print):
+        """
+        Args:
+            source: Путь к CSV или JSONL
+            fmt: 'csv' или 'jsonl' (по умолчанию по расширению)
+            chunk_size: Строк в одном upsert (по умолчанию settings.IMPORT_CHUNK_SIZE)
+            engine: Движок БД (по умолчанию из app.database)
+            report: Функция вывода прогресса
+        """
+        self.source = Path(source)
+        self.fmt = fmt or ('csv' if self.source.suffix.lower() == '.csv' else 'jsonl')
+        self.chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+        self.engine = engine or default_engine
+        self.report = report
+        self.checkpoint_path = self.source.with_name(self.source.name + '.checkpoint.json')
+        self.rejected_path = self.source.with_name(self.source.name + '.rejected.jsonl')
+
+    # --- Контрольная точка ---
+
+    def load_checkpoint(self) -> ImportProgress:
+        """Состояние прошлого запуска или новое, если его нет"""
+        if self.checkpoint_path.exists():
+            with open(self.checkpoint_path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('source') == str(self.source.resolve()):
+                return ImportProgress(**data)
+        return ImportProgress(source=str(self.source.resolve()))
+
+    def save_checkpoint(self, progress: ImportProgress):
+        """Атомарная запись контрольной точки"""
+        tmp_path = self.checkpoint_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(asdict(progress), f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def reset(self):
+        """Сброс контрольной точки и журнала отклоненных строк"""
+        for path in (self.checkpoint_path, self.rejected_path):
+            if path.exists():
+                path.unlink()
+
+    # --- Чтение ---
+
+    def _read_rows(self, handle, progress: ImportProgress) -> Iterator[Tuple[int, Dict]]:
+        """
+        Строки файла начиная с контрольной точки
+
+        Yields:
+            (смещение после строки, словарь значений)
+        """
+        lines = _OffsetLines(handle)
+
+        if self.fmt == 'csv':
+            if not progress.header:
+                progress.header = next(csv.reader(lines))
+                progress.offset = lines.offset
+            handle.seek(progress.offset)
+            lines.offset = progress.offset
+            for values in csv.reader(lines):
+                if values:
+                    yield lines.offset, dict(zip(progress.header, values))
+            return
+
+        handle.seek(progress.offset)
+        lines.offset = progress.offset
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                row = {'_raw': line, '_error': f"Некорректный JSON: {e}"}
+            yield lines.offset, row
+
+    @staticmethod
+    def validate(row: Dict) -> Dict:
+        """
+        Проверка строки схемой импорта
+
+        Returns:
+            Значения колонок documents
+
+        Raises:
+            ValueError, ValidationError
+        """
+        if '_error' in row:
+            raise ValueError(row['_error'])
+        cleaned = {}
+        for key, value in row.items():
+            if isinstance(value, str):
+                value = value.strip()
+            if value not in ('', None):
+                cleaned[key] = value
+        return DocumentImportRow(**cleaned).model_dump()
+
+    # --- Запись ---
+
+    def _upsert_statement(self, rows: List[Dict]):
+        """Многострочный upsert под диалект движка"""
+        table = Document.__table__
+        dialect = self.engine.dialect.name
+
+        if dialect == 'mysql':
+            from sqlalchemy.dialects.mysql import insert
+            # updated_at обновляет сама MySQL (ON UPDATE CURRENT_TIMESTAMP), если строка изменилась
+            stmt = insert(table).values(rows)
+            return stmt.on_duplicate_key_update({name: stmt.inserted[name] for name in UPSERT_COLUMNS})
+
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+            # В одной команде ON CONFLICT ключ не может повторяться
+            rows = list({row['public_code']: row for row in rows}.values())
+            stmt = insert(table).values(rows)
+            # onupdate колонки ON CONFLICT не применяет, а по updated_at
+            # сбрасывается кэш сертификатов и идет синхронизация устройств
+            set_ = {name: stmt.excluded[name] for name in UPSERT_COLUMNS}
+            set_['updated_at'] = func.now()
+            return stmt.on_conflict_do_update(index_elements=['public_code'], set_=set_)
+
+        raise RuntimeError(f"Upsert не поддерживается для диалекта {dialect}")
+
+    @staticmethod
+    def _split_code_conflicts(conn, rows: List[Tuple[int, Dict]]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Отделение строк, чей internal_code занят другим документом
+
+        У documents два уникальных ключа, и ON DUPLICATE KEY UPDATE MySQL
+        срабатывает по любому: такая строка перезаписала бы чужой документ,
+        а на PostgreSQL уронила бы всю пачку.
+
+        Returns:
+            (значения для upsert, отклоненные строки)
+        """
+        table = Document.__table__
+        codes = {values['internal_code'] for _, values in rows}
+        owners = dict(conn.execute(
+            select(table.c.internal_code, table.c.public_code).where(table.c.internal_code.in_(codes))
+        ).all())
+
+        accepted, conflicts = [], []
+        for number, values in rows:
+            # Внутри пачки код достается первой строке
+            owner = owners.setdefault(values['internal_code'], values['public_code'])
+            if owner != values['public_code']:
+                conflicts.append({
+                    'row': number,
+                    'error': f"internal_code {values['internal_code']} уже принадлежит документу {owner}",
+                    'data': values,
+                })
+            else:
+                accepted.append(values)
+        return accepted, conflicts
+
+    def _flush(self, rows: List[Tuple[int, Dict]], rejected: List[Dict], progress: ImportProgress, offset: int):
+        """Запись пачки одной транзакцией и сохранение контрольной точки"""
+        accepted = []
+        if rows:
+            with self.engine.begin() as conn:
+                accepted, conflicts = self._split_code_conflicts(conn, rows)
+                if accepted:
+                    conn.execute(self._upsert_statement(accepted))
+            rejected = rejected + conflicts
+        if rejected:
+            with open(self.rejected_path, 'a', encoding='utf-8') as f:
+                for item in rejected:
+                    f.write(json.dumps(item, ensure_ascii=False, default=str) + '\n')
+
+        progress.imported += len(accepted)
+        progress.rejected += len(rejected)
+        progress.offset = offset
+        self.save_checkpoint(progress)
+
+    def run(self) -> ImportProgress:
+        """
+        Импорт файла (с продолжением от контрольной точки)
+
+        Returns:
+            Итоговое состояние: прочитано, записано, отклонено, скорость
+        """
+        progress = self.load_checkpoint()
+        if progress.offset:
+            self.report(f"Продолжение импорта {self.source} с позиции {progress.offset} "
+                        f"(уже прочитано строк: {progress.rows_read})")
+
+        started = time.perf_counter() - progress.elapsed
+        rows: List[Tuple[int, Dict]] = []  # (номер строки, значения колонок)
+        rejected: List[Dict] = []
+        offset = progress.offset
+
+        with open(self.source, 'rb') as handle:
+            for offset, raw in self._read_rows(handle, progress):
+                progress.rows_read += 1
+                try:
+                    rows.append((progress.rows_read, self.validate(raw)))
+                except (ValueError, ValidationError) as e:
+                    rejected.append({'row': progress.rows_read, 'error': str(e), 'data': raw})
+
+                if len(rows) + len(rejected) >= self.chunk_size:
+                    progress.elapsed = time.perf_counter() - started
+                    self._flush(rows, rejected, progress, offset)
+                    rows, rejected = [], []
+                    self.report(f"Строк: {progress.rows_read}, записано: {progress.imported}, "
+                                f"отклонено: {progress.rejected}, {progress.rows_per_second:.0f} строк/с")
+
+        progress.elapsed = time.perf_counter() - started
+        self._flush(rows, rejected, progress, offset)
+        self.report(f"Импорт завершен: строк {progress.rows_read}, записано {progress.imported}, "
+                    f"отклонено {progress.rejected} за {progress.elapsed:.1f} с "
+                    f"({progress.rows_per_second:.0f} строк/с)")
+        if progress.rejected:
+            self.report(f"Отклоненные строки: {self.rejected_path}")
+        return progress
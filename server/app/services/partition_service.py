@@ -0,0 +1,219 @@
+"""
+Помесячные секции журнала верификаций и срок его хранения
+
+Таблица verifications (MySQL) секционирована по RANGE (UNIX_TIMESTAMP(verified_at)):
+секция pYYYYMM хранит записи за месяц, p_future - все, что позже последней
+месячной секции. Обслуживание заранее выделяет секции на несколько месяцев
+вперед (REORGANIZE пустой p_future - без копирования данных) и удаляет секции
+старше срока хранения, при необходимости сначала выгрузив их в NDJSON.gz.
+Удаление секции - мгновенный DROP PARTITION вместо DELETE миллионов строк.
+"""
+import gzip
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import List, Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.database import engine as default_engine
+from app.models.stats import StatsRollupState
+from app.services.stats_service import ROLLUP_NAME
+
+logger = logging.getLogger(__name__)
+
+TABLE = 'verifications'
+FUTURE_PARTITION = 'p_future'
+ARCHIVE_YIELD_PER = 5000
+
+
+def month_start(day: date, shift: int = 0) -> date:
+    """Первое число месяца day, сдвинутого на shift месяцев"""
+    index = day.year * 12 + day.month - 1 + shift
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"p{month:%Y%m}"
+
+
+def partition_clause(month: date) -> str:
+    """Определение секции месяца: граница - начало следующего месяца"""
+    upper = month_start(month, 1)
+    return f"PARTITION {partition_name(month)} VALUES LESS THAN (UNIX_TIMESTAMP('{upper:%Y-%m-%d} 00:00:00'))"
+
+
+@dataclass
+class PartitionInfo:
+    """Секция журнала по данным information_schema"""
+    name: str
+    rows: int  # оценка InnoDB, не точный COUNT(*)
+    month: Optional[date] = None  # None у p_future и секций с другими именами
+
+
+class VerificationPartitions:
+    """Обслуживание секций таблицы verifications"""
+
+    def __init__(self, engine: Optional[Engine] = None, report=logger.info):
+        """
+        Args:
+            engine: Движок БД (по умолчанию из app.database)
+            report: Функция вывода хода обслуживания
+        """
+        self.engine = engine or default_engine
+        self.report = report
+        if self.engine.dialect.name != 'mysql':
+            raise RuntimeError(f"Секционирование журнала не поддерживается для диалекта {self.engine.dialect.name}")
+
+    def partitions(self) -> List[PartitionInfo]:
+        """Секции таблицы по порядку (пусто, если таблица не секционирована)"""
+        with self.engine.connect() as conn:
+            rows = conn.execute(text(
+                "SELECT PARTITION_NAME, TABLE_ROWS FROM information_schema.PARTITIONS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND PARTITION_NAME IS NOT NULL "
+                "ORDER BY PARTITION_ORDINAL_POSITION"
+            ), {'table': TABLE}).all()
+
+        result = []
+        for name, table_rows in rows:
+            month = None
+            if len(name) == 7 and name[0] == 'p' and name[1:].isdigit():
+                month = date(int(name[1:5]), int(name[5:]), 1)
+            result.append(PartitionInfo(name=name, rows=int(table_rows or 0), month=month))
+        return result
+
+    def ensure_future(self, months_ahead: Optional[int] = None, today: Optional[date] = None) -> List[str]:
+        """
+        Секции на текущий месяц и months_ahead месяцев вперед
+
+        Новые месяцы выделяются из p_future; пока в ней нет строк,
+        REORGANIZE не переносит данные.
+
+        Returns:
+            Имена созданных секций
+        """
+        months_ahead = settings.VERIFICATIONS_PARTITIONS_AHEAD if months_ahead is None else months_ahead
+        current = month_start(today or date.today())
+        partitions = self.partitions()
+        if not partitions:
+            raise RuntimeError(f"Таблица {TABLE} не секционирована (alembic upgrade head)")
+
+        last = max((p.month for p in partitions if p.month), default=None)
+        wanted = [month_start(current, shift) for shift in range(months_ahead + 1)]
+        missing = [month for month in wanted if last is None or month > last]
+        if not missing:
+            return []
+
+        clauses = [partition_clause(month) for month in missing]
+        clauses.append(f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN MAXVALUE")
+        with self.engine.begin() as conn:
+            conn.execute(text(
+                f"ALTER TABLE {TABLE} REORGANIZE PARTITION {FUTURE_PARTITION} INTO ({', '.join(clauses)})"
+            ))
+
+        names = [partition_name(month) for month in missing]
+        self.report(f"Созданы секции {TABLE}: {', '.join(names)}")
+        return names
+
+    def expired(self, retention_months: Optional[int] = None, today: Optional[date] = None) -> List[PartitionInfo]:
+        """Месячные секции целиком старше срока хранения (0 - хранить всегда)"""
+        retention_months = settings.VERIFICATIONS_RETENTION_MONTHS if retention_months is None else retention_months
+        if retention_months <= 0:
+            return []
+        # Граница - начало месяца, с которого записи еще хранятся
+        keep_from = month_start(today or date.today(), -retention_months)
+        return [p for p in self.partitions() if p.month and p.month < keep_from]
+
+    def _rolled_up(self, name: str) -> bool:
+        """Все ли записи секции уже учтены в агрегатах статистики"""
+        with self.engine.connect() as conn:
+            max_id = conn.execute(text(f"SELECT MAX(id) FROM {TABLE} PARTITION ({name})")).scalar()
+            if max_id is None:
+                return True
+            state = StatsRollupState.__table__
+            last_id = conn.execute(
+                select(state.c.last_id).where(state.c.name == ROLLUP_NAME)
+            ).scalar()
+        return last_id is not None and max_id <= last_id
+
+    def archive(self, name: str, directory: str) -> Path:
+        """
+        Выгрузка секции в NDJSON.gz (одна запись на строку)
+
+        Пишется во временный файл и переименовывается по завершении,
+        поэтому недописанный архив не примут за готовый.
+
+        Returns:
+            Путь к архиву
+        """
+        target_dir = Path(directory)
+        target_dir.mkdir(parents=True, exist_ok=True)
+        path = target_dir / f"{TABLE}_{name}.ndjson.gz"
+        tmp_path = path.with_name(path.name + '.tmp')
+
+        count = 0
+        with self.engine.connect() as conn, gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            rows = conn.execution_options(yield_per=ARCHIVE_YIELD_PER).execute(
+                text(f"SELECT * FROM {TABLE} PARTITION ({name}) ORDER BY id")
+            ).mappings()
+            for row in rows:
+                f.write(json.dumps(dict(row), ensure_ascii=False, default=str) + '\n')
+                count += 1
+        os.replace(tmp_path, path)
+
+        self.report(f"Секция {name}: выгружено записей {count} в {path}")
+        return path
+
+    def drop(self, name: str, force: bool = False) -> bool:
+        """
+        Удаление секции
+
+        Без force секция, записи которой еще не свернуты в агрегаты
+        статистики, не удаляется: иначе они пропали бы из /v1/stats.
+
+        Returns:
+            True, если секция удалена
+        """
+        if not force and not self._rolled_up(name):
+            self.report(f"Секция {name} пропущена: записи еще не учтены в агрегатах статистики")
+            return False
+        with self.engine.begin() as conn:
+            conn.execute(text(f"ALTER TABLE {TABLE} DROP PARTITION {name}"))
+        self.report(f"Секция {name} удалена")
+        return True
+
+    def apply_retention(self, retention_months: Optional[int] = None, archive_dir: Optional[str] = None,
+                        dry_run: bool = False) -> List[str]:
+        """
+        Удаление (с архивом, если задан каталог) секций старше срока хранения
+
+        Returns:
+            Имена удаленных секций (при dry_run - подлежащих удалению)
+        """
+        archive_dir = settings.VERIFICATIONS_ARCHIVE_DIR if archive_dir is None else archive_dir
+        dropped = []
+        for partition in self.expired(retention_months):
+            if dry_run:
+                self.report(f"Секция {partition.name} (~{partition.rows} записей) подлежит удалению")
+                dropped.append(partition.name)
+                continue
+            if archive_dir:
+                self.archive(partition.name, archive_dir)
+            if self.drop(partition.name):
+                dropped.append(partition.name)
+        return dropped
+
+    def maintain(self, dry_run: bool = False) -> dict:
+        """
+        Полный цикл обслуживания по настройкам
+
+        Returns:
+            {'created': [...], 'dropped': [...]}
+        """
+        created = [] if dry_run else self.ensure_future()
+        return {'created': created, 'dropped': self.apply_retention(dry_run=dry_run)}
@@ -0,0 +1,235 @@
+"""
+Проверка PIN-кодов документов
+
+Хэши в documents.pin_hash пишет PHP API (password_hash: argon2id, без
+поддержки argon2 - bcrypt). Проверка:
+
+1. Лимиты попыток на документ и на IP проверяются до KDF: перебор
+   отсекается ответом 429, не занимая процессор.
+2. Успешные пары (документ, PIN) помнятся PIN_CACHE_TTL секунд, повторное
+   сканирование того же документа не считает хэш заново.
+3. KDF выполняется в отдельном пуле потоков ограниченного размера, а
+   очередь к нему ограничена PIN_HASH_MAX_PENDING: при перегрузке запрос
+   сразу получает 503, а не ждет в общей очереди.
+
+Счетчики и кэш живут в процессе; при нескольких воркерах лимиты
+действуют на каждый воркер отдельно.
+"""
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from passlib.context import CryptContext
+from passlib.exc import MissingBackendError
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Длиннее PIN не бывает; bcrypt к тому же учитывает только 72 байта
+PIN_MAX_LENGTH = 64
+
+
+class PinVerdict:
+    """Результаты проверки PIN"""
+    OK = 'ok'
+    MISSING = 'missing'  # у документа есть PIN, а в запросе нет
+    INVALID = 'invalid'
+    LOCKED = 'locked'  # исчерпан лимит попыток
+    BUSY = 'busy'  # очередь KDF переполнена
+
+
+@dataclass
+class PinCheck:
+    """Итог проверки PIN"""
+    verdict: str
+    retry_after: int = 0  # секунд до следующей попытки (LOCKED/BUSY)
+    new_hash: Optional[str] = None  # хэш с текущими параметрами KDF, если старый устарел
+
+
+class AttemptCounter:
+    """Число попыток по ключу в фиксированном окне"""
+
+    def __init__(self, limit: int, window: int):
+        self.limit = limit
+        self.window = window
+        self._windows: Dict[str, List[float]] = {}  # ключ -> [начало окна, попыток]
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+
+    def acquire(self, key: str, now: Optional[float] = None) -> int:
+        """
+        Резерв попытки до проверки
+
+        Returns:
+            0, если попытка разрешена, иначе секунд до нового окна
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if now >= self._next_sweep:
+                # Окна без попыток удаляются, чтобы словарь не рос от перебора IP
+                self._windows = {k: w for k, w in self._windows.items() if now - w[0] < self.window}
+                self._next_sweep = now + self.window
+            entry = self._windows.get(key)
+            if entry is None or now - entry[0] >= self.window:
+                entry = self._windows[key] = [now, 0]
+            if entry[1] >= self.limit:
+                return max(1, int(entry[0] + self.window - now + 0.999))
+            entry[1] += 1
+            return 0
+
+    def refund(self, key: str):
+        """Возврат попытки, оказавшейся успешной"""
+        with self._lock:
+            entry = self._windows.get(key)
+            if entry and entry[1] > 0:
+                entry[1] -= 1
+
+
+class SuccessCache:
+    """Недавно подтвержденные пары (документ, PIN) с ограничением размера"""
+
+    def __init__(self, ttl: float, size: int):
+        self.ttl = ttl
+        self.size = size
+        self._items: 'OrderedDict[bytes, float]' = OrderedDict()
+        self._lock = threading.Lock()
+        # Ключ процесса: PIN не хранится ни открыто, ни простым хэшем
+        self._key = os.urandom(32)
+
+    def _digest(self, public_code: str, pin_hash: str, pin: str) -> bytes:
+        # В ключ входит хэш из БД: после смены PIN старая запись не совпадет
+        message = '\0'.join((public_code, pin_hash, pin)).encode('utf-8')
+        return hmac.new(self._key, message, hashlib.sha256).digest()
+
+    def contains(self, public_code: str, pin_hash: str, pin: str) -> bool:
+        digest = self._digest(public_code, pin_hash, pin)
+        with self._lock:
+            expires = self._items.get(digest)
+            if expires is None:
+                return False
+            if expires <= time.monotonic():
+                del self._items[digest]
+                return False
+            return True
+
+    def add(self, public_code: str, pin_hash: str, pin: str):
+        digest = self._digest(public_code, pin_hash, pin)
+        with self._lock:
+            self._items[digest] = time.monotonic() + self.ttl
+            self._items.move_to_end(digest)
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+
+
+class PinService:
+    """Проверка PIN с лимитами попыток, кэшем успехов и пулом KDF"""
+
+    def __init__(self):
+        schemes = ['argon2', 'bcrypt']
+        if settings.PIN_HASH_SCHEME in schemes:
+            schemes.remove(settings.PIN_HASH_SCHEME)
+            schemes.insert(0, settings.PIN_HASH_SCHEME)
+        # Хэши с другими параметрами или схемой помечаются устаревшими и
+        # после успешной проверки пересчитываются с текущими
+        self.context = CryptContext(
+            schemes=schemes,
+            deprecated='auto',
+            argon2__type='ID',
+            argon2__time_cost=settings.PIN_ARGON2_TIME_COST,
+            argon2__memory_cost=settings.PIN_ARGON2_MEMORY_KB,
+            argon2__parallelism=settings.PIN_ARGON2_PARALLELISM,
+            bcrypt__rounds=settings.PIN_BCRYPT_ROUNDS,
+            bcrypt__ident='2y',  # формат password_hash() PHP
+        )
+        self.executor = ThreadPoolExecutor(max_workers=settings.PIN_HASH_WORKERS, thread_name_prefix='pin-kdf')
+        self.pending = 0  # проверок в пуле и в очереди к нему (меняется только в event loop)
+        self.cache = SuccessCache(settings.PIN_CACHE_TTL, settings.PIN_CACHE_SIZE)
+        self.per_document = AttemptCounter(settings.PIN_MAX_ATTEMPTS_PER_DOCUMENT, settings.PIN_ATTEMPT_WINDOW)
+        self.per_ip = AttemptCounter(settings.PIN_MAX_ATTEMPTS_PER_IP, settings.PIN_ATTEMPT_WINDOW)
+
+    def hash(self, pin: str) -> str:
+        """Хэш PIN с текущими параметрами (блокирует поток)"""
+        return self.context.hash(pin)
+
+    def _verify(self, pin: str, pin_hash: str):
+        try:
+            return self.context.verify_and_update(pin, pin_hash)
+        except (ValueError, MissingBackendError) as e:
+            # Нераспознанный хэш или нет backend argon2: документ нельзя открыть
+            logger.error("Не удалось проверить хэш PIN: %s", e)
+            return False, None
+
+    async def check(self, public_code: str, pin_hash, pin: Optional[str], client_ip: Optional[str]) -> PinCheck:
+        """
+        Проверка PIN документа
+
+        Args:
+            public_code: Код документа
+            pin_hash: documents.pin_hash (bytes из VARBINARY или str)
+            pin: PIN из запроса
+            client_ip: Адрес клиента (за nginx - из X-Forwarded-For, uvicorn --proxy-headers)
+
+        Returns:
+            PinCheck с вердиктом и, для LOCKED/BUSY, Retry-After
+        """
+        if not pin:
+            return PinCheck(PinVerdict.MISSING)
+        if isinstance(pin_hash, (bytes, bytearray, memoryview)):
+            pin_hash = bytes(pin_hash).decode('ascii', errors='replace')
+
+        if self.cache.contains(public_code, pin_hash, pin):
+            return PinCheck(PinVerdict.OK)
+
+        document_key = public_code
+        ip_key = client_ip or 'unknown'
+        retry_after = self.per_ip.acquire(ip_key)
+        if retry_after:
+            return PinCheck(PinVerdict.LOCKED, retry_after)
+        retry_after = self.per_document.acquire(document_key)
+        if retry_after:
+            self.per_ip.refund(ip_key)  # попытка не состоялась
+            return PinCheck(PinVerdict.LOCKED, retry_after)
+
+        if len(pin) > PIN_MAX_LENGTH:
+            return PinCheck(PinVerdict.INVALID)
+
+        if self.pending >= settings.PIN_HASH_MAX_PENDING:
+            self.per_ip.refund(ip_key)
+            self.per_document.refund(document_key)
+            return PinCheck(PinVerdict.BUSY, 1)
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            ok, new_hash = await loop.run_in_executor(self.executor, self._verify, pin, pin_hash)
+        finally:
+            self.pending -= 1
+
+        if not ok:
+            return PinCheck(PinVerdict.INVALID)
+
+        # Успех: попытки не в счет, пара кэшируется под актуальным хэшем
+        self.per_ip.refund(ip_key)
+        self.per_document.refund(document_key)
+        self.cache.add(public_code, new_hash or pin_hash, pin)
+        return PinCheck(PinVerdict.OK, new_hash=new_hash)
+
+
+_pin_service: Optional[PinService] = None
+
+
+def get_pin_service() -> PinService:
+    """Общий экземпляр сервиса PIN"""
+    global _pin_service
+    if _pin_service is None:
+        _pin_service = PinService()
+    return _pin_service
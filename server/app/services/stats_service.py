@@ -0,0 +1,250 @@
+"""
+Статистика проверок по агрегатам журнала верификаций
+
+Журнал verifications сворачивается в часовые агрегаты
+(verification_rollup_hourly) порциями по id: каждая порция и новый
+водяной знак пишутся одной транзакцией, поэтому записи не теряются и
+не учитываются дважды. Запросы статистики читают только агрегаты.
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import case, func, select
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.database import engine as default_engine
+from app.models.document import Document
+from app.models.stats import StatsRollupState, VerificationRollupHourly
+from app.models.verification import Verification
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_NAME = 'verification_hourly'
+
+
+class TTLCache:
+    """Кэш ответов с ограниченным временем жизни"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._items: Dict[Hashable, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            item = self._items.get(key)
+            if item and item[0] > now:
+                return item[1]
+        value = compute()
+        with self._lock:
+            # Просроченные ключи удаляются при записи, чтобы кэш не рос
+            for stale in [k for k, (expires, _) in self._items.items() if expires <= now]:
+                del self._items[stale]
+            self._items[key] = (now + self.ttl, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+class StatsService:
+    """Пересчет агрегатов и запросы статистики"""
+
+    def __init__(self, engine: Optional[Engine] = None):
+        self.engine = engine or default_engine
+        self.cache = TTLCache(settings.STATS_CACHE_TTL)
+
+    # --- Агрегаты ---
+
+    def _upsert_statement(self, rows: List[Dict]):
+        """Многострочный upsert с прибавлением count под диалект движка"""
+        table = VerificationRollupHourly.__table__
+        dialect = self.engine.dialect.name
+
+        if dialect == 'mysql':
+            from sqlalchemy.dialects.mysql import insert
+            stmt = insert(table).values(rows)
+            return stmt.on_duplicate_key_update(count=table.c.count + stmt.inserted['count'])
+
+        if dialect in ('postgresql', 'sqlite'):
+            if dialect == 'postgresql':
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+            stmt = insert(table).values(rows)
+            return stmt.on_conflict_do_update(
+                index_elements=['bucket', 'status', 'document_type', 'issuer'],
+                set_={'count': table.c.count + stmt.excluded['count']}
+            )
+
+        raise RuntimeError(f"Upsert не поддерживается для диалекта {dialect}")
+
+    def refresh_rollups(self, max_batches: Optional[int] = None) -> int:
+        """
+        Свертка новых записей журнала в часовые агрегаты
+
+        Порция - до STATS_ROLLUP_BATCH записей по возрастанию id. Записи
+        моложе STATS_ROLLUP_LAG_SECONDS не берутся: транзакции с меньшим id
+        могли еще не зафиксироваться. Строка водяного знака блокируется
+        (FOR UPDATE), поэтому параллельные воркеры не сворачивают одно и то же.
+
+        Args:
+            max_batches: Ограничение числа порций за вызов (None - до конца)
+
+        Returns:
+            Количество учтенных записей журнала
+        """
+        verifications = Verification.__table__
+        documents = Document.__table__
+        state = StatsRollupState.__table__
+        batch = settings.STATS_ROLLUP_BATCH
+        total = 0
+        batches = 0
+
+        while max_batches is None or batches < max_batches:
+            with self.engine.begin() as conn:
+                last_id = conn.execute(
+                    select(state.c.last_id).where(state.c.name == ROLLUP_NAME).with_for_update()
+                ).scalar()
+                if last_id is None:
+                    conn.execute(state.insert().values(name=ROLLUP_NAME, last_id=0))
+                    last_id = 0
+
+                rows = conn.execute(
+                    select(
+                        verifications.c.id, verifications.c.verified_at, verifications.c.status,
+                        documents.c.document_type, documents.c.issuer
+                    )
+                    .select_from(verifications.outerjoin(
+                        documents, documents.c.id == verifications.c.document_id
+                    ))
+                    .where(verifications.c.id > last_id)
+                    .order_by(verifications.c.id)
+                    .limit(batch)
+                ).all()
+
+                cutoff = datetime.now() - timedelta(seconds=settings.STATS_ROLLUP_LAG_SECONDS)
+                counts = Counter()
+                new_last_id = last_id
+                for row in rows:
+                    if row.verified_at is not None:
+                        if row.verified_at > cutoff:
+                            break
+                        bucket = row.verified_at.replace(minute=0, second=0, microsecond=0)
+                        counts[(bucket, row.status, row.document_type or '', row.issuer or '')] += 1
+                    new_last_id = row.id
+
+                if new_last_id == last_id:
+                    break
+                if counts:
+                    conn.execute(self._upsert_statement([
+                        {'bucket': bucket, 'status': status, 'document_type': document_type,
+                         'issuer': issuer, 'count': count}
+                        for (bucket, status, document_type, issuer), count in counts.items()
+                    ]))
+                conn.execute(
+                    state.update().where(state.c.name == ROLLUP_NAME)
+                    .values(last_id=new_last_id, updated_at=func.now())
+                )
+
+            processed = sum(counts.values())
+            total += processed
+            batches += 1
+            if len(rows) < batch or new_last_id != rows[-1].id:
+                break
+
+        if total:
+            logger.info("Агрегаты статистики: учтено записей журнала %s", total)
+        return total
+
+    async def rollup_forever(self, interval: float):
+        """Фоновый пересчет агрегатов с заданным интервалом"""
+        while True:
+            try:
+                await run_in_threadpool(self.refresh_rollups)
+            except Exception:
+                logger.exception("Ошибка пересчета агрегатов статистики")
+            await asyncio.sleep(interval)
+
+    # --- Запросы ---
+
+    @staticmethod
+    def _period(query, start: datetime, end: datetime):
+        table = VerificationRollupHourly.__table__
+        return query.where(table.c.bucket >= start, table.c.bucket < end)
+
+    def _cached(self, key: tuple, query_builder: Callable[[], Any]) -> Any:
+        def compute():
+            with self.engine.connect() as conn:
+                return query_builder(conn)
+        return self.cache.get_or_compute(key, compute)
+
+    def hourly(self, start: datetime, end: datetime, status: Optional[str] = None) -> List[Dict]:
+        """Проверок по часам за период [start, end)"""
+        table = VerificationRollupHourly.__table__
+
+        def build(conn):
+            query = self._period(select(table.c.bucket, func.sum(table.c.count)), start, end)
+            if status:
+                query = query.where(table.c.status == status)
+            query = query.group_by(table.c.bucket).order_by(table.c.bucket)
+            return [{'hour': bucket, 'count': int(count)} for bucket, count in conn.execute(query)]
+
+        return self._cached(('hourly', start, end, status), build)
+
+    def by_column(self, column: str, start: datetime, end: datetime) -> Dict[str, int]:
+        """Проверок по значениям колонки агрегата (status, document_type, issuer)"""
+        table = VerificationRollupHourly.__table__
+        field = table.c[column]
+
+        def build(conn):
+            query = self._period(select(field, func.sum(table.c.count)), start, end).group_by(field)
+            rows = sorted(conn.execute(query), key=lambda row: -row[1])
+            return {value: int(count) for value, count in rows}
+
+        return self._cached(('by', column, start, end), build)
+
+    def top_invalid_issuers(self, start: datetime, end: datetime, limit: int = 10,
+                            min_total: int = 1) -> List[Dict]:
+        """Издатели с наибольшим числом недействительных результатов"""
+        table = VerificationRollupHourly.__table__
+
+        def build(conn):
+            invalid = func.sum(case((table.c.status == 'invalid', table.c.count), else_=0))
+            total = func.sum(table.c.count)
+            query = (
+                self._period(select(table.c.issuer, total, invalid), start, end)
+                .where(table.c.issuer != '')
+                .group_by(table.c.issuer)
+                .having(invalid > 0)
+                .having(total >= min_total)
+                .order_by(invalid.desc())
+                .limit(limit)
+            )
+            return [
+                {'issuer': issuer, 'total': int(all_count), 'invalid': int(invalid_count),
+                 'invalid_rate': round(int(invalid_count) / int(all_count), 4)}
+                for issuer, all_count, invalid_count in conn.execute(query)
+            ]
+
+        return self._cached(('top_invalid_issuers', start, end, limit, min_total), build)
+
+
+_stats_service: Optional[StatsService] = None
+
+
+def get_stats_service() -> StatsService:
+    """Общий экземпляр сервиса статистики"""
+    global _stats_service
+    if _stats_service is None:
+        _stats_service = StatsService()
+    return _stats_service
@@ -0,0 +1,36 @@
+"""
+Пакетный импорт документов в реестр
+
+    python import_documents.py registry.csv
+    python import_documents.py registry.jsonl --chunk-size 5000
+    python import_documents.py registry.csv --restart   # начать заново, игнорируя контрольную точку
+
+Колонки/ключи: public_code (или document_id), internal_code (по умолчанию
+равен public_code), document_type, issuer, issue_date, expiry_date, status,
+metadata (в CSV - JSON-строкой). Документ ищется по public_code; строка,
+чей internal_code уже принадлежит другому документу, отклоняется.
+"""
+import argparse
+import sys
+
+from app.services.import_service import DocumentImporter
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Импорт документов из CSV/JSONL")
+    parser.add_argument("source", help="Путь к CSV или JSONL")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="Формат (по умолчанию по расширению)")
+    parser.add_argument("--chunk-size", type=int, help="Строк в одной транзакции")
+    parser.add_argument("--restart", action="store_true", help="Сбросить контрольную точку")
+    args = parser.parse_args()
+
+    importer = DocumentImporter(args.source, fmt=args.format, chunk_size=args.chunk_size)
+    if args.restart:
+        importer.reset()
+
+    progress = importer.run()
+    return 0 if progress.rows_read == 0 or progress.imported else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,35 +6,38 @@
 -- Подключение к базе данных document_verifier
 -- \c document_verifier
 
--- Создание таблицы документов
+-- Создание таблицы документов (схема как у server/app/models и рабочей MySQL)
 CREATE TABLE IF NOT EXISTS documents (
     id SERIAL PRIMARY KEY,
-    document_id VARCHAR(255) UNIQUE NOT NULL,
+    public_code VARCHAR(64) NOT NULL,
+    internal_code VARCHAR(255) NOT NULL,
     document_type VARCHAR(100),
     issuer VARCHAR(255),
     issue_date DATE,
     expiry_date DATE,
     status VARCHAR(20) NOT NULL DEFAULT 'valid',
     metadata JSONB,
+    pin_hash BYTEA,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_documents_public_code UNIQUE (public_code),
+    CONSTRAINT uq_documents_internal_code UNIQUE (internal_code)
 );
 
--- Индексы для таблицы documents
-CREATE INDEX IF NOT EXISTS idx_document_id ON documents(document_id);
+-- Индексы для таблицы documents (уникальные ключи выше уже индексируют коды)
 CREATE INDEX IF NOT EXISTS idx_status ON documents(status);
 CREATE INDEX IF NOT EXISTS idx_expiry_date ON documents(expiry_date);
+CREATE INDEX IF NOT EXISTS idx_updated_at ON documents(updated_at, id);
 
 -- Создание таблицы верификаций
 CREATE TABLE IF NOT EXISTS verifications (
     id SERIAL PRIMARY KEY,
-    document_id VARCHAR(255) NOT NULL,
-    user_id INTEGER,
+    document_id INTEGER NOT NULL,
+    public_code_used VARCHAR(64),
     status VARCHAR(20) NOT NULL,
-    ip_address INET,
+    ip_address VARCHAR(45),
     user_agent TEXT,
-    verified_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (document_id) REFERENCES documents(document_id) ON DELETE CASCADE
+    verified_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Индексы для таблицы verifications
@@ -42,11 +45,11 @@ CREATE INDEX IF NOT EXISTS idx_verifications_document ON verifications(document_
 CREATE INDEX IF NOT EXISTS idx_verifications_date ON verifications(verified_at);
 
 -- Вставка тестовых данных
-INSERT INTO documents (document_id, document_type, issuer, issue_date, expiry_date, status, metadata) VALUES
-('DOC001', 'Справка', 'Госструктура', '2024-01-15', '2025-01-15', 'valid', '{}'),
-('DOC002', 'Сертификат', 'Банк', '2023-06-01', CURRENT_DATE + INTERVAL '10 days', 'warning', '{"warning": "Срок действия истекает через 10 дней"}'),
-('DOC003', 'Справка', 'Организация', '2023-01-01', '2024-01-01', 'invalid', '{"error": "Документ отозван"}')
-ON CONFLICT (document_id) DO NOTHING;
+INSERT INTO documents (public_code, internal_code, document_type, issuer, issue_date, expiry_date, status, metadata) VALUES
+('DOC001', 'DOC001', 'Справка', 'Госструктура', '2024-01-15', '2025-01-15', 'valid', '{}'),
+('DOC002', 'DOC002', 'Сертификат', 'Банк', '2023-06-01', CURRENT_DATE + INTERVAL '10 days', 'warning', '{"warning": "Срок действия истекает через 10 дней"}'),
+('DOC003', 'DOC003', 'Справка', 'Организация', '2023-01-01', '2024-01-01', 'invalid', '{"error": "Документ отозван"}')
+ON CONFLICT (public_code) DO NOTHING;
 
 -- Комментарии к таблицам
 COMMENT ON TABLE documents IS 'Таблица документов в реестре';
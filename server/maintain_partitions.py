@@ -0,0 +1,39 @@
+"""
+Обслуживание помесячных секций журнала верификаций (MySQL)
+
+    python maintain_partitions.py               # секции вперед + удаление старых
+    python maintain_partitions.py --dry-run     # только показать секции и что будет удалено
+    python maintain_partitions.py --retention-months 12 --archive-dir /var/backups/verifications
+
+Запускается по расписанию (cron, раз в сутки): секции на следующие месяцы
+появляются заранее, секции старше VERIFICATIONS_RETENTION_MONTHS удаляются,
+предварительно выгружаясь в NDJSON.gz, если задан каталог архива.
+"""
+import argparse
+import sys
+
+from app.services.partition_service import VerificationPartitions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Секции журнала верификаций")
+    parser.add_argument("--dry-run", action="store_true", help="Ничего не менять, только показать")
+    parser.add_argument("--ahead", type=int, help="Месяцев вперед (по умолчанию из настроек)")
+    parser.add_argument("--retention-months", type=int, help="Срок хранения (по умолчанию из настроек, 0 - всегда)")
+    parser.add_argument("--archive-dir", help="Каталог архивов удаляемых секций")
+    args = parser.parse_args()
+
+    partitions = VerificationPartitions(report=print)
+    for partition in partitions.partitions():
+        print(f"{partition.name:>10}: ~{partition.rows} записей")
+    if args.dry_run:
+        partitions.apply_retention(args.retention_months, args.archive_dir, dry_run=True)
+        return 0
+
+    partitions.ensure_future(args.ahead)
+    partitions.apply_retention(args.retention_months, args.archive_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,7 +13,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from app.database import Base
 from app.config import settings
-from app.models import document  # Импорт моделей для autogenerate
+from app.models import document, verification, stats  # Импорт моделей для autogenerate
 
 # this is the Alembic Config object
 config = context.config
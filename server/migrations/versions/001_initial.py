@@ -17,6 +17,12 @@ depends_on = None
 
 
 def upgrade() -> None:
+    # ON UPDATE есть только в MySQL; в остальных СУБД updated_at обновляет ORM
+    if op.get_bind().dialect.name == 'mysql':
+        updated_at_default = sa.text('CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP')
+    else:
+        updated_at_default = sa.text('CURRENT_TIMESTAMP')
+    
     # Создание таблицы documents
     op.create_table(
         'documents',
@@ -29,7 +35,7 @@ def upgrade() -> None:
         sa.Column('status', sa.String(length=20), nullable=False),
         sa.Column('metadata', sa.JSON(), nullable=True),  # MySQL поддерживает JSON
         sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
-        sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('updated_at', sa.TIMESTAMP(), server_default=updated_at_default, nullable=True),
         sa.PrimaryKeyConstraint('id'),
         sa.UniqueConstraint('document_id')
     )
@@ -0,0 +1,42 @@
+"""Stats rollup tables
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Часовые агрегаты журнала верификаций (ключ - все измерения)
+    op.create_table(
+        'verification_rollup_hourly',
+        sa.Column('bucket', sa.DateTime(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('document_type', sa.String(length=100), nullable=False, server_default=''),
+        sa.Column('issuer', sa.String(length=255), nullable=False, server_default=''),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('bucket', 'status', 'document_type', 'issuer')
+    )
+    
+    # Водяной знак пересчета агрегатов
+    op.create_table(
+        'stats_rollup_state',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('last_id', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('stats_rollup_state')
+    op.drop_table('verification_rollup_hourly')
@@ -0,0 +1,82 @@
+"""Monthly partitions for verifications
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+# Имена и границы секций совпадают с app/services/partition_service.py.
+# Секции создаются от месяца самой старой записи до текущего плюс запас;
+# дальше их добавляет maintain_partitions.py
+PARTITIONS_AHEAD = 3
+FUTURE_PARTITION = 'p_future'
+
+
+def month_start(day: date, shift: int = 0) -> date:
+    index = day.year * 12 + day.month - 1 + shift
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_clause(month: date) -> str:
+    """Секция pYYYYMM: записи до начала следующего месяца"""
+    upper = month_start(month, 1)
+    return f"PARTITION p{month:%Y%m} VALUES LESS THAN (UNIX_TIMESTAMP('{upper:%Y-%m-%d} 00:00:00'))"
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'mysql':
+        # Секционирование есть только в схеме MySQL
+        return
+
+    # В секционированной таблице InnoDB нет внешних ключей, а колонка
+    # секционирования должна входить в каждый уникальный ключ
+    for fk in sa.inspect(bind).get_foreign_keys('verifications'):
+        op.drop_constraint(fk['name'], 'verifications', type_='foreignkey')
+
+    op.execute("UPDATE verifications SET verified_at = CURRENT_TIMESTAMP WHERE verified_at IS NULL")
+    op.execute(
+        "ALTER TABLE verifications "
+        "MODIFY verified_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP, "
+        "DROP PRIMARY KEY, ADD PRIMARY KEY (id, verified_at)"
+    )
+
+    oldest = bind.execute(sa.text("SELECT MIN(verified_at) FROM verifications")).scalar()
+    current = month_start(date.today())
+    month = month_start(oldest.date()) if oldest else current
+    clauses = []
+    while month <= month_start(current, PARTITIONS_AHEAD):
+        clauses.append(partition_clause(month))
+        month = month_start(month, 1)
+    clauses.append(f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN MAXVALUE")
+
+    # Перестраивает таблицу целиком; на большом журнале - в окно обслуживания
+    op.execute(
+        "ALTER TABLE verifications PARTITION BY RANGE (UNIX_TIMESTAMP(verified_at)) "
+        f"({', '.join(clauses)})"
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'mysql':
+        return
+
+    op.execute("ALTER TABLE verifications REMOVE PARTITIONING")
+    op.execute(
+        "ALTER TABLE verifications "
+        "DROP PRIMARY KEY, ADD PRIMARY KEY (id), "
+        "MODIFY verified_at TIMESTAMP NULL DEFAULT CURRENT_TIMESTAMP"
+    )
+    op.create_foreign_key(None, 'verifications', 'documents', ['document_id'], ['document_id'])
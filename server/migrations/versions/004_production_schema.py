@@ -0,0 +1,270 @@
+"""Align documents and verifications with the production schema
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 00:00:00.000000
+
+Рабочая БД создана create_and_fill_database.sql и общая с PHP API:
+documents.public_code/internal_code/pin_hash, verifications.document_id -
+ссылка на documents.id. Миграция приводит к ней схему, построенную
+ревизиями 001-003, и убирает дублирующие индексы documents.
+
+БД, созданная самим create_and_fill_database.sql:
+    alembic stamp 001 && alembic upgrade head
+
+Откат возвращает схему 001-003 с потерей данных, которых в ней нет:
+internal_code и pin_hash удаляются (документы под PIN открываются без
+него). Код в журнале MySQL берется из public_code_used, иначе из
+public_code документа; на SQLite/PostgreSQL внешний ключ 001 оставляет
+только записи о документах реестра, с их текущим public_code.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+# Итоговые индексы documents: имя -> (колонки, уникальный)
+DOCUMENT_INDEXES = {
+    'uq_documents_public_code': (['public_code'], True),
+    'uq_documents_internal_code': (['internal_code'], True),
+    'idx_status': (['status'], False),
+    'idx_expiry_date': (['expiry_date'], False),
+    'idx_updated_at': (['updated_at', 'id'], False),
+}
+
+
+def _create_document_indexes(existing=(), unique=True):
+    """Недостающие итоговые индексы (unique=False - без уникальных ключей)"""
+    for name, (columns, is_unique) in DOCUMENT_INDEXES.items():
+        if name in existing or (is_unique and not unique):
+            continue
+        if is_unique:
+            op.create_unique_constraint(name, 'documents', columns)
+        else:
+            op.create_index(name, 'documents', columns)
+
+
+def _upgrade_mysql(bind):
+    """Изменения на месте: журнал секционирован и не пересоздается"""
+    inspector = sa.inspect(bind)
+    columns = {c['name'] for c in inspector.get_columns('documents')}
+
+    if 'document_id' in columns:
+        # Журнал: код документа -> id документа, код остается в public_code_used
+        op.execute(
+            "ALTER TABLE verifications "
+            "ADD COLUMN public_code_used VARCHAR(64) NULL AFTER document_id, "
+            "ADD COLUMN document_ref INT NULL"
+        )
+        op.execute(
+            "UPDATE verifications v LEFT JOIN documents d ON d.document_id = v.document_id "
+            "SET v.public_code_used = v.document_id, v.document_ref = COALESCE(d.id, 0)"
+        )
+        op.execute(
+            "ALTER TABLE verifications "
+            "DROP INDEX idx_verifications_document, DROP COLUMN document_id, DROP COLUMN user_id, "
+            "CHANGE document_ref document_id INT NOT NULL AFTER id, "
+            "ADD INDEX idx_verifications_document (document_id)"
+        )
+
+    # Все вторичные индексы documents, кроме итоговых, удаляются:
+    # idx_document_id/idx_public_code/idx_internal_code дублировали уникальные ключи,
+    # idx_documents_verify (public_code, ...) - ключ uq_documents_public_code
+    existing = set()
+    for index in inspector.get_indexes('documents'):
+        if index['name'] in DOCUMENT_INDEXES:
+            existing.add(index['name'])
+        else:
+            op.drop_index(index['name'], table_name='documents')
+
+    if 'document_id' in columns:
+        op.execute(
+            "ALTER TABLE documents "
+            "CHANGE document_id public_code VARCHAR(64) NOT NULL, "
+            "ADD COLUMN internal_code VARCHAR(255) NULL AFTER public_code, "
+            "ADD COLUMN pin_hash VARBINARY(255) NULL AFTER metadata, "
+            "MODIFY status VARCHAR(20) NOT NULL DEFAULT 'valid'"
+        )
+        op.execute("UPDATE documents SET internal_code = public_code")
+        op.execute("ALTER TABLE documents MODIFY internal_code VARCHAR(255) NOT NULL")
+
+    _create_document_indexes(existing)
+
+
+def _upgrade_generic(bind):
+    """SQLite/PostgreSQL: таблицы пересоздаются с переносом данных"""
+    if 'document_id' not in {c['name'] for c in sa.inspect(bind).get_columns('documents')}:
+        return
+
+    op.create_table(
+        'verifications_new',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('document_id', sa.Integer(), nullable=False),
+        sa.Column('public_code_used', sa.String(length=64), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('ip_address', sa.String(length=45), nullable=True),
+        sa.Column('user_agent', sa.Text(), nullable=True),
+        sa.Column('verified_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.execute(
+        "INSERT INTO verifications_new (id, document_id, public_code_used, status, ip_address, user_agent, verified_at) "
+        "SELECT v.id, COALESCE(d.id, 0), v.document_id, v.status, v.ip_address, v.user_agent, "
+        "COALESCE(v.verified_at, CURRENT_TIMESTAMP) "
+        "FROM verifications v LEFT JOIN documents d ON d.document_id = v.document_id"
+    )
+    op.drop_table('verifications')
+    op.rename_table('verifications_new', 'verifications')
+    op.create_index('idx_verifications_document', 'verifications', ['document_id'])
+    op.create_index('idx_verifications_date', 'verifications', ['verified_at'])
+
+    op.create_table(
+        'documents_new',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('public_code', sa.String(length=64), nullable=False),
+        sa.Column('internal_code', sa.String(length=255), nullable=False),
+        sa.Column('document_type', sa.String(length=100), nullable=True),
+        sa.Column('issuer', sa.String(length=255), nullable=True),
+        sa.Column('issue_date', sa.Date(), nullable=True),
+        sa.Column('expiry_date', sa.Date(), nullable=True),
+        sa.Column('status', sa.String(length=20), server_default='valid', nullable=False),
+        sa.Column('metadata', sa.JSON(), nullable=True),
+        sa.Column('pin_hash', sa.LargeBinary(), nullable=True),
+        sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        # SQLite не добавляет ограничения к существующей таблице
+        *[sa.UniqueConstraint(*columns, name=name)
+          for name, (columns, is_unique) in DOCUMENT_INDEXES.items() if is_unique]
+    )
+    op.execute(
+        "INSERT INTO documents_new (id, public_code, internal_code, document_type, issuer, issue_date, "
+        "expiry_date, status, metadata, created_at, updated_at) "
+        "SELECT id, document_id, document_id, document_type, issuer, issue_date, "
+        "expiry_date, status, metadata, created_at, updated_at FROM documents"
+    )
+    op.drop_table('documents')
+    op.rename_table('documents_new', 'documents')
+    _create_document_indexes(unique=False)
+
+    if bind.dialect.name == 'postgresql':
+        # id перенесены явно: последовательности продолжают с максимума
+        for table in ('documents', 'verifications'):
+            op.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 1)) FROM {table}"
+            )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'mysql':
+        _upgrade_mysql(bind)
+    else:
+        _upgrade_generic(bind)
+
+
+def _downgrade_mysql():
+    """Обратные изменения на месте (секционирование журнала сохраняется)"""
+    op.execute(
+        "ALTER TABLE verifications "
+        "ADD COLUMN document_code VARCHAR(255) NULL AFTER id, "
+        "ADD COLUMN user_id INT NULL AFTER document_code"
+    )
+    op.execute(
+        "UPDATE verifications v LEFT JOIN documents d ON d.id = v.document_id "
+        "SET v.document_code = COALESCE(v.public_code_used, d.public_code, '')"
+    )
+    op.execute(
+        "ALTER TABLE verifications "
+        "DROP INDEX idx_verifications_document, DROP COLUMN document_id, DROP COLUMN public_code_used, "
+        "CHANGE document_code document_id VARCHAR(255) NOT NULL, "
+        "ADD INDEX idx_verifications_document (document_id)"
+    )
+
+    op.drop_index('idx_updated_at', table_name='documents')
+    for name in ('uq_documents_internal_code', 'uq_documents_public_code'):
+        op.drop_constraint(name, 'documents', type_='unique')
+    op.execute(
+        "ALTER TABLE documents "
+        "CHANGE public_code document_id VARCHAR(255) NOT NULL, "
+        "DROP COLUMN internal_code, DROP COLUMN pin_hash, "
+        "MODIFY status VARCHAR(20) NOT NULL"
+    )
+    # Имя, которое MySQL дал безымянному UNIQUE ревизии 001
+    op.create_unique_constraint('document_id', 'documents', ['document_id'])
+    op.create_index('idx_document_id', 'documents', ['document_id'])
+
+
+def _downgrade_generic(bind):
+    """SQLite/PostgreSQL: таблицы ревизии 001 строятся заново с переносом данных"""
+    op.create_table(
+        'documents_old',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('document_id', sa.String(length=255), nullable=False),
+        sa.Column('document_type', sa.String(length=100), nullable=True),
+        sa.Column('issuer', sa.String(length=255), nullable=True),
+        sa.Column('issue_date', sa.Date(), nullable=True),
+        sa.Column('expiry_date', sa.Date(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('metadata', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('document_id')
+    )
+    op.execute(
+        "INSERT INTO documents_old (id, document_id, document_type, issuer, issue_date, expiry_date, "
+        "status, metadata, created_at, updated_at) "
+        "SELECT id, public_code, document_type, issuer, issue_date, expiry_date, "
+        "status, metadata, created_at, updated_at FROM documents"
+    )
+
+    op.create_table(
+        'verifications_old',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('document_id', sa.String(length=255), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('ip_address', sa.String(length=45), nullable=True),
+        sa.Column('user_agent', sa.Text(), nullable=True),
+        sa.Column('verified_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.ForeignKeyConstraint(['document_id'], ['documents_old.document_id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    # Записи о неизвестных кодах не имели документа: внешний ключ 001 их не допускает
+    op.execute(
+        "INSERT INTO verifications_old (id, document_id, status, ip_address, user_agent, verified_at) "
+        "SELECT v.id, d.public_code, v.status, v.ip_address, v.user_agent, v.verified_at "
+        "FROM verifications v JOIN documents d ON d.id = v.document_id"
+    )
+
+    op.drop_table('verifications')
+    op.drop_table('documents')
+    # Ссылка внешнего ключа переименовывается вместе с таблицей
+    op.rename_table('documents_old', 'documents')
+    op.rename_table('verifications_old', 'verifications')
+
+    op.create_index('idx_document_id', 'documents', ['document_id'])
+    op.create_index('idx_status', 'documents', ['status'])
+    op.create_index('idx_expiry_date', 'documents', ['expiry_date'])
+    op.create_index('idx_verifications_document', 'verifications', ['document_id'])
+    op.create_index('idx_verifications_date', 'verifications', ['verified_at'])
+
+    if bind.dialect.name == 'postgresql':
+        for table in ('documents', 'verifications'):
+            op.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 1)) FROM {table}"
+            )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'mysql':
+        _downgrade_mysql()
+    else:
+        _downgrade_generic(bind)
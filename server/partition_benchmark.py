@@ -0,0 +1,101 @@
+"""
+Проверка отсечения секций журнала верификаций на запросах за период
+
+    python partition_benchmark.py [повторов]
+
+Для окон от суток до года, заканчивающихся сейчас, сравнивает секции из
+EXPLAIN с месяцами, которые окно действительно задевает, и замеряет запрос
+с условием на verified_at против того же запроса с выражением над колонкой,
+при котором MySQL читает все секции. Только чтение; данные берутся из БД
+настроек (DATABASE_URL), нужна уже секционированная таблица.
+"""
+import sys
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from app.database import engine
+from app.services.partition_service import FUTURE_PARTITION, TABLE, VerificationPartitions, month_start, partition_name
+
+WINDOWS = (
+    ('сутки', timedelta(days=1)),
+    ('неделя', timedelta(days=7)),
+    ('месяц', timedelta(days=30)),
+    ('квартал', timedelta(days=91)),
+    ('год', timedelta(days=365)),
+)
+
+PRUNED_QUERY = (
+    f"SELECT status, COUNT(*) FROM {TABLE} "
+    "WHERE verified_at >= :start AND verified_at < :end GROUP BY status"
+)
+# То же условие, но через выражение: ни отсечения секций, ни индекса
+UNPRUNED_QUERY = (
+    f"SELECT status, COUNT(*) FROM {TABLE} "
+    "WHERE verified_at + INTERVAL 0 SECOND >= :start AND verified_at + INTERVAL 0 SECOND < :end "
+    "GROUP BY status"
+)
+
+
+def expected_partitions(existing, start: datetime, end: datetime) -> set:
+    """Секции, которые пересекает окно [start, end)"""
+    monthly = {p.name for p in existing if p.month}
+    last = max((p.month for p in existing if p.month), default=None)
+    first = min((p.month for p in existing if p.month), default=None)
+    names = set()
+    month = month_start(start.date())
+    while month <= end.date():
+        if first and month < first:
+            names.add(partition_name(first))  # все раньше первой границы лежит в первой секции
+        elif partition_name(month) in monthly:
+            names.add(partition_name(month))
+        month = month_start(month, 1)
+    if last is None or end.date() >= month_start(last, 1):
+        names.add(FUTURE_PARTITION)
+    return names
+
+
+def timed(conn, query: str, params: dict, repeats: int) -> float:
+    """Среднее время запроса, мс"""
+    started = time.perf_counter()
+    for _ in range(repeats):
+        conn.execute(text(query), params).all()
+    return (time.perf_counter() - started) / repeats * 1000
+
+
+def run(repeats: int = 5) -> bool:
+    """
+    Замер по всем окнам
+
+    Returns:
+        True, если во всех запросах читались только нужные секции
+    """
+    existing = VerificationPartitions(engine).partitions()
+    if not existing:
+        print(f"Таблица {TABLE} не секционирована (alembic upgrade head)")
+        return False
+    print(f"Секций: {len(existing)}, записей ~{sum(p.rows for p in existing)}")
+
+    ok = True
+    end = datetime.now()
+    with engine.connect() as conn:
+        for label, span in WINDOWS:
+            params = {'start': end - span, 'end': end}
+            plan = conn.execute(text("EXPLAIN " + PRUNED_QUERY), params).mappings().first()
+            scanned = set(filter(None, (plan['partitions'] or '').split(',')))
+            expected = expected_partitions(existing, params['start'], end)
+            pruned_ok = scanned <= expected
+            ok = ok and pruned_ok
+
+            pruned_ms = timed(conn, PRUNED_QUERY, params, repeats)
+            full_ms = timed(conn, UNPRUNED_QUERY, params, repeats)
+            print(f"{label:>8}: секций {len(scanned)}/{len(existing)} "
+                  f"{'OK' if pruned_ok else 'ЛИШНИЕ: ' + ', '.join(sorted(scanned - expected))}, "
+                  f"{pruned_ms:.1f} мс против {full_ms:.1f} мс без отсечения")
+    return ok
+
+
+if __name__ == '__main__':
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    sys.exit(0 if run(repeats) else 1)
@@ -0,0 +1,79 @@
+"""
+Накладные расходы ограничения частоты запросов
+
+    python rate_limit_benchmark.py [запросов] [клиентов]
+    python rate_limit_benchmark.py 20000 100 --redis   # плюс общий бэкенд на REDIS_HOST
+
+Прогоняет ASGI-запросы через пустое приложение без middleware и с ним,
+печатает добавку на запрос, и проверяет, что память in-memory хранилища
+не растет от потока разовых клиентов.
+"""
+import argparse
+import asyncio
+import time
+
+from app.middleware.rate_limit import MemoryBackend, RateLimitMiddleware, RedisBackend
+
+
+async def empty_app(scope, receive, send):
+    await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+async def _receive():
+    return {'type': 'http.request', 'body': b''}
+
+
+async def _send(message):
+    pass
+
+
+async def measure(app, requests: int, clients: int) -> float:
+    """Среднее время запроса, мкс"""
+    scopes = [
+        {'type': 'http', 'path': '/v1/documents/verify', 'client': (f"10.0.{i // 256}.{i % 256}", 50000)}
+        for i in range(clients)
+    ]
+    started = time.perf_counter()
+    for index in range(requests):
+        await app(scopes[index % clients], _receive, _send)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+async def cleanup_check(clients: int = 100000) -> int:
+    """Корзин в памяти после потока разовых клиентов (модельное время)"""
+    backend = MemoryBackend(per_minute=60, burst=20)
+    for index in range(clients):
+        # Новый клиент каждые 10 мс; корзина полна через 20 с
+        await backend.take(f"client-{index}", now=index * 0.01)
+    return len(backend)
+
+
+async def run(requests: int, clients: int, with_redis: bool):
+    baseline = await measure(empty_app, requests, clients)
+    print(f"{'без лимита':>18}: {baseline:.2f} мкс/запрос")
+
+    # Лимит с запасом: замеряется путь разрешенного запроса
+    memory = RateLimitMiddleware(empty_app, MemoryBackend(per_minute=10 ** 9, burst=10 ** 9))
+    allowed = await measure(memory, requests, clients)
+    print(f"{'memory':>18}: {allowed:.2f} мкс/запрос (+{allowed - baseline:.2f})")
+
+    limited = RateLimitMiddleware(empty_app, MemoryBackend(per_minute=1, burst=1))
+    rejected = await measure(limited, requests, clients)
+    print(f"{'memory, 429':>18}: {rejected:.2f} мкс/запрос")
+
+    if with_redis:
+        redis_app = RateLimitMiddleware(empty_app, RedisBackend(per_minute=10 ** 9, burst=10 ** 9))
+        shared = await measure(redis_app, min(requests, 5000), clients)
+        print(f"{'redis':>18}: {shared:.2f} мкс/запрос (+{shared - baseline:.2f})")
+
+    print(f"Корзин после 100000 разовых клиентов: {await cleanup_check()} (активны последние 20 с)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Замер накладных расходов rate limiting")
+    parser.add_argument("requests", nargs='?', type=int, default=200000)
+    parser.add_argument("clients", nargs='?', type=int, default=1000)
+    parser.add_argument("--redis", action="store_true", help="Замерить и Redis-бэкенд")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.clients, args.redis))
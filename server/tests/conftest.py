@@ -0,0 +1,13 @@
+"""
+Общие настройки тестов сервера
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVER_DIR))
+
+# Настройки читаются при первом импорте app: тесты не должны трогать рабочую БД
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{Path(tempfile.mkdtemp()) / 'test.db'}")
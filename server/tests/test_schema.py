@@ -0,0 +1,77 @@
+"""
+Сверка моделей SQLAlchemy со схемой, которую строят миграции Alembic
+
+Запускать после изменения app/models или migrations/versions:
+    pytest tests/test_schema.py
+"""
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, text
+
+from app.config import settings
+from app.database import Base
+from app.models import document, verification, stats  # noqa: F401 - регистрация таблиц
+
+from conftest import SERVER_DIR
+
+
+@pytest.fixture
+def database_url(tmp_path, monkeypatch):
+    """Пустая SQLite; migrations/env.py берет адрес из settings"""
+    url = f"sqlite:///{tmp_path / 'schema.db'}"
+    monkeypatch.setattr(settings, 'DATABASE_URL', url)
+    return url
+
+
+@pytest.fixture
+def alembic_config():
+    config = Config(str(SERVER_DIR / 'alembic.ini'))
+    config.set_main_option('script_location', str(SERVER_DIR / 'migrations'))
+    return config
+
+
+def schema_diff(url: str) -> list:
+    """Расхождения между Base.metadata и БД: таблицы, колонки, типы, индексы, ключи"""
+    engine = create_engine(url)
+    try:
+        with engine.connect() as conn:
+            context = MigrationContext.configure(conn, opts={'compare_type': True})
+            return compare_metadata(context, Base.metadata)
+    finally:
+        engine.dispose()
+
+
+def test_models_match_migrations(database_url, alembic_config):
+    command.upgrade(alembic_config, 'head')
+    assert schema_diff(database_url) == []
+
+
+def test_production_schema_downgrade_round_trip(database_url, alembic_config):
+    command.upgrade(alembic_config, 'head')
+    engine = create_engine(database_url)
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO documents (id, public_code, internal_code, status) VALUES (7, 'CODE7', 'INT-7', 'valid')"
+            ))
+            conn.execute(text(
+                "INSERT INTO verifications (document_id, public_code_used, status) VALUES (7, 'CODE7', 'valid')"
+            ))
+
+        command.downgrade(alembic_config, '003')
+
+        inspector = inspect(engine)
+        assert 'document_id' in {c['name'] for c in inspector.get_columns('documents')}
+        assert 'public_code_used' not in {c['name'] for c in inspector.get_columns('verifications')}
+        assert [fk['referred_table'] for fk in inspector.get_foreign_keys('verifications')] == ['documents']
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT id, document_id FROM documents")).all() == [(7, 'CODE7')]
+            assert conn.execute(text("SELECT document_id FROM verifications")).scalars().all() == ['CODE7']
+    finally:
+        engine.dispose()
+
+    command.upgrade(alembic_config, 'head')
+    assert schema_diff(database_url) == []
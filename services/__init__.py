@@ -1,8 +1,23 @@
 """
 Сервисы приложения
 """
-from services.pdf_export import PDFExportService
-from services.offline_cache import OfflineCache
+import importlib
 
-__all__ = ['PDFExportService', 'OfflineCache']
+# Подмодули импортируются при первом обращении: импорт services.<модуль>
+# не должен тянуть reportlab/qrcode/cv2 из соседних сервисов
+_EXPORTS = {
+    'PDFExportService': 'services.pdf_export',
+    'OfflineCache': 'services.offline_cache',
+    'QRDecoder': 'services.qr_decoder',
+    'RecentResultsCache': 'services.recent_results',
+    'RegistrySync': 'services.registry_sync',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module 'services' has no attribute {name!r}")
 
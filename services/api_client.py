@@ -1,10 +1,11 @@
 """
 HTTP-клиент для обращения к внешнему PHP API.
 """
+import gzip
 import json
 import time
 from urllib import request, error, parse
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 from kivy.logger import Logger
 
@@ -19,18 +20,32 @@ class ApiClient:
         self.base_url = config.API_BASE_URL.rstrip("/")
         self.verify_path = config.API_VERIFY_PATH
         self.document_path = config.API_DOCUMENT_PATH
+        self.verify_batch_path = config.API_VERIFY_BATCH_PATH
+        self.sync_path = config.API_SYNC_PATH
+        self.revocations_path = config.API_REVOCATIONS_PATH
         self.timeout = config.HTTP_TIMEOUT
         self.max_retries = config.MAX_RETRIES
 
-    def _request(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def _request(
+        self,
+        method: str,
+        path: str,
+        payload: Optional[Dict[str, Any]] = None,
+        extra_headers: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
         url = f"{self.base_url}{path}"
         headers = {"Content-Type": "application/json; charset=utf-8"}
+        if extra_headers:
+            headers.update(extra_headers)
         data = json.dumps(payload).encode("utf-8") if payload is not None else None
 
         req = request.Request(url, data=data, headers=headers, method=method)
         try:
             with request.urlopen(req, timeout=self.timeout) as resp:
-                body = resp.read().decode("utf-8") if resp.length is None or resp.length > 0 else ""
+                raw = resp.read() if resp.length is None or resp.length > 0 else b""
+                if raw and resp.headers.get("Content-Encoding") == "gzip":
+                    raw = gzip.decompress(raw)
+                body = raw.decode("utf-8")
                 return json.loads(body) if body else {}
         except error.HTTPError as e:
             # Читаем тело ошибки, если есть
@@ -68,6 +83,30 @@ class ApiClient:
 
         raise last_exc or ConnectionError("Неизвестная ошибка запроса")
 
+    def verify_documents(self, public_codes: List[str], pin_code: Optional[str] = None) -> List[DocumentModel]:
+        """
+        POST verify_batch. Результаты в том же порядке, что и public_codes.
+        """
+        payload = {"public_codes": list(public_codes)}
+        if pin_code:
+            payload["pin"] = pin_code
+
+        last_exc: Optional[Exception] = None
+        for attempt in range(self.max_retries):
+            try:
+                response = self._request("POST", self.verify_batch_path, payload)
+                return self._parse_batch_response(public_codes, response)
+            except (ConnectionError, TimeoutError) as e:
+                last_exc = e
+                if attempt < self.max_retries - 1:
+                    delay = 2 ** attempt
+                    Logger.warning(f"ApiClient: Повтор через {delay}с из-за {e}")
+                    time.sleep(delay)
+                else:
+                    raise e
+
+        raise last_exc or ConnectionError("Неизвестная ошибка запроса")
+
     def get_document(self, public_code: str) -> DocumentModel:
         """
         GET document. Для совместимости используем query-параметр public_code.
@@ -91,6 +130,76 @@ class ApiClient:
 
         raise last_exc or ConnectionError("Неизвестная ошибка запроса")
 
+    def get_changes(self, since: str = "", limit: int = 500, issuer: Optional[str] = None) -> Dict[str, Any]:
+        """
+        GET sync: страница документов, измененных после водяного знака.
+
+        Returns:
+            {"documents": [...], "next_since": str, "has_more": bool}
+        """
+        params = {"since": since, "limit": limit}
+        if issuer:
+            params["issuer"] = issuer
+        path = f"{self.sync_path}?{parse.urlencode(params)}"
+        headers = {"Accept-Encoding": "gzip", "X-Sync-Key": config.SYNC_API_KEY}
+
+        last_exc: Optional[Exception] = None
+        for attempt in range(self.max_retries):
+            try:
+                response = self._request("GET", path, extra_headers=headers)
+                break
+            except (ConnectionError, TimeoutError) as e:
+                last_exc = e
+                if attempt < self.max_retries - 1:
+                    delay = 2 ** attempt
+                    Logger.warning(f"ApiClient: Повтор через {delay}с из-за {e}")
+                    time.sleep(delay)
+        else:
+            raise last_exc or ConnectionError("Неизвестная ошибка запроса")
+
+        if not isinstance(response, dict) or response.get("status") != "ok":
+            message = response.get("message") if isinstance(response, dict) else None
+            raise ValueError(message or "Некорректный ответ синхронизации")
+        data = response.get("data") or {}
+        return {
+            "documents": data.get("documents") or [],
+            "next_since": data.get("next_since") or since,
+            "has_more": bool(data.get("has_more")),
+        }
+
+    def get_revocation_filter(self, current_version: int = 0) -> Optional[bytes]:
+        """
+        GET revocations: подписанный фильтр отозванных документов.
+
+        Args:
+            current_version: Версия уже загруженного фильтра (0 - нет)
+
+        Returns:
+            Содержимое фильтра или None, если версия не изменилась
+        """
+        headers = {"X-Sync-Key": config.SYNC_API_KEY}
+        if current_version:
+            headers["If-None-Match"] = f'"{current_version}"'
+        req = request.Request(f"{self.base_url}{self.revocations_path}", headers=headers, method="GET")
+
+        last_exc: Optional[Exception] = None
+        for attempt in range(self.max_retries):
+            try:
+                with request.urlopen(req, timeout=self.timeout) as resp:
+                    return resp.read()
+            except error.HTTPError as e:
+                if e.code == 304:
+                    return None
+                raise ValueError(f"Фильтр отзыва недоступен: HTTP {e.code}") from e
+            except (error.URLError, TimeoutError) as e:
+                last_exc = e
+                if attempt < self.max_retries - 1:
+                    delay = 2 ** attempt
+                    Logger.warning(f"ApiClient: Повтор через {delay}с из-за {e}")
+                    time.sleep(delay)
+
+        raise ConnectionError(f"Ошибка сети: {last_exc}")
+
     @staticmethod
     def _parse_document_response(public_code: str, response: Dict[str, Any]) -> DocumentModel:
         """
@@ -126,4 +235,20 @@ class ApiClient:
             metadata={"error": message}
         )
 
-
+    @classmethod
+    def _parse_batch_response(cls, public_codes: List[str], response: Dict[str, Any]) -> List[DocumentModel]:
+        """
+        Преобразуем ответ пакетной верификации.
+        Ожидаем { "status": "ok", "data": [ <ответ verify для каждого кода>, ... ] },
+        где у каждого элемента есть "public_code".
+        """
+        items = response.get("data") if isinstance(response, dict) and response.get("status") == "ok" else None
+        if not isinstance(items, list):
+            # Ошибка всего пакета: одинаковая ошибка для каждого кода
+            return [cls._parse_document_response(code, response) for code in public_codes]
+
+        by_code = {item.get("public_code"): item for item in items if isinstance(item, dict)}
+        return [
+            cls._parse_document_response(code, by_code.get(code, {}))
+            for code in public_codes
+        ]
@@ -0,0 +1,67 @@
+"""
+Компактная запись метаданных документа для локальных баз
+
+Метаданные - произвольный JSON из реестра (серия, номер, ФИО, пометки).
+Они хранятся в BLOB с байтом формата в начале:
+    0 - JSON в UTF-8 без пробелов (короткие значения)
+    1 - тот же JSON, сжатый deflate с общим словарем SHARED_DICTIONARY_V1
+Словарь нельзя менять: новый словарь - новый байт формата.
+"""
+import json
+import zlib
+from typing import Any, Optional
+
+FORMAT_JSON = 0
+FORMAT_DEFLATE_V1 = 1
+
+# Короче этого размера сжатие не окупает заголовок deflate
+COMPRESS_MIN_BYTES = 48
+
+# Частые ключи и значения метаданных реестра; самые частые - в конце (ближе к данным)
+SHARED_DICTIONARY_V1 = (
+    '"doctor":"","vaccine":"","categories":"B, C","expired_date":"","revoked_date":"",'
+    '"error":"Документ не найден в реестре","error":"Документ отозван",'
+    '"warning":"Срок действия истекает через 30 дней",'
+    '"error":"Срок действия документа истек",'
+    '"full_name":"","birth_date":"19","issue_date":"20","expiry_date":"20",'
+    '{"series":"","number":"'
+).encode('utf-8')
+
+
+def encode_metadata(value: Any) -> Optional[bytes]:
+    """
+    Кодирование метаданных
+    
+    Args:
+        value: Значение, сериализуемое в JSON (обычно dict)
+        
+    Returns:
+        BLOB для записи в базу или None для пустых метаданных
+    """
+    if value is None:
+        return None
+    text = json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if len(text) >= COMPRESS_MIN_BYTES:
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -15, zdict=SHARED_DICTIONARY_V1)
+        packed = compressor.compress(text) + compressor.flush()
+        if len(packed) < len(text):
+            return bytes((FORMAT_DEFLATE_V1,)) + packed
+    return bytes((FORMAT_JSON,)) + text
+
+
+def decode_metadata(blob: Optional[bytes]) -> Any:
+    """
+    Декодирование метаданных, записанных encode_metadata
+    
+    Raises:
+        ValueError: Неизвестный формат
+    """
+    if not blob:
+        return None
+    fmt = blob[0]
+    if fmt == FORMAT_JSON:
+        return json.loads(blob[1:].decode('utf-8'))
+    if fmt == FORMAT_DEFLATE_V1:
+        decompressor = zlib.decompressobj(-15, zdict=SHARED_DICTIONARY_V1)
+        return json.loads((decompressor.decompress(blob[1:]) + decompressor.flush()).decode('utf-8'))
+    raise ValueError(f"Неизвестный формат метаданных: {fmt}")
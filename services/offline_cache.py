@@ -3,13 +3,82 @@
 KILLER FEATURE #2: Офлайн режим с синхронизацией
 """
 import json
+import os
 import sqlite3
+import threading
+import time
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict
+from datetime import date, datetime, timedelta
+from typing import Optional, List, Dict, Tuple
 from kivy.logger import Logger
 
+import config
 from model.document_model import DocumentModel, VerificationRecord
+from services.metadata_codec import decode_metadata, encode_metadata
+from services.revocation_filter import RevocationFilter, RevocationFilterError
+
+
+# Документы со сроком, истекающим в эти дни, получают статус warning (как determine_status на сервере)
+EXPIRY_WARNING_DAYS = 30
+
+
+def resolve_status(registry_status: Optional[str], expiry_date: Optional[str]) -> str:
+    """
+    Статус документа по статусу в реестре и сроку действия на сегодня
+    
+    Args:
+        registry_status: Статус в реестре (valid, warning, invalid, revoked)
+        expiry_date: Срок действия 'YYYY-MM-DD' или None
+        
+    Returns:
+        'valid', 'warning' или 'invalid'
+    """
+    if registry_status == 'valid':
+        if expiry_date:
+            try:
+                days = (date.fromisoformat(str(expiry_date)[:10]) - date.today()).days
+            except ValueError:
+                return 'invalid'
+            if days < 0:
+                return 'invalid'
+            if days <= EXPIRY_WARNING_DAYS:
+                return 'warning'
+        return 'valid'
+    if registry_status == 'warning':
+        return 'warning'
+    return 'invalid'
+
+
+def derive_registry_status(status: str, expiry_date: Optional[str]) -> str:
+    """
+    Статус в реестре по вердикту онлайн-проверки (обратное к resolve_status)
+    
+    Предупреждение из-за близкого срока действия дает 'valid': после
+    истечения срока resolve_status вернет 'invalid', а не застывший вердикт.
+    
+    Args:
+        status: Вердикт сервера (valid, warning, invalid)
+        expiry_date: Срок действия 'YYYY-MM-DD' или None
+        
+    Returns:
+        'valid', 'warning' или 'invalid'
+    """
+    if status == 'warning' and expiry_date:
+        try:
+            days = (date.fromisoformat(str(expiry_date)[:10]) - date.today()).days
+        except ValueError:
+            return 'warning'
+        if 0 <= days <= EXPIRY_WARNING_DAYS:
+            return 'valid'
+    return status if status in ('valid', 'warning') else 'invalid'
+
+
+# Обслуживание кэша выполняется одним потоком на процесс
+_maintenance_lock = threading.Lock()
+
+# Разобранные фильтры отзыва по пути файла: (mtime_ns, фильтр), подпись проверяется один раз
+_revocation_filters: Dict[str, Tuple[int, RevocationFilter]] = {}
+_revocation_filters_lock = threading.Lock()
 
 
 class OfflineCache:
@@ -23,6 +92,7 @@ class OfflineCache:
             cache_db_path: Путь к базе данных кэша
         """
         self.cache_db_path = Path(cache_db_path)
+        self.revocation_filter_path = self.cache_db_path.with_suffix('.revocations.bin')
         self._init_cache_db()
     
     def _init_cache_db(self):
@@ -31,13 +101,59 @@ class OfflineCache:
             conn = sqlite3.connect(str(self.cache_db_path))
             cursor = conn.cursor()
             
-            # Таблица для кэшированных документов
+            # Освобожденные страницы возвращаются порциями в maintain(); для уже
+            # существующего файла режим включается однократным VACUUM
+            cursor.execute('PRAGMA auto_vacuum')
+            if cursor.fetchone()[0] != 2:
+                cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+                cursor.execute('VACUUM')
+            
+            # Кэш, созданный до перехода на типизированные колонки, переписывается один раз
+            cursor.execute('PRAGMA table_info(cached_documents)')
+            columns = {row[1] for row in cursor.fetchall()}
+            if 'document_data' in columns:
+                cursor.execute('ALTER TABLE cached_documents RENAME TO cached_documents_legacy')
+            
+            # Таблица для кэшированных документов: постоянные поля - колонки,
+            # метаданные - компактный BLOB (services/metadata_codec.py);
+            # last_access (unix), hit_count и size_bytes - учет для вытеснения
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS cached_documents (
                     document_id TEXT PRIMARY KEY,
-                    document_data TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    document_type TEXT,
+                    issuer TEXT,
+                    issue_date TEXT,
+                    expiry_date TEXT,
+                    pin_required INTEGER NOT NULL DEFAULT 0,
+                    metadata BLOB,
                     cached_at TEXT NOT NULL,
-                    synced INTEGER DEFAULT 0
+                    synced INTEGER DEFAULT 0,
+                    server_id INTEGER,
+                    registry_status TEXT,
+                    last_access REAL,
+                    hit_count INTEGER DEFAULT 1,
+                    size_bytes INTEGER
+                )
+            ''')
+            
+            if 'document_data' in columns:
+                self._migrate_legacy_documents(cursor, columns)
+            
+            cursor.execute(
+                'CREATE INDEX IF NOT EXISTS idx_cached_documents_server_id ON cached_documents(server_id)'
+            )
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_cached_documents_last_access
+                ON cached_documents(last_access) WHERE server_id IS NULL
+            ''')
+            
+            # Водяные знаки синхронизации реестра (по области: весь реестр или издатель)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    scope TEXT PRIMARY KEY,
+                    watermark TEXT NOT NULL,
+                    synced_at TEXT NOT NULL
                 )
             ''')
             
@@ -51,6 +167,8 @@ class OfflineCache:
                     synced INTEGER DEFAULT 0
                 )
             ''')
+            # PIN-коды не хранятся на диске: стираются оставшиеся от прежних версий
+            cursor.execute('UPDATE pending_verifications SET pin_code = NULL WHERE pin_code IS NOT NULL')
             
             conn.commit()
             conn.close()
@@ -58,6 +176,58 @@ class OfflineCache:
         except Exception as e:
             Logger.error(f"OfflineCache: Ошибка инициализации БД: {e}")
     
+    @staticmethod
+    def _document_row(document_id: str, status: str, document_type, issuer, issue_date, expiry_date,
+                      pin_required: bool, metadata) -> Tuple:
+        """
+        Значения колонок документа и приблизительный объем записи
+        
+        Returns:
+            (document_id, status, document_type, issuer, issue_date, expiry_date,
+             pin_required, metadata, size_bytes)
+        """
+        issue_date = str(issue_date) if issue_date else None
+        expiry_date = str(expiry_date) if expiry_date else None
+        blob = encode_metadata(metadata)
+        size = len(blob) if blob else 0
+        for value in (document_id, status, document_type, issuer, issue_date, expiry_date):
+            if value:
+                size += len(value.encode('utf-8'))
+        return (document_id, status, document_type, issuer, issue_date, expiry_date,
+                int(bool(pin_required)), blob, size)
+    
+    def _migrate_legacy_documents(self, cursor, columns):
+        """Перенос документов из JSON-колонки document_data в типизированные колонки"""
+        optional = {
+            'server_id': 'NULL', 'registry_status': 'NULL',
+            'last_access': "CAST(strftime('%s', cached_at) AS REAL)", 'hit_count': '1',
+        }
+        selected = ', '.join(name if name in columns else expr for name, expr in optional.items())
+        cursor.execute(f'''
+            SELECT document_data, cached_at, synced, {selected}
+            FROM cached_documents_legacy
+        ''')
+        rows = []
+        for document_data, cached_at, synced, server_id, registry_status, last_access, hit_count in cursor.fetchall():
+            try:
+                data = json.loads(document_data)
+            except ValueError:
+                continue
+            rows.append(self._document_row(
+                data['document_id'], data.get('status') or 'invalid', data.get('document_type'),
+                data.get('issuer'), data.get('issue_date'), data.get('expiry_date'),
+                data.get('pin_required'), data.get('metadata')
+            ) + (cached_at, synced, server_id, registry_status, last_access or 0, hit_count or 1))
+        
+        cursor.executemany('''
+            INSERT OR REPLACE INTO cached_documents
+            (document_id, status, document_type, issuer, issue_date, expiry_date, pin_required, metadata,
+             size_bytes, cached_at, synced, server_id, registry_status, last_access, hit_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+        cursor.execute('DROP TABLE cached_documents_legacy')
+        Logger.info(f"OfflineCache: Кэш переведен на типизированные колонки ({len(rows)} документов)")
+    
     def cache_document(self, document: DocumentModel):
         """
         Кэширование документа для офлайн доступа
@@ -69,24 +239,36 @@ class OfflineCache:
             conn = sqlite3.connect(str(self.cache_db_path))
             cursor = conn.cursor()
             
-            document_data = json.dumps({
-                'document_id': document.document_id,
-                'status': document.status,
-                'document_type': document.document_type,
-                'issuer': document.issuer,
-                'issue_date': str(document.issue_date) if document.issue_date else None,
-                'expiry_date': str(document.expiry_date) if document.expiry_date else None,
-                'metadata': document.metadata
-            })
+            row = self._document_row(
+                document.document_id, document.status, document.document_type, document.issuer,
+                document.issue_date, document.expiry_date, False, document.metadata
+            )
             
+            # server_id и pin_required из синхронизации сохраняются; статус в реестре
+            # выводится из свежего ответа и пересчитывается на дату офлайн-проверки,
+            # повторное сканирование увеличивает счетчик обращений
             cursor.execute('''
-                INSERT OR REPLACE INTO cached_documents 
-                (document_id, document_data, cached_at, synced)
-                VALUES (?, ?, ?, 1)
-            ''', (
-                document.document_id,
-                document_data,
-                datetime.now().isoformat()
+                INSERT INTO cached_documents 
+                (document_id, status, document_type, issuer, issue_date, expiry_date, pin_required, metadata,
+                 size_bytes, cached_at, synced, registry_status, last_access, hit_count)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1, ?, ?, 1)
+                ON CONFLICT(document_id) DO UPDATE SET
+                    status = excluded.status,
+                    document_type = excluded.document_type,
+                    issuer = excluded.issuer,
+                    issue_date = excluded.issue_date,
+                    expiry_date = excluded.expiry_date,
+                    metadata = excluded.metadata,
+                    size_bytes = excluded.size_bytes,
+                    cached_at = excluded.cached_at,
+                    synced = 1,
+                    registry_status = excluded.registry_status,
+                    last_access = excluded.last_access,
+                    hit_count = hit_count + 1
+            ''', row + (
+                datetime.now().isoformat(),
+                derive_registry_status(document.status, document.expiry_date),
+                time.time()
             ))
             
             conn.commit()
@@ -99,6 +281,9 @@ class OfflineCache:
         """
         Получение документа из кэша
         
+        Результат помечается metadata['offline'] и не должен снова
+        записываться в кэш через cache_document().
+        
         Args:
             document_id: ID документа
             
@@ -110,29 +295,206 @@ class OfflineCache:
             cursor = conn.cursor()
             
             cursor.execute('''
-                SELECT document_data FROM cached_documents
+                SELECT status, document_type, issuer, issue_date, expiry_date, metadata, registry_status,
+                       pin_required
+                FROM cached_documents
                 WHERE document_id = ?
             ''', (document_id,))
             
             row = cursor.fetchone()
+            if row:
+                # Обновление по первичному ключу - одна страница, без чтения записи заново
+                cursor.execute('''
+                    UPDATE cached_documents SET last_access = ?, hit_count = hit_count + 1
+                    WHERE document_id = ?
+                ''', (time.time(), document_id))
+                conn.commit()
             conn.close()
             
             if row:
-                data = json.loads(row[0])
+                status, document_type, issuer, issue_date, expiry_date, blob, registry_status, pin_required = row
+                if pin_required:
+                    # PIN проверяется только сервером (verify.php): без сети вердикта нет
+                    return DocumentModel(
+                        document_id=document_id,
+                        status='warning',
+                        metadata={
+                            'error': "Документ защищен PIN-кодом: проверка PIN требует подключения к сети",
+                            'offline': True
+                        }
+                    )
+                # Статус пересчитывается на сегодня; у записей без статуса в реестре
+                # (кэш прежних версий) он выводится из сохраненного вердикта
+                status = resolve_status(registry_status or derive_registry_status(status, expiry_date), expiry_date)
+                metadata = decode_metadata(blob)
+                metadata = dict(metadata) if isinstance(metadata, dict) else {}
+                metadata['offline'] = True
+                # Документ мог быть отозван после кэширования. Фильтр вероятностный:
+                # совпадение - повод проверить онлайн, а не подтвержденный отзыв
+                if status != 'invalid':
+                    revocations = self.get_revocation_filter()
+                    if revocations is not None and revocations.might_contain(document_id):
+                        status = 'warning'
+                        metadata['notice'] = "Возможно, отозван (офлайн-проверка): проверьте онлайн"
                 return DocumentModel(
-                    document_id=data['document_id'],
-                    status=data['status'],
-                    document_type=data.get('document_type'),
-                    issuer=data.get('issuer'),
-                    issue_date=data.get('issue_date'),
-                    expiry_date=data.get('expiry_date'),
-                    metadata=data.get('metadata')
+                    document_id=document_id,
+                    status=status,
+                    document_type=document_type,
+                    issuer=issuer,
+                    issue_date=issue_date,
+                    expiry_date=expiry_date,
+                    metadata=metadata
                 )
             return None
         except Exception as e:
             Logger.error(f"OfflineCache: Ошибка получения документа из кэша: {e}")
             return None
     
+    def get_sync_watermark(self, scope: str = '*') -> str:
+        """
+        Водяной знак последней синхронизации
+        
+        Args:
+            scope: Область синхронизации ('*' - весь реестр или издатель)
+            
+        Returns:
+            Значение next_since из последнего ответа или '' (полная загрузка)
+        """
+        try:
+            conn = sqlite3.connect(str(self.cache_db_path))
+            cursor = conn.cursor()
+            cursor.execute('SELECT watermark FROM sync_state WHERE scope = ?', (scope,))
+            row = cursor.fetchone()
+            conn.close()
+            return row[0] if row else ''
+        except Exception as e:
+            Logger.error(f"OfflineCache: Ошибка чтения водяного знака: {e}")
+            return ''
+    
+    def apply_sync_delta(self, documents: List[Dict], scope: str, watermark: str) -> int:
+        """
+        Применение страницы изменений реестра одной транзакцией
+        
+        Документы и новый водяной знак записываются вместе: при сбое
+        страница будет запрошена повторно целиком.
+        
+        Args:
+            documents: Документы из ответа sync (с полями id и public_code)
+            scope: Область синхронизации
+            watermark: next_since из того же ответа
+            
+        Returns:
+            Количество записанных документов или -1 при ошибке
+        """
+        now = datetime.now().isoformat()
+        accessed = time.time()
+        rows = []
+        moved = []
+        for item in documents:
+            rows.append(self._document_row(
+                item['public_code'], item.get('status') or 'invalid', item.get('document_type'),
+                item.get('issuer'), item.get('issue_date'), item.get('expiry_date'),
+                item.get('pin_required'), item.get('metadata')
+            ) + (now, item['id'], item.get('registry_status'), accessed))
+            moved.append((item['id'], item['public_code']))
+        
+        try:
+            conn = sqlite3.connect(str(self.cache_db_path))
+            with conn:
+                # Публичный код мог смениться (document_rotate): старый код больше не действует
+                conn.executemany(
+                    'DELETE FROM cached_documents WHERE server_id = ? AND document_id != ?',
+                    moved
+                )
+                conn.executemany('''
+                    INSERT OR REPLACE INTO cached_documents
+                    (document_id, status, document_type, issuer, issue_date, expiry_date, pin_required,
+                     metadata, size_bytes, cached_at, synced, server_id, registry_status, last_access, hit_count)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1, ?, ?, ?, 0)
+                ''', rows)
+                conn.execute('''
+                    INSERT OR REPLACE INTO sync_state (scope, watermark, synced_at)
+                    VALUES (?, ?, ?)
+                ''', (scope, watermark, now))
+            conn.close()
+            return len(rows)
+        except Exception as e:
+            Logger.error(f"OfflineCache: Ошибка применения изменений реестра: {e}")
+            return -1
+    
+    def get_revocation_filter(self) -> Optional[RevocationFilter]:
+        """
+        Загруженный фильтр отзыва
+        
+        Returns:
+            RevocationFilter или None, если фильтра нет или подпись не сошлась
+        """
+        if not config.REVOCATION_PUBLIC_KEY:
+            return None
+        path = str(self.revocation_filter_path)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        
+        with _revocation_filters_lock:
+            cached = _revocation_filters.get(path)
+            if cached and cached[0] == mtime:
+                return cached[1]
+            try:
+                with open(path, 'rb') as f:
+                    revocations = RevocationFilter.parse(f.read(), config.REVOCATION_PUBLIC_KEY)
+            except (OSError, RevocationFilterError) as e:
+                Logger.error(f"OfflineCache: Фильтр отзыва не загружен: {e}")
+                _revocation_filters.pop(path, None)
+                return None
+            _revocation_filters[path] = (mtime, revocations)
+            return revocations
+    
+    def get_revocation_filter_version(self) -> int:
+        """Версия загруженного фильтра отзыва (0 - фильтра нет)"""
+        revocations = self.get_revocation_filter()
+        return revocations.version if revocations else 0
+    
+    def update_revocation_filter(self, blob: bytes) -> bool:
+        """
+        Сохранение нового фильтра отзыва после проверки подписи
+        
+        Фильтр старше уже загруженного отклоняется, чтобы подменой ответа
+        нельзя было вернуть устаревший список.
+        
+        Args:
+            blob: Ответ revocations.php
+            
+        Returns:
+            True, если фильтр принят
+        """
+        try:
+            revocations = RevocationFilter.parse(blob, config.REVOCATION_PUBLIC_KEY)
+        except RevocationFilterError as e:
+            Logger.error(f"OfflineCache: Фильтр отзыва отклонен: {e}")
+            return False
+        
+        current = self.get_revocation_filter_version()
+        if revocations.version < current:
+            Logger.warning(f"OfflineCache: Фильтр отзыва версии {revocations.version} старше текущей {current}")
+            return False
+        
+        try:
+            tmp_path = self.revocation_filter_path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp_path, self.revocation_filter_path)
+        except OSError as e:
+            Logger.error(f"OfflineCache: Ошибка записи фильтра отзыва: {e}")
+            return False
+        
+        Logger.info(
+            f"OfflineCache: Фильтр отзыва версии {revocations.version} загружен "
+            f"({revocations.count} кодов, {revocations.size_bytes // 1024} КБ)"
+        )
+        return True
+    
     def add_pending_verification(self, document_id: str, pin_code: Optional[str] = None):
         """
         Добавление отложенной верификации
@@ -218,7 +580,7 @@ class OfflineCache:
     
     def clear_old_cache(self, days=30):
         """
-        Очистка старого кэша
+        Очистка старого кэша (документы из синхронизации реестра не удаляются)
         
         Args:
             days: Количество дней для хранения кэша
@@ -231,7 +593,7 @@ class OfflineCache:
             
             cursor.execute('''
                 DELETE FROM cached_documents
-                WHERE cached_at < ?
+                WHERE cached_at < ? AND server_id IS NULL
             ''', (cutoff_date,))
             
             cursor.execute('''
@@ -244,4 +606,107 @@ class OfflineCache:
             Logger.info(f"OfflineCache: Старый кэш очищен (старше {days} дней)")
         except Exception as e:
             Logger.error(f"OfflineCache: Ошибка очистки кэша: {e}")
-
+    
+    def maintain(self, max_documents: Optional[int] = None, max_bytes: Optional[int] = None,
+                 max_age_days: Optional[float] = None) -> Dict[str, int]:
+        """
+        Вытеснение документов по возрасту и бюджету и возврат места на диске
+        
+        Удаление идет пачками по CACHE_EVICTION_BATCH строк в отдельных
+        транзакциях, чтобы не блокировать сканирование надолго. Порядок
+        вытеснения - по времени последнего доступа, сдвинутому на
+        CACHE_HIT_BONUS_HOURS за каждое сканирование (не больше
+        CACHE_HIT_BONUS_MAX): часто проверяемые документы живут дольше.
+        Документы из синхронизации реестра не вытесняются - их объем
+        задается областью синхронизации (REGISTRY_SYNC_ISSUER).
+        
+        Args:
+            max_documents: Лимит документов (по умолчанию CACHE_MAX_DOCUMENTS)
+            max_bytes: Лимит объема записей в байтах (по умолчанию CACHE_MAX_BYTES)
+            max_age_days: Срок без обращений (по умолчанию CACHE_MAX_AGE_DAYS)
+            
+        Returns:
+            {'expired': ..., 'evicted': ..., 'vacuumed_pages': ...}
+        """
+        max_documents = config.CACHE_MAX_DOCUMENTS if max_documents is None else max_documents
+        max_bytes = config.CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        max_age_days = config.CACHE_MAX_AGE_DAYS if max_age_days is None else max_age_days
+        batch = config.CACHE_EVICTION_BATCH
+        result = {'expired': 0, 'evicted': 0, 'vacuumed_pages': 0}
+        
+        if not _maintenance_lock.acquire(blocking=False):
+            return result
+        try:
+            conn = sqlite3.connect(str(self.cache_db_path))
+            cursor = conn.cursor()
+            
+            if max_age_days:
+                cutoff = time.time() - max_age_days * 86400
+                while True:
+                    cursor.execute('''
+                        DELETE FROM cached_documents WHERE rowid IN (
+                            SELECT rowid FROM cached_documents
+                            WHERE server_id IS NULL AND last_access < ?
+                            LIMIT ?
+                        )
+                    ''', (cutoff, batch))
+                    conn.commit()
+                    result['expired'] += cursor.rowcount
+                    if cursor.rowcount < batch:
+                        break
+                cursor.execute('''
+                    DELETE FROM pending_verifications
+                    WHERE synced = 1 AND created_at < ?
+                ''', (datetime.fromtimestamp(cutoff).isoformat(),))
+                conn.commit()
+            
+            bonus = config.CACHE_HIT_BONUS_HOURS * 3600
+            while True:
+                cursor.execute('''
+                    SELECT COUNT(*), COALESCE(SUM(size_bytes), 0)
+                    FROM cached_documents WHERE server_id IS NULL
+                ''')
+                count, size = cursor.fetchone()
+                excess = max(count - max_documents if max_documents else 0, 0)
+                if not excess and max_bytes and size > max_bytes:
+                    # Лишний объем в строках по среднему размеру записи
+                    excess = -(-(size - max_bytes) * count // size)
+                if not excess:
+                    break
+                cursor.execute('''
+                    DELETE FROM cached_documents WHERE rowid IN (
+                        SELECT rowid FROM cached_documents
+                        WHERE server_id IS NULL
+                        ORDER BY last_access + MIN(hit_count, ?) * ?
+                        LIMIT ?
+                    )
+                ''', (config.CACHE_HIT_BONUS_MAX, bonus, min(excess, batch)))
+                conn.commit()
+                result['evicted'] += cursor.rowcount
+                if not cursor.rowcount:
+                    break
+            
+            cursor.execute('PRAGMA freelist_count')
+            free_pages = cursor.fetchone()[0]
+            if free_pages >= config.CACHE_VACUUM_MIN_PAGES:
+                # execute() делает один шаг (одну страницу), executescript() - до конца
+                conn.executescript('PRAGMA incremental_vacuum(%d);' % free_pages)
+                result['vacuumed_pages'] = free_pages
+            
+            conn.close()
+            if any(result.values()):
+                Logger.info(
+                    f"OfflineCache: Обслуживание кэша: просрочено {result['expired']}, "
+                    f"вытеснено {result['evicted']}, освобождено страниц {result['vacuumed_pages']}"
+                )
+        except Exception as e:
+            Logger.error(f"OfflineCache: Ошибка обслуживания кэша: {e}")
+        finally:
+            _maintenance_lock.release()
+        return result
+    
+    def maintain_in_background(self) -> threading.Thread:
+        """Запуск maintain() в фоновом потоке"""
+        thread = threading.Thread(target=self.maintain, daemon=True)
+        thread.start()
+        return thread
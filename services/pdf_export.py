@@ -3,15 +3,27 @@
 KILLER FEATURE #1: Экспорт в PDF с QR-кодом и детальной информацией
 """
 from kivy.logger import Logger
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
 from pathlib import Path
+from xml.sax.saxutils import escape
+import multiprocessing
 import os
+import re
+import threading
+import zipfile
+
+import config
 
 try:
     from reportlab.lib.pagesizes import A4
     from reportlab.lib import colors
     from reportlab.lib.units import mm
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+    from reportlab.platypus import (
+        SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, KeepTogether
+    )
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.lib.enums import TA_CENTER, TA_LEFT
     from reportlab.pdfgen import canvas
@@ -30,6 +42,212 @@ except ImportError:
     Logger.warning("PDFExport: qrcode не установлен, QR-коды в PDF недоступны")
 
 
+# Сколько последних QR-кодов держать отрисованными в памяти
+QR_CACHE_SIZE = 128
+
+FONT_CANDIDATES = [
+    Path("fonts/DejaVuSans.ttf"),
+    Path("assets/fonts/DejaVuSans.ttf"),
+    Path("assets/fonts/DejaVuSansCondensed.ttf"),
+    Path("C:/Windows/Fonts/arial.ttf"),
+    Path("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"),
+]
+
+# Общие для процесса шрифты и стили: регистрируются один раз
+_registry_lock = threading.Lock()
+_fonts = None
+_styles = None
+_cleaned_dirs = set()
+
+
+def _register_fonts():
+    """
+    Регистрирует шрифт с поддержкой кириллицы.
+    Пытаемся найти системные шрифты (Windows/Linux) или шрифт в проекте.
+
+    Returns:
+        (обычный шрифт, жирный шрифт)
+    """
+    for font_path in FONT_CANDIDATES:
+        try:
+            if font_path.exists():
+                pdfmetrics.registerFont(TTFont("DocSans", str(font_path)))
+                Logger.info(f"PDFExport: Используется шрифт {font_path}")
+                # Для жирного используем тот же, если отдельного нет
+                return "DocSans", "DocSans"
+        except Exception as e:
+            Logger.warning(f"PDFExport: не удалось зарегистрировать шрифт {font_path}: {e}")
+
+    # Фолбек к стандартному Helvetica (может не отрисовать кириллицу, но хотя бы не упадём)
+    Logger.warning("PDFExport: не найден шрифт с кириллицей, используем Helvetica (могут быть квадраты)")
+    return "Helvetica", "Helvetica-Bold"
+
+
+def get_pdf_fonts():
+    """
+    Шрифты PDF, зарегистрированные в текущем процессе
+
+    Returns:
+        (обычный шрифт, жирный шрифт)
+    """
+    global _fonts
+    with _registry_lock:
+        if _fonts is None:
+            _fonts = _register_fonts()
+        return _fonts
+
+
+def get_pdf_styles():
+    """
+    Стили абзацев и таблиц PDF, созданные один раз на процесс
+
+    Returns:
+        Словарь {имя: ParagraphStyle или TableStyle}
+    """
+    global _styles
+    font_name, font_bold_name = get_pdf_fonts()
+    with _registry_lock:
+        if _styles is not None:
+            return _styles
+
+        sample = getSampleStyleSheet()
+        _styles = {
+            'title': ParagraphStyle(
+                'CustomTitle',
+                parent=sample['Heading1'],
+                fontSize=24,
+                textColor=colors.HexColor('#1E88E5'),
+                spaceAfter=30,
+                alignment=TA_CENTER,
+                fontName=font_bold_name
+            ),
+            'meta': ParagraphStyle(
+                'MetaStyle',
+                parent=sample['Normal'],
+                fontSize=10,
+                textColor=colors.HexColor('#666666'),
+                alignment=TA_LEFT,
+                fontName=font_name
+            ),
+            'report_title': ParagraphStyle(
+                'ReportTitle',
+                parent=sample['Heading1'],
+                fontSize=20,
+                textColor=colors.HexColor('#1E88E5'),
+                spaceAfter=12,
+                alignment=TA_CENTER,
+                fontName=font_bold_name
+            ),
+            'report_heading': ParagraphStyle(
+                'ReportHeading',
+                parent=sample['Heading2'],
+                fontSize=12,
+                spaceBefore=6,
+                spaceAfter=4,
+                fontName=font_bold_name
+            ),
+            'report_caption': ParagraphStyle(
+                'ReportCaption',
+                parent=sample['Normal'],
+                fontSize=9,
+                textColor=colors.HexColor('#666666'),
+                alignment=TA_CENTER,
+                fontName=font_name
+            ),
+            'result_table': TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1E88E5')),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTNAME', (0, 0), (-1, 0), font_bold_name),
+                ('FONTSIZE', (0, 0), (-1, 0), 12),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+                ('FONTNAME', (0, 1), (-1, -1), font_name),
+                ('FONTSIZE', (0, 1), (-1, -1), 11),
+            ]),
+            'report_table': TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1E88E5')),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTNAME', (0, 0), (-1, 0), font_bold_name),
+                ('FONTNAME', (0, 1), (-1, -1), font_name),
+                ('FONTSIZE', (0, 0), (-1, -1), 9),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F2F2F2')]),
+            ]),
+        }
+        return _styles
+
+
+@lru_cache(maxsize=QR_CACHE_SIZE)
+def render_qr_png(data):
+    """
+    PNG с QR-кодом в памяти (последние QR_CACHE_SIZE результатов кэшируются)
+
+    Args:
+        data: Кодируемая строка
+
+    Returns:
+        Байты PNG
+    """
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=10,
+        border=4,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+
+    buffer = BytesIO()
+    qr.make_image(fill_color="black", back_color="white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _remove_legacy_qr_files(output_dir):
+    """Удаление qr_*.png, которые раньше оставались в каталоге экспорта"""
+    with _registry_lock:
+        if output_dir in _cleaned_dirs:
+            return
+        _cleaned_dirs.add(output_dir)
+    for qr_file in output_dir.glob("qr_*.png"):
+        try:
+            qr_file.unlink()
+        except OSError:
+            pass
+
+
+class ExportCancelled(Exception):
+    """Экспорт отчета отменен пользователем"""
+
+
+class _FlowableStream(list):
+    """
+    Список flowable для doc.build, пополняемый из генератора по мере верстки
+
+    platypus снимает элементы с начала списка и перед каждым шагом
+    проверяет len(), поэтому в памяти держится только небольшой буфер.
+    """
+
+    def __init__(self, source, buffer_size=32):
+        super().__init__()
+        self._source = iter(source)
+        self._buffer_size = buffer_size
+
+    def __len__(self):
+        size = list.__len__(self)
+        while self._source is not None and size < self._buffer_size:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+                break
+            size += 1
+        return list.__len__(self)
+
+
 class PDFExportService:
     """Сервис для экспорта результатов верификации в PDF"""
     
@@ -45,6 +263,7 @@ class PDFExportService:
         self._font_registered = False
         self._font_name = "Helvetica"
         self._font_bold_name = "Helvetica-Bold"
+        _remove_legacy_qr_files(self.output_dir.resolve())
     
     def export_verification_result(self, document, output_filename=None):
         """
@@ -80,29 +299,18 @@ class PDFExportService:
             )
             
             story = []
-            styles = getSampleStyleSheet()
+            styles = get_pdf_styles()
             
             # Заголовок
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                textColor=colors.HexColor('#1E88E5'),
-                spaceAfter=30,
-                alignment=TA_CENTER,
-                fontName=self._font_bold_name
-            )
-            title = Paragraph("Результат верификации документа", title_style)
+            title = Paragraph("Результат верификации документа", styles['title'])
             story.append(title)
             story.append(Spacer(1, 12*mm))
             
             # QR-код документа
-            if QRCODE_AVAILABLE:
-                qr_path = self._generate_qr_code(document.document_id)
-                if qr_path and os.path.exists(qr_path):
-                    qr_image = Image(str(qr_path), width=60*mm, height=60*mm)
-                    story.append(qr_image)
-                    story.append(Spacer(1, 5*mm))
+            qr_image = self._qr_image(document.document_id, 60*mm)
+            if qr_image is not None:
+                story.append(qr_image)
+                story.append(Spacer(1, 5*mm))
             
             # Информация о документе
             doc_data = [
@@ -124,35 +332,15 @@ class PDFExportService:
             
             # Таблица с данными
             table = Table(doc_data, colWidths=[60*mm, 100*mm])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1E88E5')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), self._font_bold_name),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-                ('FONTNAME', (0, 1), (-1, -1), self._font_name),
-                ('FONTSIZE', (0, 1), (-1, -1), 11),
-            ]))
+            table.setStyle(styles['result_table'])
             
             story.append(table)
             story.append(Spacer(1, 10*mm))
             
             # Дополнительная информация
             if document.metadata:
-                meta_style = ParagraphStyle(
-                    'MetaStyle',
-                    parent=styles['Normal'],
-                    fontSize=10,
-                    textColor=colors.HexColor('#666666'),
-                    alignment=TA_LEFT,
-                    fontName=self._font_name
-                )
                 meta_text = "Дополнительная информация:\n" + str(document.metadata)
-                meta_para = Paragraph(meta_text, meta_style)
+                meta_para = Paragraph(meta_text, styles['meta'])
                 story.append(meta_para)
             
             # Создание PDF
@@ -167,26 +355,249 @@ class PDFExportService:
             traceback.print_exc()
             return None
     
-    def _generate_qr_code(self, document_id):
-        """Генерация QR-кода для документа"""
-        if not QRCODE_AVAILABLE:
+    def export_batch(self, documents, workers=None, subdir=None):
+        """
+        Пакетный экспорт результатов верификации, по PDF на документ
+        
+        reportlab рендерит на чистом Python, поэтому документы раздаются
+        пулу процессов (каждый со своими зарегистрированными шрифтами).
+        Процессы запускаются через spawn: дочерние не наследуют потоки
+        и контекст окна Kivy. Имена файлов и порядок результата
+        определяются только порядком documents.
+        
+        Args:
+            documents: Список DocumentModel
+            workers: Число процессов (None - config.PDF_EXPORT_WORKERS или по числу ядер,
+                     1 - последовательно в текущем процессе)
+            subdir: Подкаталог output_dir для файлов пакета
+            
+        Returns:
+            Пути к PDF в порядке documents (None для документов с ошибкой)
+        """
+        if not REPORTLAB_AVAILABLE:
+            Logger.error("PDFExport: reportlab не установлен")
+            return [None] * len(documents)
+        
+        output_dir = self.output_dir / subdir if subdir else self.output_dir
+        output_dir.mkdir(parents=True, exist_ok=True)
+        items = [
+            (document, f"{index:05d}_{_safe_filename(document.document_id)}.pdf")
+            for index, document in enumerate(documents, start=1)
+        ]
+        
+        if workers is None:
+            workers = config.PDF_EXPORT_WORKERS or os.cpu_count() or 1
+        workers = max(1, min(workers, len(items)))
+        
+        if workers == 1:
+            service = self if output_dir == self.output_dir else PDFExportService(str(output_dir))
+            return [service.export_verification_result(doc, output_filename=name) for doc, name in items]
+        
+        Logger.info(f"PDFExport: Пакетный экспорт {len(items)} документов, процессов: {workers}")
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_batch_worker,
+                initargs=(str(output_dir),)
+            ) as executor:
+                # map сохраняет порядок входных данных
+                chunksize = max(1, len(items) // (workers * 4))
+                return list(executor.map(_render_batch_item, items, chunksize=chunksize))
+        except Exception as e:
+            Logger.error(f"PDFExport: Ошибка пакетного экспорта: {e}")
+            return [None] * len(items)
+    
+    def export_batch_zip(self, documents, zip_filename=None, workers=None):
+        """
+        Пакетный экспорт в один ZIP-архив (порядок записей как в documents)
+        
+        Args:
+            documents: Список DocumentModel
+            zip_filename: Имя архива (если None, генерируется автоматически)
+            workers: Число процессов (см. export_batch)
+            
+        Returns:
+            Путь к архиву или None, если ни один документ не экспортирован
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if zip_filename is None:
+            zip_filename = f"verifications_{timestamp}.zip"
+        subdir = f"batch_{timestamp}_{os.getpid()}"
+        
+        paths = self.export_batch(documents, workers=workers, subdir=subdir)
+        if not any(paths):
             return None
         
+        zip_path = self.output_dir / zip_filename
+        with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for path in paths:
+                if path:
+                    archive.write(path, arcname=os.path.basename(path))
+                    os.remove(path)
         try:
-            qr = qrcode.QRCode(
-                version=1,
-                error_correction=qrcode.constants.ERROR_CORRECT_L,
-                box_size=10,
-                border=4,
+            (self.output_dir / subdir).rmdir()
+        except OSError:
+            pass
+        
+        Logger.info(f"PDFExport: Архив создан: {zip_path} ({sum(1 for p in paths if p)} из {len(paths)})")
+        return str(zip_path)
+    
+    def export_verification_report(self, storage, start=None, end=None, output_filename=None,
+                                   progress_callback=None, cancel_event=None, page_size=500):
+        """
+        Сводный отчет по журналу верификаций за период одним PDF
+
+        Записи читаются из Storage постранично и превращаются в разделы по
+        мере верстки, поэтому число записей не влияет на расход памяти
+        (в памяти остаются только готовые сжатые страницы PDF).
+
+        Args:
+            storage: Экземпляр Storage
+            start: Начало периода (включительно, None - с начала журнала)
+            end: Конец периода (не включительно, None - до конца журнала)
+            output_filename: Имя файла (если None, генерируется автоматически)
+            progress_callback: Функция (обработано, всего), вызывается из потока экспорта
+            cancel_event: threading.Event, установка которого прерывает экспорт
+            page_size: Размер страницы выборки из Storage
+
+        Returns:
+            Путь к созданному PDF файлу или None (ошибка или отмена)
+        """
+        if not REPORTLAB_AVAILABLE:
+            Logger.error("PDFExport: reportlab не установлен")
+            return None
+
+        if output_filename is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_filename = f"verification_report_{timestamp}.pdf"
+
+        output_path = self.output_dir / output_filename
+
+        try:
+            self._ensure_font_registered()
+
+            status_counts = storage.count_verifications(start, end)
+            total = sum(status_counts.values())
+
+            doc = SimpleDocTemplate(
+                str(output_path),
+                pagesize=A4,
+                rightMargin=20*mm,
+                leftMargin=20*mm,
+                topMargin=20*mm,
+                bottomMargin=20*mm,
+                title="Отчет о верификациях"
             )
-            qr.add_data(document_id)
-            qr.make(fit=True)
-            
-            qr_path = self.output_dir / f"qr_{document_id}.png"
-            img = qr.make_image(fill_color="black", back_color="white")
-            img.save(str(qr_path))
+
+            styles = get_pdf_styles()
+            summary = self._report_summary(styles, status_counts, total, start, end)
+            sections = self._report_sections(
+                styles, storage.iter_verifications(start, end, page_size),
+                total, progress_callback, cancel_event
+            )
+
+            def story():
+                yield from summary
+                yield from sections
+
+            doc.build(_FlowableStream(story()))
+
+            Logger.info(f"PDFExport: Отчет создан: {output_path} (записей: {total})")
+            return str(output_path)
+
+        except ExportCancelled:
+            Logger.info("PDFExport: Экспорт отчета отменен")
+        except Exception as e:
+            Logger.error(f"PDFExport: Ошибка создания отчета: {e}")
+
+        # Недописанный файл не оставляем
+        try:
+            output_path.unlink()
+        except OSError:
+            pass
+        return None
+
+    def _report_summary(self, styles, status_counts, total, start, end):
+        """Титульная часть отчета: период и сводная таблица по статусам"""
+        date_format = "%d.%m.%Y %H:%M"
+        period_from = start.strftime(date_format) if start else 'начало журнала'
+        period_to = end.strftime(date_format) if end else datetime.now().strftime(date_format)
+
+        summary_data = [['Показатель', 'Значение']]
+        summary_data.append(['Период', f"{period_from} — {period_to}"])
+        summary_data.append(['Всего проверок', str(total)])
+        for status in ('valid', 'warning', 'invalid'):
+            summary_data.append([self._format_status(status), str(status_counts.get(status, 0))])
+        for status, count in sorted(status_counts.items()):
+            if status not in ('valid', 'warning', 'invalid'):
+                summary_data.append([self._format_status(status), str(count)])
+
+        table = Table(summary_data, colWidths=[60*mm, 100*mm])
+        table.setStyle(styles['report_table'])
+
+        return [
+            Paragraph("Отчет о верификациях документов", styles['report_title']),
+            Paragraph(f"Сформирован {datetime.now().strftime(date_format)}", styles['report_caption']),
+            Spacer(1, 8*mm),
+            table,
+            Spacer(1, 10*mm),
+        ]
+
+    def _report_sections(self, styles, records, total, progress_callback, cancel_event):
+        """
+        Генератор разделов отчета, по одному на запись журнала
+
+        Проверяет отмену и сообщает о прогрессе примерно раз в процент.
+        """
+        step = max(1, total // 100)
+        done = 0
+        if progress_callback:
+            progress_callback(0, total)
+
+        for record in records:
+            if cancel_event is not None and cancel_event.is_set():
+                raise ExportCancelled()
+
+            rows = [
+                ['Параметр', 'Значение'],
+                ['Статус', self._format_status(record.status)],
+            ]
+            if record.document_type:
+                rows.append(['Тип документа', record.document_type])
+            if record.issuer:
+                rows.append(['Выдан', record.issuer])
+            if record.timestamp:
+                rows.append(['Дата проверки', record.timestamp.strftime("%d.%m.%Y %H:%M:%S")])
+            if record.seen_count > 1:
+                rows.append(['Повторных сканирований', str(record.seen_count - 1)])
+
+            table = Table(rows, colWidths=[60*mm, 100*mm])
+            table.setStyle(styles['report_table'])
+
+            done += 1
+            heading = Paragraph(f"{done}. {escape(record.document_id)}", styles['report_heading'])
+            yield KeepTogether([heading, table, Spacer(1, 4*mm)])
+
+            if progress_callback and (done % step == 0 or done == total):
+                progress_callback(done, total)
+
+    def _qr_image(self, document_id, size):
+        """
+        QR-код документа как flowable без временных файлов
+        
+        Args:
+            document_id: ID документа
+            size: Сторона изображения в пунктах
             
-            return str(qr_path)
+        Returns:
+            reportlab Image или None
+        """
+        if not QRCODE_AVAILABLE:
+            return None
+        
+        try:
+            return Image(BytesIO(render_qr_png(document_id)), width=size, height=size)
         except Exception as e:
             Logger.error(f"PDFExport: Ошибка генерации QR-кода: {e}")
             return None
@@ -201,39 +612,104 @@ class PDFExportService:
         return status_map.get(status, status)
 
     def _ensure_font_registered(self):
-        """
-        Регистрирует шрифт с поддержкой кириллицы, если он ещё не зарегистрирован.
-        Пытаемся найти системные шрифты (Windows/Linux) или шрифт в проекте.
-        """
+        """Подключение общих для процесса шрифтов с кириллицей"""
         if not REPORTLAB_AVAILABLE:
             return
         if self._font_registered:
             return
         
-        candidate_paths = [
-            Path("fonts/DejaVuSans.ttf"),
-            Path("assets/fonts/DejaVuSans.ttf"),
-            Path("assets/fonts/DejaVuSansCondensed.ttf"),
-            Path("C:/Windows/Fonts/arial.ttf"),
-            Path("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"),
-        ]
-        
-        for font_path in candidate_paths:
-            try:
-                if font_path.exists():
-                    pdfmetrics.registerFont(TTFont("DocSans", str(font_path)))
-                    self._font_name = "DocSans"
-                    # Для жирного используем тот же, если отдельного нет
-                    self._font_bold_name = "DocSans"
-                    self._font_registered = True
-                    Logger.info(f"PDFExport: Используется шрифт {font_path}")
-                    return
-            except Exception as e:
-                Logger.warning(f"PDFExport: не удалось зарегистрировать шрифт {font_path}: {e}")
-        
-        # Фолбек к стандартному Helvetica (может не отрисовать кириллицу, но хотя бы не упадём)
-        self._font_name = "Helvetica"
-        self._font_bold_name = "Helvetica-Bold"
+        self._font_name, self._font_bold_name = get_pdf_fonts()
         self._font_registered = True
-        Logger.warning("PDFExport: не найден шрифт с кириллицей, используем Helvetica (могут быть квадраты)")
 
+
+def _safe_filename(value):
+    """Часть имени файла без разделителей путей и спецсимволов"""
+    return re.sub(r'[^\w.-]', '_', value)
+
+
+# Сервис внутри процесса пула пакетного экспорта
+_worker_service = None
+
+
+def _init_batch_worker(output_dir):
+    """Инициализация процесса пула: свой сервис и шрифты"""
+    global _worker_service
+    _worker_service = PDFExportService(output_dir)
+    _worker_service._ensure_font_registered()
+
+
+def _render_batch_item(item):
+    """Рендер одного документа в процессе пула"""
+    document, filename = item
+    return _worker_service.export_verification_result(document, output_filename=filename)
+
+
+class ReportExportJob:
+    """Фоновый экспорт сводного отчета с прогрессом и отменой"""
+
+    def __init__(self, storage, start=None, end=None, on_progress=None, on_complete=None,
+                 service=None):
+        """
+        Инициализация задачи
+
+        Args:
+            storage: Экземпляр Storage
+            start: Начало периода (включительно)
+            end: Конец периода (не включительно)
+            on_progress: Функция (обработано, всего), вызывается из фонового потока
+            on_complete: Функция (путь или None), вызывается из фонового потока
+            service: PDFExportService (по умолчанию общий экземпляр)
+        """
+        self.storage = storage
+        self.start_time = start
+        self.end_time = end
+        self.on_progress = on_progress
+        self.on_complete = on_complete
+        self.service = service or get_pdf_export_service()
+        self.result_path = None
+        self._cancel_event = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        """Выполняется ли экспорт"""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def cancelled(self) -> bool:
+        """Была ли запрошена отмена"""
+        return self._cancel_event.is_set()
+
+    def start(self):
+        """Запуск экспорта в фоновом потоке"""
+        if self.running:
+            return
+        self._cancel_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Запрос отмены (экспорт прерывается на ближайшей записи)"""
+        self._cancel_event.set()
+
+    def _run(self):
+        self.result_path = self.service.export_verification_report(
+            self.storage,
+            start=self.start_time,
+            end=self.end_time,
+            progress_callback=self.on_progress,
+            cancel_event=self._cancel_event
+        )
+        if self.on_complete:
+            self.on_complete(self.result_path)
+
+
+_shared_service = None
+
+
+def get_pdf_export_service():
+    """Общий для приложения экземпляр сервиса экспорта"""
+    global _shared_service
+    if _shared_service is None:
+        _shared_service = PDFExportService()
+    return _shared_service
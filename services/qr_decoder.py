@@ -0,0 +1,297 @@
+"""
+Сервис декодирования QR-кодов с кадров камеры
+Долгоживущий объект: детекторы и буферы создаются один раз и переиспользуются
+"""
+import threading
+from typing import List, Optional, Tuple
+from kivy.logger import Logger
+
+try:
+    from pyzbar import pyzbar
+except (ImportError, FileNotFoundError, OSError):
+    pyzbar = None
+
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    cv2 = None
+    CV2_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+try:
+    from PIL import Image as PILImage
+except ImportError:
+    PILImage = None
+
+
+class DecoderBackend:
+    """Базовый класс бэкенда декодирования"""
+
+    name = "base"
+
+    @property
+    def available(self) -> bool:
+        """Доступен ли бэкенд в текущем окружении"""
+        return False
+
+    def decode(self, gray) -> List[str]:
+        """
+        Декодирование всех кодов в кадре
+
+        Args:
+            gray: Кадр в оттенках серого (numpy uint8 HxW или PIL 'L')
+
+        Returns:
+            Список декодированных строк (может быть пустым)
+        """
+        raise NotImplementedError
+
+
+class PyzbarBackend(DecoderBackend):
+    """Декодирование через pyzbar (zbar)"""
+
+    name = "pyzbar"
+
+    def __init__(self, symbols: Optional[list] = None):
+        """
+        Args:
+            symbols: Типы кодов pyzbar.ZBarSymbol (None - все, включая линейные штрихкоды)
+        """
+        self._symbols = symbols
+
+    @property
+    def available(self) -> bool:
+        return pyzbar is not None
+
+    def decode(self, gray) -> List[str]:
+        barcodes = pyzbar.decode(gray, symbols=self._symbols)
+        return [b.data.decode('utf-8') for b in barcodes if b.data]
+
+
+class OpenCVBackend(DecoderBackend):
+    """Декодирование через cv2.QRCodeDetector (один экземпляр на всё время жизни)"""
+
+    name = "opencv"
+
+    def __init__(self):
+        self._detector = cv2.QRCodeDetector() if CV2_AVAILABLE else None
+
+    @property
+    def available(self) -> bool:
+        return self._detector is not None
+
+    def decode(self, gray) -> List[str]:
+        retval, decoded_info, _points, _straight = self._detector.detectAndDecodeMulti(gray)
+        if not retval or not decoded_info:
+            return []
+        return [info for info in decoded_info if info]
+
+
+class WeChatBackend(DecoderBackend):
+    """Декодирование через cv2.wechat_qrcode (есть только в opencv-contrib)"""
+
+    name = "wechat"
+
+    def __init__(self):
+        self._detector = None
+        if CV2_AVAILABLE and hasattr(cv2, 'wechat_qrcode_WeChatQRCode'):
+            try:
+                self._detector = cv2.wechat_qrcode_WeChatQRCode()
+            except Exception as e:
+                Logger.info(f"QRDecoder: WeChat QR недоступен: {e}")
+
+    @property
+    def available(self) -> bool:
+        return self._detector is not None
+
+    def decode(self, gray) -> List[str]:
+        decoded_info, _points = self._detector.detectAndDecode(gray)
+        return [info for info in decoded_info if info]
+
+
+class QRDecoder:
+    """
+    Декодер QR-кодов, переиспользуемый между кадрами
+
+    Владеет экземплярами детекторов и буфером для перевода кадра в оттенки
+    серого. Бэкенд, успешно декодировавший последний код, пробуется первым.
+    """
+
+    def __init__(self, backends: Optional[List[DecoderBackend]] = None):
+        """
+        Инициализация декодера
+
+        Args:
+            backends: Список бэкендов в порядке приоритета
+                      (по умолчанию pyzbar, WeChat, OpenCV)
+        """
+        if backends is None:
+            backends = [PyzbarBackend(), WeChatBackend(), OpenCVBackend()]
+        self.backends = [b for b in backends if b.available]
+        self._preferred = 0
+        self._gray = None
+        self._lock = threading.Lock()
+
+        names = ', '.join(b.name for b in self.backends) or 'нет'
+        Logger.info(f"QRDecoder: Доступные бэкенды: {names}")
+
+    @property
+    def available(self) -> bool:
+        """Есть ли хотя бы один рабочий бэкенд"""
+        return bool(self.backends)
+
+    def register_backend(self, backend: DecoderBackend, first: bool = False):
+        """
+        Подключение дополнительного бэкенда
+
+        Args:
+            backend: Экземпляр бэкенда
+            first: Поставить в начало списка
+        """
+        if not backend.available:
+            return
+        with self._lock:
+            if first:
+                self.backends.insert(0, backend)
+                self._preferred = 0
+            else:
+                self.backends.append(backend)
+
+    def _to_gray(self, frame, color_code):
+        """Перевод кадра в оттенки серого в переиспользуемый буфер"""
+        if frame.ndim == 2:
+            return frame
+        shape = frame.shape[:2]
+        if self._gray is None or self._gray.shape != shape:
+            self._gray = np.empty(shape, dtype=np.uint8)
+        cv2.cvtColor(frame, color_code, dst=self._gray)
+        return self._gray
+
+    def _decode_gray(self, gray, collect_all: bool = False) -> List[str]:
+        """
+        Перебор бэкендов, начиная с последнего успешного (под блокировкой)
+
+        В обычном режиме останавливается на первом бэкенде, нашедшем код.
+        При collect_all опрашиваются все бэкенды и результаты объединяются
+        без повторов: разные детекторы находят разные коды в плотном кадре.
+        """
+        found: List[str] = []
+        count = len(self.backends)
+        for offset in range(count):
+            index = (self._preferred + offset) % count
+            backend = self.backends[index]
+            try:
+                results = backend.decode(gray)
+            except Exception as e:
+                Logger.debug(f"QRDecoder: Ошибка бэкенда {backend.name}: {e}")
+                continue
+            if not results:
+                continue
+            if not found:
+                self._preferred = index
+            for code in results:
+                if code not in found:
+                    found.append(code)
+            if not collect_all:
+                Logger.info(f"QRDecoder: Найден код через {backend.name}: {found[0]}")
+                break
+        return found
+
+    def _decode(self, frame, color_code, collect_all: bool) -> List[str]:
+        """Общий путь для кадров numpy"""
+        if not self.available or not CV2_AVAILABLE:
+            return []
+        if color_code is None:
+            color_code = cv2.COLOR_BGR2GRAY
+
+        with self._lock:
+            return self._decode_gray(self._to_gray(frame, color_code), collect_all)
+
+    def _decode_pixels(self, pixels: bytes, size: Tuple[int, int], collect_all: bool) -> List[str]:
+        """Общий путь для RGBA-пикселей текстуры Kivy"""
+        if not self.available:
+            return []
+        width, height = size
+
+        if CV2_AVAILABLE and NUMPY_AVAILABLE:
+            # Представление над байтами текстуры без копирования
+            frame = np.frombuffer(pixels, dtype=np.uint8).reshape(height, width, 4)
+            return self._decode(frame, cv2.COLOR_RGBA2GRAY, collect_all)
+
+        if PILImage is not None:
+            gray = PILImage.frombytes('RGBA', size, pixels).convert('L')
+            with self._lock:
+                return self._decode_gray(gray, collect_all)
+        return []
+
+    def decode_frame(self, frame, color_code: Optional[int] = None) -> Optional[str]:
+        """
+        Декодирование первого QR-кода в кадре
+
+        Args:
+            frame: Кадр numpy (HxWx3 BGR, HxWx4 RGBA или HxW серый)
+            color_code: Код преобразования cv2 (по умолчанию COLOR_BGR2GRAY)
+
+        Returns:
+            Декодированная строка или None
+        """
+        codes = self._decode(frame, color_code, collect_all=False)
+        return codes[0] if codes else None
+
+    def decode_frame_all(self, frame, color_code: Optional[int] = None) -> List[str]:
+        """
+        Декодирование всех различных QR-кодов в кадре
+
+        Args:
+            frame: Кадр numpy (HxWx3 BGR, HxWx4 RGBA или HxW серый)
+            color_code: Код преобразования cv2 (по умолчанию COLOR_BGR2GRAY)
+
+        Returns:
+            Список декодированных строк без повторов
+        """
+        return self._decode(frame, color_code, collect_all=True)
+
+    def decode_texture(self, pixels: bytes, size: Tuple[int, int]) -> Optional[str]:
+        """
+        Декодирование первого QR-кода из RGBA-пикселей текстуры Kivy
+
+        Args:
+            pixels: Байты RGBA
+            size: (ширина, высота)
+
+        Returns:
+            Декодированная строка или None
+        """
+        codes = self._decode_pixels(pixels, size, collect_all=False)
+        return codes[0] if codes else None
+
+    def decode_texture_all(self, pixels: bytes, size: Tuple[int, int]) -> List[str]:
+        """
+        Декодирование всех различных QR-кодов из RGBA-пикселей текстуры Kivy
+
+        Args:
+            pixels: Байты RGBA
+            size: (ширина, высота)
+
+        Returns:
+            Список декодированных строк без повторов
+        """
+        return self._decode_pixels(pixels, size, collect_all=True)
+
+
+_shared_decoder: Optional[QRDecoder] = None
+
+
+def get_qr_decoder() -> QRDecoder:
+    """Общий для приложения экземпляр декодера"""
+    global _shared_decoder
+    if _shared_decoder is None:
+        _shared_decoder = QRDecoder()
+    return _shared_decoder
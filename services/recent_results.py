@@ -0,0 +1,85 @@
+"""
+Кэш недавних результатов верификации на клиенте
+Повторное сканирование того же QR-кода в пределах окна отвечается из памяти
+"""
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import config
+from model.document_model import DocumentModel
+
+
+class RecentResultsCache:
+    """Кэш недавних результатов с TTL, зависящим от статуса"""
+    
+    def __init__(self, ttl_by_status: Optional[Dict[str, float]] = None, max_entries: int = 256):
+        """
+        Инициализация кэша
+        
+        Args:
+            ttl_by_status: Время жизни записи в секундах для каждого статуса
+            max_entries: Максимальное количество записей (старые вытесняются)
+        """
+        if ttl_by_status is None:
+            ttl_by_status = {
+                'valid': config.RECENT_RESULT_TTL_VALID,
+                'warning': config.RECENT_RESULT_TTL_WARNING,
+                # Недействительные перепроверяем чаще: статус мог быть исправлен
+                'invalid': config.RECENT_RESULT_TTL_INVALID,
+            }
+        self.ttl_by_status = ttl_by_status
+        self.max_entries = max_entries
+        # document_id -> (документ, ID записи в журнале, момент истечения)
+        self._entries: "OrderedDict[str, Tuple[DocumentModel, Optional[int], float]]" = OrderedDict()
+    
+    def get(self, document_id: str) -> Optional[Tuple[DocumentModel, Optional[int]]]:
+        """
+        Получение свежего результата
+        
+        Args:
+            document_id: ID документа
+            
+        Returns:
+            (DocumentModel, ID записи журнала) или None, если записи нет или она устарела
+        """
+        entry = self._entries.get(document_id)
+        if entry is None:
+            return None
+        
+        document, record_id, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[document_id]
+            return None
+        
+        self._entries.move_to_end(document_id)
+        return document, record_id
+    
+    def put(self, document: DocumentModel, record_id: Optional[int] = None):
+        """
+        Запоминание результата верификации
+        
+        Args:
+            document: Результат верификации
+            record_id: ID записи в журнале, к которой относятся повторные сканирования
+        """
+        ttl = self.ttl_by_status.get(document.status, 0)
+        if ttl <= 0:
+            return
+        
+        self._entries[document.document_id] = (document, record_id, time.monotonic() + ttl)
+        self._entries.move_to_end(document.document_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def invalidate(self, document_id: Optional[str] = None):
+        """
+        Сброс записи (или всего кэша, если document_id не указан)
+        
+        Args:
+            document_id: ID документа
+        """
+        if document_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(document_id, None)
@@ -0,0 +1,87 @@
+"""
+Синхронизация реестра документов в офлайн-кэш устройства
+Первый запуск загружает реестр (или документы издателя) целиком, дальше
+запрашиваются только изменения после сохраненного водяного знака.
+"""
+import threading
+from typing import Optional
+from kivy.logger import Logger
+
+import config
+from services.api_client import ApiClient
+from services.offline_cache import OfflineCache
+
+
+class RegistrySync:
+    """Загрузка изменений реестра постранично"""
+
+    def __init__(self, client: Optional[ApiClient] = None, cache: Optional[OfflineCache] = None):
+        self.client = client or ApiClient()
+        self.cache = cache or OfflineCache()
+        self._lock = threading.Lock()
+
+    def sync(self, issuer: Optional[str] = None, max_pages: Optional[int] = None) -> int:
+        """
+        Применение всех изменений с последней синхронизации
+
+        Args:
+            issuer: Ограничить синхронизацию документами издателя
+            max_pages: Максимум страниц за вызов (None - до конца)
+
+        Returns:
+            Количество полученных документов или -1 при ошибке
+        """
+        if not config.SYNC_API_KEY:
+            Logger.info("RegistrySync: Ключ синхронизации не задан, пропуск")
+            return 0
+        if not self._lock.acquire(blocking=False):
+            Logger.info("RegistrySync: Синхронизация уже выполняется")
+            return 0
+
+        scope = issuer or '*'
+        total = 0
+        pages = 0
+        try:
+            watermark = self.cache.get_sync_watermark(scope)
+            while max_pages is None or pages < max_pages:
+                page = self.client.get_changes(watermark, config.REGISTRY_SYNC_PAGE_SIZE, issuer)
+                applied = self.cache.apply_sync_delta(page['documents'], scope, page['next_since'])
+                if applied < 0:
+                    return -1
+                total += applied
+                pages += 1
+                watermark = page['next_since']
+                if not page['has_more']:
+                    break
+            Logger.info(f"RegistrySync: Получено документов: {total} (страниц: {pages}, область: {scope})")
+            self.refresh_revocation_filter()
+            return total
+        except Exception as e:
+            Logger.warning(f"RegistrySync: Синхронизация прервана после {total} документов: {e}")
+            return -1
+        finally:
+            self._lock.release()
+
+    def refresh_revocation_filter(self) -> bool:
+        """
+        Загрузка фильтра отзыва, если на сервере появилась новая версия
+
+        Returns:
+            True, если фильтр актуален
+        """
+        if not config.REVOCATION_PUBLIC_KEY:
+            return False
+        try:
+            blob = self.client.get_revocation_filter(self.cache.get_revocation_filter_version())
+        except Exception as e:
+            Logger.warning(f"RegistrySync: Фильтр отзыва не обновлен: {e}")
+            return False
+        if blob is None:
+            return True
+        return self.cache.update_revocation_filter(blob)
+
+    def sync_in_background(self, issuer: Optional[str] = None):
+        """Запуск sync() в фоновом потоке"""
+        thread = threading.Thread(target=self.sync, args=(issuer,), daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,103 @@
+"""
+Фильтр Блума отозванных документов для офлайн-режима
+
+Сервер (backend/api/revocations.php) публикует фильтр по публичным кодам
+отозванных и недействительных документов, подписанный Ed25519. Формат и
+хэширование описаны в backend/helpers/bloom.php. Отрицательный ответ
+фильтра точен, положительный - "вероятно отозван" с долей ложных
+срабатываний, заданной на сервере (по умолчанию 0.01%).
+"""
+import base64
+import hashlib
+import struct
+
+try:
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+    CRYPTOGRAPHY_AVAILABLE = True
+except ImportError:
+    CRYPTOGRAPHY_AVAILABLE = False
+
+MAGIC = b'RVBF'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('>4sBIIIIQ')
+SIGNATURE_SIZE = 64
+
+
+class RevocationFilterError(ValueError):
+    """Фильтр поврежден, не подписан доверенным ключом или в неизвестном формате"""
+
+
+class RevocationFilter:
+    """Проверка публичного кода по фильтру отзыва"""
+    
+    __slots__ = ('hashes', 'bits', 'count', 'seed', 'version', '_data', '_seed_bytes')
+    
+    def __init__(self, hashes: int, bits: int, count: int, seed: int, version: int, data: bytes):
+        self.hashes = hashes
+        self.bits = bits
+        self.count = count
+        self.seed = seed
+        self.version = version
+        self._data = data
+        self._seed_bytes = struct.pack('>I', seed)
+    
+    @classmethod
+    def parse(cls, blob: bytes, public_key: str) -> 'RevocationFilter':
+        """
+        Проверка подписи и разбор фильтра
+        
+        Args:
+            blob: Ответ revocations.php (фильтр и подпись)
+            public_key: Открытый ключ Ed25519 сервера (base64)
+            
+        Returns:
+            RevocationFilter
+            
+        Raises:
+            RevocationFilterError
+        """
+        if not CRYPTOGRAPHY_AVAILABLE:
+            raise RevocationFilterError("cryptography не установлена, подпись не проверить")
+        if len(blob) < HEADER.size + SIGNATURE_SIZE:
+            raise RevocationFilterError("Фильтр слишком короткий")
+        
+        body, signature = blob[:-SIGNATURE_SIZE], blob[-SIGNATURE_SIZE:]
+        try:
+            Ed25519PublicKey.from_public_bytes(base64.b64decode(public_key)).verify(signature, body)
+        except InvalidSignature:
+            raise RevocationFilterError("Неверная подпись фильтра")
+        except ValueError as e:
+            raise RevocationFilterError(f"Некорректный открытый ключ: {e}")
+        
+        magic, fmt, hashes, bits, count, seed, version = HEADER.unpack_from(body)
+        if magic != MAGIC or fmt != FORMAT_VERSION:
+            raise RevocationFilterError(f"Неизвестный формат фильтра {magic!r}/{fmt}")
+        data = body[HEADER.size:]
+        if not hashes or not bits or len(data) * 8 != bits:
+            raise RevocationFilterError("Размер фильтра не совпадает с заголовком")
+        return cls(hashes, bits, count, seed, version, data)
+    
+    def might_contain(self, document_id: str) -> bool:
+        """
+        Проверка кода: False - точно не отозван, True - вероятно отозван
+        
+        Args:
+            document_id: Публичный код документа
+        """
+        digest = hashlib.sha256(self._seed_bytes + document_id.encode('utf-8')).digest()
+        h1, h2 = struct.unpack_from('>II', digest)
+        h2 |= 1
+        data = self._data
+        bits = self.bits
+        for i in range(self.hashes):
+            position = (h1 + i * h2) % bits
+            if not data[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+    
+    __contains__ = might_contain
+    
+    @property
+    def size_bytes(self) -> int:
+        return len(self._data)
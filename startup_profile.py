@@ -0,0 +1,165 @@
+"""
+Профилирование холодного старта приложения
+
+Режим инструментирования (DOCCHECK_STARTUP_PROFILE=1) записывает время импорта
+каждого модуля и время создания экранов в JSON-отчет.
+
+Проверка бюджета импорта main в свежем интерпретаторе:
+    python startup_profile.py --check
+"""
+import builtins
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+import config
+
+_original_import = builtins.__import__
+_installed = False
+_stack: List[list] = []  # [имя модуля, момент начала, время вложенных импортов]
+_module_times: Dict[str, Dict[str, float]] = {}
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    """Обертка над __import__, учитывающая только первый импорт модуля"""
+    if level != 0 or name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    frame = [name, time.perf_counter(), 0.0]
+    _stack.append(frame)
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        _stack.pop()
+        cumulative = time.perf_counter() - frame[1]
+        if _stack:
+            _stack[-1][2] += cumulative
+        if name not in _module_times:
+            _module_times[name] = {
+                'self_ms': round((cumulative - frame[2]) * 1000, 3),
+                'cumulative_ms': round(cumulative * 1000, 3),
+            }
+
+
+def is_enabled() -> bool:
+    """Включен ли режим инструментирования"""
+    return config.STARTUP_PROFILE
+
+
+def install():
+    """Подключение профилировщика импортов (ничего не делает, если режим выключен)"""
+    global _installed
+    if _installed or not is_enabled():
+        return
+    builtins.__import__ = _timed_import
+    _installed = True
+
+
+def uninstall():
+    """Отключение профилировщика импортов"""
+    global _installed
+    if _installed:
+        builtins.__import__ = _original_import
+        _installed = False
+
+
+def write_report(phases: Dict[str, float], screens: Dict[str, float], path: Optional[str] = None,
+                 top: int = 50) -> Optional[str]:
+    """
+    Запись JSON-отчета о старте
+
+    Args:
+        phases: Фазы запуска в секундах (импорт, build, первый кадр)
+        screens: Время создания экранов в секундах
+        path: Путь к отчету (по умолчанию config.STARTUP_PROFILE_PATH)
+        top: Сколько самых долгих модулей включить в отчет
+
+    Returns:
+        Путь к отчету или None, если режим выключен
+    """
+    if not is_enabled():
+        return None
+
+    path = path or config.STARTUP_PROFILE_PATH
+    modules = sorted(
+        ({'module': name, **times} for name, times in _module_times.items()),
+        key=lambda item: item['cumulative_ms'],
+        reverse=True
+    )
+    report = {
+        'phases_ms': {name: round(value * 1000, 1) for name, value in phases.items()},
+        'screens_ms': {name: round(value * 1000, 1) for name, value in screens.items()},
+        'modules_imported': len(modules),
+        'slowest_modules': modules[:top],
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def measure_cold_import(module: str = 'main') -> Dict[str, object]:
+    """
+    Холодный импорт модуля в отдельном интерпретаторе
+
+    Returns:
+        {'seconds': время импорта, 'importtime': вывод -X importtime}
+    """
+    code = (
+        "import time; started = time.perf_counter(); "
+        f"import {module}; "
+        "print(time.perf_counter() - started)"
+    )
+    env = dict(os.environ, KIVY_NO_ARGS='1', KIVY_NO_CONSOLELOG='1', DOCCHECK_STARTUP_PROFILE='0')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Импорт {module} завершился ошибкой:\n{result.stderr[-2000:]}")
+    return {'seconds': float(result.stdout.strip().splitlines()[-1]), 'importtime': result.stderr}
+
+
+def _slowest_from_importtime(output: str, top: int = 10) -> List[str]:
+    """Самые долгие модули (кумулятивно) из вывода -X importtime"""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) == 3:
+            rows.append((int(parts[1]), parts[2].strip()))
+    rows.sort(reverse=True)
+    return [f"{name}: {usec / 1000:.1f} мс" for usec, name in rows[:top]]
+
+
+def check_budget(module: str = 'main', budget_ms: Optional[float] = None) -> bool:
+    """
+    Проверка, что холодный импорт укладывается в бюджет
+
+    Returns:
+        True если импорт быстрее бюджета
+    """
+    budget_ms = config.STARTUP_IMPORT_BUDGET_MS if budget_ms is None else budget_ms
+    measurement = measure_cold_import(module)
+    elapsed_ms = measurement['seconds'] * 1000
+
+    print(f"Холодный импорт {module}: {elapsed_ms:.0f} мс (бюджет {budget_ms:.0f} мс)")
+    if elapsed_ms <= budget_ms:
+        return True
+
+    print("Бюджет превышен. Самые долгие импорты:")
+    for line in _slowest_from_importtime(measurement['importtime']):
+        print(f"  {line}")
+    return False
+
+
+if __name__ == '__main__':
+    if '--check' in sys.argv:
+        sys.exit(0 if check_budget() else 1)
+    print(__doc__)
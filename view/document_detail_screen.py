@@ -225,8 +225,8 @@ class DocumentDetailScreen(Screen):
             details.append(('Дата выдачи', str(document.issue_date)))
         if document.expiry_date:
             expiry_str = str(document.expiry_date)
-            if isinstance(document.expiry_date, date):
-                days_left = (document.expiry_date - date.today()).days
+            if document.expiry is not None:
+                days_left = (document.expiry - date.today()).days
                 if days_left > 0:
                     expiry_str += f" (осталось {days_left} дней)"
                 else:
@@ -316,8 +316,8 @@ class DocumentDetailScreen(Screen):
             return
         
         try:
-            from services.pdf_export import PDFExportService
-            export_service = PDFExportService()
+            from services.pdf_export import get_pdf_export_service
+            export_service = get_pdf_export_service()
             pdf_path = export_service.export_verification_result(self.document)
             
             if pdf_path:
@@ -5,8 +5,6 @@ from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
 from kivy.uix.button import Button
-from kivy.uix.scrollview import ScrollView
-from kivy.uix.gridlayout import GridLayout
 from kivy.logger import Logger
 from kivy.metrics import dp
 from kivy.graphics import Color, Rectangle, RoundedRectangle
@@ -15,6 +13,7 @@ from datetime import datetime
 from viewmodel.history_viewmodel import HistoryViewModel
 from security.biometric_auth import BiometricAuth
 from model.document_model import VerificationRecord
+from view.record_list import RecordList
 try:
     from design.modern_theme import (
         PRIMARY_COLOR, SURFACE_COLOR, BACKGROUND_COLOR, BORDER_RADIUS,
@@ -88,18 +87,31 @@ class HistoryScreen(Screen):
         header.add_widget(back_button)
         layout.add_widget(header)
         
-        # Контейнер для истории
-        scroll = ScrollView()
-        self.history_layout = GridLayout(
-            cols=1,
-            spacing=dp(12),
+        # Контейнер для истории: виртуализированный список или заглушка
+        self.history_container = BoxLayout(orientation='vertical')
+        self.record_list = RecordList(
+            status_color=self.viewmodel.get_status_color,
+            status_text=self.viewmodel.get_status_text,
+            on_details=self.view_details,
+            on_delete=self.delete_record
+        )
+        
+        self.empty_card = Card(
             size_hint_y=None,
-            padding=[dp(8), dp(8)]
+            height=dp(100),
+            padding=[dp(20), dp(16)]
         )
-        self.history_layout.bind(minimum_height=self.history_layout.setter('height'))
+        no_records_label = BodyLabel(
+            text='История пуста\nОтсканируйте документы, чтобы они появились здесь',
+            halign='center',
+            valign='middle',
+            text_size=(None, None)
+        )
+        no_records_label.bind(texture_size=no_records_label.setter('size'))
+        self.empty_card.add_widget(no_records_label)
         
-        scroll.add_widget(self.history_layout)
-        layout.add_widget(scroll)
+        self.history_container.add_widget(self.record_list)
+        layout.add_widget(self.history_container)
         
         # Кнопки управления
         button_layout = BoxLayout(
@@ -164,191 +176,21 @@ class HistoryScreen(Screen):
         if not self.authenticated:
             return
         
-        # Очистка текущего списка
-        self.history_layout.clear_widgets()
-        
-        # Получение записей
-        records = self.viewmodel.get_all_verifications()
+        # Получение записей (строки создаются только для видимой части списка)
+        records = self.viewmodel.get_all_verifications(limit=None)
         
+        self.history_container.clear_widgets()
         if not records:
-            no_records_card = Card(
-                size_hint_y=None,
-                height=dp(100),
-                padding=[dp(20), dp(16)]
-            )
-            no_records_label = BodyLabel(
-                text='История пуста\nОтсканируйте документы, чтобы они появились здесь',
-                halign='center',
-                valign='middle',
-                text_size=(None, None)
-            )
-            no_records_label.bind(texture_size=no_records_label.setter('size'))
-            no_records_card.add_widget(no_records_label)
-            self.history_layout.add_widget(no_records_card)
+            self.record_list.set_records([])
+            self.history_container.add_widget(self.empty_card)
+            self.history_container.add_widget(BoxLayout())
             return
         
-        # Добавление записей с анимацией появления
-        for i, record in enumerate(records):
-            record_widget = self.create_record_widget(record)
-            self.history_layout.add_widget(record_widget)
-            
-            # Анимация появления
-            record_widget.opacity = 0
-            from kivy.animation import Animation
-            anim = Animation(opacity=1, duration=0.3, transition='out_quad')
-            anim.start(record_widget)
+        self.history_container.add_widget(self.record_list)
+        self.record_list.set_records(records)
         
         Logger.info(f"HistoryScreen: Загружено {len(records)} записей")
     
-    def create_record_widget(self, record: VerificationRecord) -> Card:
-        """Создание виджета записи - улучшенный дизайн с возможностью просмотра деталей"""
-        card = Card(
-            size_hint_y=None,
-            height=dp(90),
-            spacing=dp(6),
-            padding=[dp(12), dp(10)]
-        )
-        
-        # Добавляем эффект нажатия
-        card.bind(on_touch_down=self.on_card_touch)
-        
-        # Контейнер с информацией
-        info_container = BoxLayout(
-            orientation='horizontal',
-            spacing=dp(10)
-        )
-        
-        # Индикатор статуса (компактный)
-        status_color = self.viewmodel.get_status_color(record.status)
-        status_indicator = BoxLayout(
-            size_hint=(None, None),
-            size=(dp(32), dp(32)),
-            pos_hint={'center_y': 0.5}
-        )
-        
-        # Убеждаемся, что status_color - это кортеж из 3 элементов (R, G, B)
-        if len(status_color) == 3:
-            status_color_rgba = (status_color[0], status_color[1], status_color[2], 0.2)
-        else:
-            status_color_rgba = (status_color[0], status_color[1], status_color[2], 0.2) if len(status_color) >= 3 else (0.5, 0.5, 0.5, 0.2)
-        
-        with status_indicator.canvas.before:
-            Color(*status_color_rgba)  # Полупрозрачный фон
-            status_circle = RoundedRectangle(
-                size=status_indicator.size,
-                pos=status_indicator.pos,
-                radius=[dp(16), dp(16), dp(16), dp(16)]
-            )
-        
-        def update_status_circle(instance, value):
-            if hasattr(status_indicator, 'canvas') and hasattr(status_indicator.canvas, 'before'):
-                status_circle.size = instance.size
-                status_circle.pos = instance.pos
-        
-        status_indicator.bind(size=update_status_circle, pos=update_status_circle)
-        
-        # Информация о документе - компактная
-        info_layout = BoxLayout(
-            orientation='vertical',
-            size_hint_x=0.75,
-            spacing=dp(2)
-        )
-        
-        # ID документа
-        doc_id_label = BodyLabel(
-            text=record.document_id,
-            size_hint_y=None,
-            height=dp(24),
-            halign='left',
-            text_size=(None, None),
-            bold=True
-        )
-        doc_id_label.bind(texture_size=doc_id_label.setter('size'))
-        
-        # Статус с цветом
-        status_text = self.viewmodel.get_status_text(record.status)
-        # Убеждаемся, что color - это кортеж из 4 элементов (R, G, B, A)
-        if len(status_color) == 3:
-            status_label_color = (status_color[0], status_color[1], status_color[2], 1.0)
-        else:
-            status_label_color = status_color if len(status_color) >= 4 else (0.5, 0.5, 0.5, 1.0)
-        
-        status_label = BodyLabel(
-            text=status_text,
-            size_hint_y=None,
-            height=dp(20),
-            halign='left',
-            color=status_label_color,
-            text_size=(None, None)
-        )
-        status_label.bind(texture_size=status_label.setter('size'))
-        
-        # Время
-        time_str = ""
-        if record.timestamp:
-            time_str = record.timestamp.strftime('%d.%m.%Y %H:%M')
-        time_label = CaptionLabel(
-            text=time_str,
-            size_hint_y=None,
-            height=dp(18),
-            halign='left',
-            text_size=(None, None)
-        )
-        time_label.bind(texture_size=time_label.setter('size'))
-        
-        info_layout.add_widget(doc_id_label)
-        info_layout.add_widget(status_label)
-        info_layout.add_widget(time_label)
-        
-        # Кнопки действий
-        actions_container = BoxLayout(
-            orientation='horizontal',
-            size_hint_x=None,
-            width=dp(120),
-            spacing=dp(6)
-        )
-        
-        # Кнопка просмотра деталей
-        view_button = SecondaryButton(
-            text='Детали',
-            size_hint_x=None,
-            width=dp(55),
-            height=dp(36),
-            font_size=dp(11),
-            on_press=lambda x, r=record: self.view_details(r)
-        )
-        
-        # Кнопка удаления
-        delete_button = SecondaryButton(
-            text='Удалить',
-            size_hint_x=None,
-            width=dp(55),
-            height=dp(36),
-            font_size=dp(11),
-            on_press=lambda x, r=record: self.delete_record(r)
-        )
-        
-        actions_container.add_widget(view_button)
-        actions_container.add_widget(delete_button)
-        
-        info_container.add_widget(status_indicator)
-        info_container.add_widget(info_layout)
-        info_container.add_widget(actions_container)
-        
-        card.add_widget(info_container)
-        card.record = record  # Сохраняем запись для доступа
-        return card
-    
-    
-    def on_card_touch(self, instance, touch):
-        """Обработка касания карточки"""
-        if instance.collide_point(*touch.pos) and touch.is_double_tap:
-            # Двойное касание для просмотра деталей
-            if hasattr(instance, 'record'):
-                self.view_details(instance.record)
-            return True
-        return False
-    
     def view_details(self, record: VerificationRecord):
         """Просмотр деталей записи"""
         # Создаем DocumentModel из записи
@@ -360,12 +202,7 @@ class HistoryScreen(Screen):
             issuer=record.issuer
         )
         
-        # Переходим на экран деталей
-        if 'document_detail' not in [screen.name for screen in self.manager.screens]:
-            from view.document_detail_screen import DocumentDetailScreen
-            detail_screen = DocumentDetailScreen(name='document_detail')
-            self.manager.add_widget(detail_screen)
-        
+        # Переходим на экран деталей (создается менеджером при первом обращении)
         detail_screen = self.manager.get_screen('document_detail')
         detail_screen.show_document(document)
         self.manager.current = 'document_detail'
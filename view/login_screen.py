@@ -10,7 +10,7 @@ from kivy.logger import Logger
 from kivy.metrics import dp
 
 from security.biometric_auth import BiometricAuth
-from security.pin_storage import PinStorage
+from security.session_credentials import get_session_credentials
 try:
     from design.modern_theme import (
         PRIMARY_COLOR, SURFACE_COLOR, BACKGROUND_COLOR, BORDER_RADIUS,
@@ -30,7 +30,7 @@ class LoginScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.biometric_auth = BiometricAuth()
-        self.pin_storage = PinStorage()
+        self.credentials = get_session_credentials()
         
         self.build_ui()
     
@@ -165,13 +165,17 @@ class LoginScreen(Screen):
         self.add_widget(main_container)
     
     
+    def on_enter(self):
+        """Возврат на экран входа блокирует сессию"""
+        self.credentials.lock()
+    
     def login(self, instance):
         """Вход в приложение"""
         pin = self.pin_input.text.strip()
         
+        # Сохранение PIN-кода и загрузка его в память на время сессии
+        self.credentials.unlock(pin or None)
         if pin:
-            # Сохранение PIN-кода
-            self.pin_storage.save_pin(pin)
             Logger.info("LoginScreen: PIN-код сохранен")
         
         # Переход к экрану сканирования
@@ -188,6 +192,7 @@ class LoginScreen(Screen):
     def on_biometric_result(self, success: bool):
         """Обработка результата биометрической аутентификации"""
         if success:
+            self.credentials.unlock()
             # Переход к экрану сканирования
             self.manager.current = 'scanner'
             Logger.info("LoginScreen: Биометрический вход выполнен")
@@ -0,0 +1,208 @@
+"""
+Виртуализированный список записей журнала верификаций
+Создаются только видимые строки, при прокрутке они получают новые данные
+"""
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.properties import ObjectProperty
+from kivy.graphics import Color, RoundedRectangle
+from kivy.metrics import dp
+
+from design.components import SecondaryButton, BodyLabel, CaptionLabel, Card
+
+
+class RecordRow(RecycleDataViewBehavior, Card):
+    """Строка журнала с кнопками действий (виджеты создаются один раз)"""
+
+    record = ObjectProperty(None, allownone=True)
+    row_height = dp(90)
+    indicator_size = dp(32)
+    show_actions = True
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.rv = None
+        self.spacing = dp(6)
+        self.padding = [dp(12), dp(10)] if self.show_actions else [dp(12), dp(8)]
+
+        info_container = BoxLayout(orientation='horizontal', spacing=dp(10))
+
+        # Индикатор статуса: цвет меняется у той же инструкции Color
+        self.status_indicator = BoxLayout(
+            size_hint=(None, None),
+            size=(self.indicator_size, self.indicator_size),
+            pos_hint={'center_y': 0.5}
+        )
+        radius = self.indicator_size / 2
+        with self.status_indicator.canvas.before:
+            self.status_color_instruction = Color(0.5, 0.5, 0.5, 0.2)
+            self.status_circle = RoundedRectangle(
+                size=self.status_indicator.size,
+                pos=self.status_indicator.pos,
+                radius=[radius, radius, radius, radius]
+            )
+        self.status_indicator.bind(size=self._update_status_circle, pos=self._update_status_circle)
+
+        info_layout = BoxLayout(
+            orientation='vertical',
+            size_hint_x=0.75 if self.show_actions else 0.8,
+            spacing=dp(2)
+        )
+
+        self.doc_id_label = BodyLabel(
+            text='',
+            size_hint_y=None,
+            height=dp(24) if self.show_actions else dp(22),
+            halign='left',
+            bold=True
+        )
+        label_class = BodyLabel if self.show_actions else CaptionLabel
+        self.status_label = label_class(
+            text='',
+            size_hint_y=None,
+            height=dp(20) if self.show_actions else dp(18),
+            halign='left'
+        )
+        info_layout.add_widget(self.doc_id_label)
+        info_layout.add_widget(self.status_label)
+
+        self.time_label = None
+        if self.show_actions:
+            self.time_label = CaptionLabel(
+                text='',
+                size_hint_y=None,
+                height=dp(18),
+                halign='left'
+            )
+            info_layout.add_widget(self.time_label)
+
+        info_container.add_widget(self.status_indicator)
+        info_container.add_widget(info_layout)
+
+        if self.show_actions:
+            actions_container = BoxLayout(
+                orientation='horizontal',
+                size_hint_x=None,
+                width=dp(120),
+                spacing=dp(6)
+            )
+            actions_container.add_widget(SecondaryButton(
+                text='Детали',
+                size_hint_x=None,
+                width=dp(55),
+                height=dp(36),
+                font_size=dp(11),
+                on_press=lambda x: self._dispatch('on_details')
+            ))
+            actions_container.add_widget(SecondaryButton(
+                text='Удалить',
+                size_hint_x=None,
+                width=dp(55),
+                height=dp(36),
+                font_size=dp(11),
+                on_press=lambda x: self._dispatch('on_delete')
+            ))
+            info_container.add_widget(actions_container)
+
+        self.add_widget(info_container)
+
+    def _update_status_circle(self, instance, value):
+        self.status_circle.size = instance.size
+        self.status_circle.pos = instance.pos
+
+    def _dispatch(self, callback_name):
+        """Передача действия над записью владельцу списка"""
+        callback = getattr(self.rv, callback_name, None) if self.rv else None
+        if callback and self.record is not None:
+            callback(self.record)
+
+    def refresh_view_attrs(self, rv, index, data):
+        """Привязка строки к новым данным при прокрутке"""
+        self.rv = rv
+        return super().refresh_view_attrs(rv, index, data)
+
+    def on_record(self, instance, record):
+        """Обновление содержимого строки под запись"""
+        if record is None or self.rv is None:
+            return
+
+        status_color = self.rv.status_color(record.status)
+        self.status_color_instruction.rgba = (status_color[0], status_color[1], status_color[2], 0.2)
+
+        self.doc_id_label.text = record.document_id
+        self.status_label.text = self.rv.status_text(record.status)
+        self.status_label.color = (status_color[0], status_color[1], status_color[2], 1.0)
+
+        if self.time_label is not None:
+            time_str = record.timestamp.strftime('%d.%m.%Y %H:%M') if record.timestamp else ''
+            if record.seen_count > 1:
+                time_str += f'  (повторно x{record.seen_count - 1})'
+            self.time_label.text = time_str
+
+    def on_touch_down(self, touch):
+        """Двойное касание открывает детали записи"""
+        if self.collide_point(*touch.pos) and touch.is_double_tap:
+            self._dispatch('on_details')
+            return True
+        return super().on_touch_down(touch)
+
+
+class CompactRecordRow(RecordRow):
+    """Компактная строка без кнопок (результаты поиска)"""
+
+    row_height = dp(70)
+    indicator_size = dp(24)
+    show_actions = False
+
+
+class RecordList(RecycleView):
+    """Список записей журнала на RecycleView"""
+
+    def __init__(
+        self,
+        status_color,
+        status_text,
+        on_details=None,
+        on_delete=None,
+        row_class=RecordRow,
+        **kwargs
+    ):
+        """
+        Инициализация списка
+
+        Args:
+            status_color: Функция статус -> (R, G, B)
+            status_text: Функция статус -> текст
+            on_details: Обработчик просмотра деталей записи
+            on_delete: Обработчик удаления записи
+            row_class: Класс строки (RecordRow или CompactRecordRow)
+        """
+        super().__init__(**kwargs)
+        self.status_color = status_color
+        self.status_text = status_text
+        self.on_details = on_details
+        self.on_delete = on_delete
+
+        layout = RecycleBoxLayout(
+            orientation='vertical',
+            default_size=(None, row_class.row_height),
+            default_size_hint=(1, None),
+            size_hint_y=None,
+            spacing=dp(12),
+            padding=[dp(8), dp(8)]
+        )
+        layout.bind(minimum_height=layout.setter('height'))
+        self.add_widget(layout)
+        self.viewclass = row_class
+
+    def set_records(self, records):
+        """
+        Замена данных списка (виджеты строк не пересоздаются)
+
+        Args:
+            records: Список VerificationRecord
+        """
+        self.data = [{'record': record} for record in records]
+        self.scroll_y = 1
@@ -33,22 +33,6 @@ except ImportError:
         INPUT_HEIGHT, BUTTON_HEIGHT, CARD_PADDING, CARD_SPACING, TEXT_PRIMARY, TEXT_SECONDARY
     )
 
-# Попытка импорта pyzbar
-try:
-    from pyzbar import pyzbar
-except (ImportError, FileNotFoundError, OSError):
-    pyzbar = None
-    Logger.warning("Scanner: pyzbar недоступен")
-
-# Попытка импорта PIL
-try:
-    from PIL import Image as PILImage
-    PIL_AVAILABLE = True
-except ImportError:
-    PILImage = None
-    PIL_AVAILABLE = False
-    Logger.warning("Scanner: PIL/Pillow недоступен")
-
 # Попытка импорта OpenCV для камеры на Windows
 try:
     import cv2
@@ -58,17 +42,14 @@ except ImportError:
     CV2_AVAILABLE = False
     Logger.info("Scanner: OpenCV недоступен")
 
-import io
 import threading
-try:
-    import numpy as np
-    NUMPY_AVAILABLE = True
-except ImportError:
-    np = None
-    NUMPY_AVAILABLE = False
+import time
 
+import config
 from viewmodel.scanner_viewmodel import ScannerViewModel
 from model.document_model import DocumentModel
+from services.qr_decoder import get_qr_decoder
+from security.session_credentials import get_session_credentials
 
 
 class ScannerScreen(Screen):
@@ -80,14 +61,21 @@ class ScannerScreen(Screen):
         self.viewmodel.on_status_changed = self.on_document_verified
         self.viewmodel.on_error = self.on_verification_error
         self.viewmodel.on_loading = self.on_loading_changed
+        self.viewmodel.on_batch_verified = self.on_batch_verified
         
         self.camera = None
         self.cv2_camera = None
         self.cv2_image = None
+        self.cv2_texture = None
+        self.qr_decoder = get_qr_decoder()
         self.scanning = False
         self.status_light = None
-        self.cv2_thread_running = False
+        self.cv2_thread = None
+        self.cv2_stop = None  # threading.Event остановки текущего потока кадров
+        self.last_activity = time.monotonic()
         self.last_verified_document = None
+        self.multi_scan = False
+        self.burst_codes = []
         
         self.build_ui()
     
@@ -165,20 +153,13 @@ class ScannerScreen(Screen):
         # Пробуем OpenCV камеру
         if not self.camera_available and CV2_AVAILABLE:
             try:
-                self.cv2_camera = cv2.VideoCapture(0)
-                if self.cv2_camera.isOpened():
-                    self.cv2_camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-                    self.cv2_camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+                # Камера открывается для проверки, поток кадров запускается в on_enter
+                if self._open_cv2_camera():
                     self.camera_available = True
                     Logger.info("Scanner: Камера OpenCV инициализирована")
                     
                     self.cv2_image = Image(size_hint=(1, 1))
                     camera_container.add_widget(self.cv2_image)
-                    
-                    self.cv2_thread_running = True
-                    threading.Thread(target=self._update_cv2_frame, daemon=True).start()
-                else:
-                    self.cv2_camera = None
             except Exception as e:
                 Logger.warning(f"Scanner: Ошибка OpenCV камеры: {e}")
                 self.camera_available = False
@@ -380,19 +361,27 @@ class ScannerScreen(Screen):
         
         self.history_button = SecondaryButton(
             text='История',
-            size_hint_x=0.5,
+            size_hint_x=0.35,
             on_press=self.go_to_history
         )
         
         self.export_button = SecondaryButton(
             text='Экспорт PDF',
-            size_hint_x=0.5,
+            size_hint_x=0.35,
             on_press=self.export_to_pdf,
             disabled=True  # Будет активирована после верификации
         )
         
+        # Пакетный режим: все QR-коды в кадре проверяются одним запросом
+        self.multi_button = SecondaryButton(
+            text='Пакет: выкл',
+            size_hint_x=0.3,
+            on_press=self.toggle_multi_scan
+        )
+        
         bottom_buttons.add_widget(self.history_button)
         bottom_buttons.add_widget(self.export_button)
+        bottom_buttons.add_widget(self.multi_button)
         bottom_panel.add_widget(bottom_buttons)
         
         layout.add_widget(bottom_panel)
@@ -418,6 +407,13 @@ class ScannerScreen(Screen):
         """Запуск сканирования"""
         if self.camera_available:
             try:
+                self.last_activity = time.monotonic()
+                # Камера могла быть освобождена по простою
+                if self.cv2_image and not self.cv2_thread_running:
+                    if not self.start_camera():
+                        self.status_text_label.text = 'Не удалось открыть камеру'
+                        return
+                
                 self.scanning = True
                 self.start_button.text = 'Остановить'
                 self.status_text_label.text = 'Сканирование...'
@@ -441,6 +437,8 @@ class ScannerScreen(Screen):
     def stop_scanning(self):
         """Остановка сканирования"""
         self.scanning = False
+        Clock.unschedule(self._finish_burst)
+        self.burst_codes = []
         
         if self.camera:
             self.camera.play = False
@@ -453,68 +451,168 @@ class ScannerScreen(Screen):
         
         Logger.info("Scanner: Сканирование остановлено")
     
-    def _update_cv2_frame(self):
-        """Обновление кадров с OpenCV камеры"""
-        from kivy.clock import Clock
-        import time
-        while hasattr(self, 'cv2_thread_running') and self.cv2_thread_running and self.cv2_camera:
+    def _open_cv2_camera(self) -> bool:
+        """Открытие камеры OpenCV"""
+        camera = cv2.VideoCapture(0)
+        if not camera.isOpened():
+            camera.release()
+            return False
+        camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+        camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        self.cv2_camera = camera
+        return True
+    
+    def start_camera(self) -> bool:
+        """
+        Захват камеры и запуск потока кадров (OpenCV)
+        
+        Returns:
+            True если камера работает
+        """
+        if not self.cv2_image:
+            return self.camera_available
+        if self.cv2_thread_running:
+            return True
+        
+        # Прежний поток мог зависнуть в camera.read() дольше ожидания в release_camera:
+        # вторую камеру и второй поток при нем не запускаем, повторим позже
+        previous = self.cv2_thread
+        if previous is not None and previous.is_alive():
+            Logger.warning("Scanner: Прежний поток кадров еще не завершился")
+            Clock.unschedule(self._retry_start_camera)
+            Clock.schedule_once(self._retry_start_camera, 0.5)
+            return False
+        
+        if self.cv2_camera is None:
             try:
-                ret, frame = self.cv2_camera.read()
-                if ret and PIL_AVAILABLE:
-                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    frame_flipped = cv2.flip(frame_rgb, 0)
-                    pil_image = PILImage.fromarray(frame_flipped)
-                    
-                    Clock.schedule_once(lambda dt: self._update_cv2_texture(pil_image), 0)
+                if not self._open_cv2_camera():
+                    Logger.warning("Scanner: Камера OpenCV не открылась")
+                    return False
+            except Exception as e:
+                Logger.warning(f"Scanner: Ошибка OpenCV камеры: {e}")
+                return False
+        
+        self.last_activity = time.monotonic()
+        # Поток владеет камерой и освобождает её при выходе из цикла;
+        # у каждого потока свое событие остановки
+        self.cv2_stop = threading.Event()
+        self.cv2_thread = threading.Thread(
+            target=self._update_cv2_frame,
+            args=(self.cv2_camera, self.cv2_stop),
+            daemon=True
+        )
+        self.cv2_thread.start()
+        Clock.schedule_interval(self._check_camera_idle, 5)
+        Logger.info("Scanner: Камера захвачена")
+        return True
+    
+    @property
+    def cv2_thread_running(self) -> bool:
+        """Работает ли поток кадров и не получил ли он команду остановки"""
+        return self.cv2_stop is not None and not self.cv2_stop.is_set()
+    
+    def _retry_start_camera(self, dt):
+        """Повторный захват камеры, если экран все еще открыт"""
+        if self.manager and self.manager.current == self.name:
+            self.start_camera()
+    
+    def release_camera(self):
+        """Остановка потока кадров и освобождение камеры"""
+        Clock.unschedule(self._check_camera_idle)
+        Clock.unschedule(self._retry_start_camera)
+        if self.camera:
+            self.camera.play = False
+        if not self.cv2_thread_running and self.cv2_camera is None:
+            return
+        
+        thread = self.cv2_thread
+        if self.cv2_thread_running:
+            self.cv2_stop.set()
+            # Ссылка на поток сохраняется: start_camera не запустит новый, пока он жив
+            thread.join(timeout=1.0)
+        elif self.cv2_camera is not None:
+            # Камера открыта в build_ui, но поток еще не запускался
+            self.cv2_camera.release()
+        self.cv2_camera = None
+        Logger.info("Scanner: Камера освобождена")
+    
+    def _check_camera_idle(self, dt):
+        """Автоостановка камеры, если сканирование давно не запускалось"""
+        if self.scanning or config.CAMERA_IDLE_TIMEOUT <= 0:
+            return
+        if time.monotonic() - self.last_activity >= config.CAMERA_IDLE_TIMEOUT:
+            self.release_camera()
+            self.status_text_label.text = 'Камера приостановлена. Нажмите "Сканировать"'
+    
+    def on_touch_down(self, touch):
+        """Любое касание экрана продлевает работу камеры"""
+        self.last_activity = time.monotonic()
+        return super().on_touch_down(touch)
+    
+    def _update_cv2_frame(self, camera, stop):
+        """Поток кадров с OpenCV камеры"""
+        try:
+            self._read_cv2_frames(camera, stop)
+        finally:
+            camera.release()
+            # Поток завершился сам (ошибка чтения) - камеру можно захватить заново
+            stop.set()
+            if self.cv2_thread is threading.current_thread():
+                self.cv2_camera = None
+    
+    def _read_cv2_frames(self, camera, stop):
+        """Цикл чтения кадров с ограничением частоты превью"""
+        frame = None
+        while not stop.is_set():
+            frame_started = time.monotonic()
+            try:
+                # Чтение в один и тот же буфер кадра
+                ret, frame = camera.read(frame)
+                if ret:
+                    height, width = frame.shape[:2]
+                    frame_bytes = frame.tobytes()
+                    Clock.schedule_once(
+                        lambda dt, data=frame_bytes, size=(width, height): self._update_cv2_texture(data, size),
+                        0
+                    )
                     
-                    if self.scanning and PIL_AVAILABLE:
-                        document_id = None
-                        
-                        if pyzbar:
-                            try:
-                                barcodes = pyzbar.decode(pil_image)
-                                if barcodes:
-                                    document_id = barcodes[0].data.decode('utf-8')
-                                    Logger.info(f"Scanner: Найден код через pyzbar: {document_id}")
-                            except:
-                                pass
-                        
-                        if not document_id and CV2_AVAILABLE:
-                            try:
-                                qr_detector = cv2.QRCodeDetector()
-                                retval, decoded_info, points, straight_qrcode = qr_detector.detectAndDecodeMulti(frame)
-                                if retval and decoded_info:
-                                    for info in decoded_info:
-                                        if info:
-                                            document_id = info
-                                            Logger.info(f"Scanner: Найден код через OpenCV: {document_id}")
-                                            break
-                            except:
-                                pass
-                        
+                    if self.scanning and self.multi_scan:
+                        codes = self.qr_decoder.decode_frame_all(frame)
+                        if codes:
+                            Clock.schedule_once(lambda dt, found=codes: self._collect_codes(found), 0)
+                    elif self.scanning:
+                        document_id = self.qr_decoder.decode_frame(frame)
                         if document_id:
                             Clock.schedule_once(lambda dt, doc_id=document_id: self._process_qr_code(doc_id), 0)
                 
-                time.sleep(0.033)
+                interval = 1.0 / max(config.CAMERA_PREVIEW_FPS, 1)
+                stop.wait(max(0.0, interval - (time.monotonic() - frame_started)))
             except Exception as e:
                 Logger.error(f"Scanner: Ошибка обновления кадра: {e}")
                 break
     
-    def _update_cv2_texture(self, pil_image):
-        """Обновление текстуры изображения OpenCV"""
+    def _update_cv2_texture(self, frame_bytes, size):
+        """Обновление текстуры изображения OpenCV (текстура создаётся один раз)"""
         if hasattr(self, 'cv2_image') and self.cv2_image:
             try:
-                from kivy.core.image import Image as CoreImage
-                import io
-                img_bytes = io.BytesIO()
-                pil_image.save(img_bytes, format='png')
-                img_bytes.seek(0)
-                self.cv2_image.texture = CoreImage(img_bytes, ext='png').texture
+                if self.cv2_texture is None or tuple(self.cv2_texture.size) != tuple(size):
+                    from kivy.graphics.texture import Texture
+                    self.cv2_texture = Texture.create(size=size, colorfmt='bgr')
+                    # Кадры OpenCV идут сверху вниз, текстуры Kivy - снизу вверх
+                    self.cv2_texture.flip_vertical()
+                self.cv2_texture.blit_buffer(frame_bytes, colorfmt='bgr', bufferfmt='ubyte')
+                if self.cv2_image.texture is not self.cv2_texture:
+                    self.cv2_image.texture = self.cv2_texture
+                self.cv2_image.canvas.ask_update()
             except Exception as e:
                 Logger.error(f"Scanner: Ошибка обновления текстуры: {e}")
     
     def _process_qr_code(self, document_id):
         """Обработка найденного QR-кода"""
+        # Кадры, поставленные в очередь до остановки сканирования, игнорируются
+        if not self.scanning:
+            return
+        
         # Валидация перед обработкой
         if not document_id or len(document_id.strip()) < 3:
             self.status_text_label.text = 'Неверный формат QR-кода'
@@ -522,64 +620,72 @@ class ScannerScreen(Screen):
         
         self.stop_scanning()
         self.status_text_label.text = 'Верификация...'
-        from security.pin_storage import PinStorage
-        pin_storage = PinStorage()
-        pin_code = pin_storage.get_pin()
+        pin_code = get_session_credentials().get_pin()
         self.viewmodel.verify_document(document_id.strip(), pin_code)
     
+    def toggle_multi_scan(self, instance):
+        """Переключение пакетного режима сканирования"""
+        self.multi_scan = not self.multi_scan
+        self.multi_button.text = 'Пакет: вкл' if self.multi_scan else 'Пакет: выкл'
+        if self.scanning:
+            self.stop_scanning()
+        self.status_text_label.text = (
+            'Пакетный режим: наведите камеру на лоток с документами'
+            if self.multi_scan else 'Наведите камеру на QR-код'
+        )
+    
+    def _collect_codes(self, codes):
+        """Накопление кодов серии кадров в пакетном режиме"""
+        if not self.scanning:
+            return
+        
+        started = bool(self.burst_codes)
+        for code in codes:
+            code = code.strip()
+            if len(code) >= 3 and code not in self.burst_codes and len(self.burst_codes) < config.MULTI_SCAN_MAX_CODES:
+                self.burst_codes.append(code)
+        
+        if not self.burst_codes:
+            return
+        
+        # Серия начинается с первого найденного кода и длится фиксированное время
+        if not started:
+            Clock.schedule_once(self._finish_burst, config.MULTI_SCAN_BURST_SECONDS)
+        self.status_text_label.text = f'Найдено кодов: {len(self.burst_codes)}...'
+    
+    def _finish_burst(self, dt):
+        """Завершение серии кадров и отправка пакета на верификацию"""
+        codes = list(self.burst_codes)
+        self.stop_scanning()
+        if not codes:
+            return
+        
+        self.status_text_label.text = f'Пакетная верификация ({len(codes)})...'
+        pin_code = get_session_credentials().get_pin()
+        self.viewmodel.verify_documents_batch(codes, pin_code)
+    
     def scan_qr_code(self, dt):
         """Сканирование QR-кода с камеры (для стандартной камеры Kivy)"""
-        if self.cv2_camera:
+        if self.cv2_image:
             return
         
         if not self.camera or not self.camera_available or not self.camera.texture:
             return
         
-        if not PIL_AVAILABLE:
-            return
-        
         try:
             texture = self.camera.texture
-            size = texture.size
-            pixels = texture.pixels
-            
-            pil_image = PILImage.frombytes('RGBA', size, pixels)
-            pil_image = pil_image.convert('RGB')
-            
-            document_id = None
+            if self.multi_scan:
+                codes = self.qr_decoder.decode_texture_all(texture.pixels, texture.size)
+                if codes:
+                    self._collect_codes(codes)
+                return
             
-            if pyzbar:
-                try:
-                    barcodes = pyzbar.decode(pil_image)
-                    if barcodes:
-                        document_id = barcodes[0].data.decode('utf-8')
-                        Logger.info(f"Scanner: Найден код через pyzbar: {document_id}")
-                except:
-                    pass
-            
-            if not document_id and CV2_AVAILABLE:
-                try:
-                    import numpy as np
-                    frame = np.array(pil_image)
-                    frame_bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-                    
-                    qr_detector = cv2.QRCodeDetector()
-                    retval, decoded_info, points, straight_qrcode = qr_detector.detectAndDecodeMulti(frame_bgr)
-                    if retval and decoded_info:
-                        for info in decoded_info:
-                            if info:
-                                document_id = info
-                                Logger.info(f"Scanner: Найден код через OpenCV: {document_id}")
-                                break
-                except Exception as e:
-                    Logger.debug(f"Scanner: Ошибка сканирования QR через OpenCV: {e}")
+            document_id = self.qr_decoder.decode_texture(texture.pixels, texture.size)
             
             if document_id:
                 self.stop_scanning()
                 self.status_text_label.text = 'Верификация...'
-                from security.pin_storage import PinStorage
-                pin_storage = PinStorage()
-                pin_code = pin_storage.get_pin()
+                pin_code = get_session_credentials().get_pin()
                 self.viewmodel.verify_document(document_id, pin_code)
         
         except Exception as e:
@@ -595,9 +701,7 @@ class ScannerScreen(Screen):
                     self.status_text_label.text = 'ID документа слишком короткий'
                     return
                 self.status_text_label.text = 'Верификация...'
-                from security.pin_storage import PinStorage
-                pin_storage = PinStorage()
-                pin_code = pin_storage.get_pin()
+                pin_code = get_session_credentials().get_pin()
                 self.viewmodel.verify_document(document_id, pin_code)
                 # Очищаем поле ввода после начала верификации
                 self.qr_input.text = ''
@@ -631,6 +735,9 @@ class ScannerScreen(Screen):
         
         # Формирование детальной информации - компактное отображение
         details = []
+        # Пометка офлайн-проверки (например, совпадение с фильтром отзыва)
+        if isinstance(document.metadata, dict) and document.metadata.get('notice'):
+            details.append(document.metadata['notice'])
         if document.document_type:
             # Сокращаем длинные типы документов
             doc_type = document.document_type
@@ -645,12 +752,13 @@ class ScannerScreen(Screen):
             details.append(f"Выдан: {issuer}")
         if document.expiry_date:
             from datetime import date
-            if isinstance(document.expiry_date, date):
-                days_left = (document.expiry_date - date.today()).days
+            expiry = document.expiry
+            if expiry is not None:
+                days_left = (expiry - date.today()).days
                 if days_left > 0:
-                    details.append(f"До: {document.expiry_date.strftime('%d.%m.%Y')} ({days_left}д)")
+                    details.append(f"До: {expiry.strftime('%d.%m.%Y')} ({days_left}д)")
                 else:
-                    details.append(f"Истек: {document.expiry_date.strftime('%d.%m.%Y')}")
+                    details.append(f"Истек: {expiry.strftime('%d.%m.%Y')}")
             else:
                 expiry_str = str(document.expiry_date)
                 if len(expiry_str) > 15:
@@ -680,11 +788,11 @@ class ScannerScreen(Screen):
         if hasattr(self, 'export_button'):
             self.export_button.disabled = False
         
-        # Кэширование для офлайн режима
+        # Кэширование для офлайн режима (ответ самого кэша обратно не пишется)
         try:
             from services.offline_cache import OfflineCache
-            cache = OfflineCache()
-            cache.cache_document(document)
+            if not (isinstance(document.metadata, dict) and document.metadata.get('offline')):
+                OfflineCache().cache_document(document)
         except Exception as e:
             Logger.warning(f"Scanner: Не удалось закэшировать документ: {e}")
         
@@ -693,6 +801,73 @@ class ScannerScreen(Screen):
             anim = Animation(size=(dp(45), dp(45)), duration=0.3) + Animation(size=(dp(40), dp(40)), duration=0.3)
             anim.start(self.status_light)
     
+    def on_batch_verified(self, documents):
+        """Отображение результатов пакетной верификации списком"""
+        from collections import Counter
+        from kivy.uix.popup import Popup
+        from kivy.uix.scrollview import ScrollView
+        from kivy.uix.gridlayout import GridLayout
+        from design.components import BodyLabel, CaptionLabel, PrimaryButton
+        
+        counts = Counter(
+            'error' if (doc.metadata and isinstance(doc.metadata, dict) and doc.metadata.get('error')) else doc.status
+            for doc in documents
+        )
+        self.status_text_label.text = (
+            f"Проверено: {len(documents)} | подлинных: {counts.get('valid', 0)} | "
+            f"предупреждений: {counts.get('warning', 0)} | "
+            f"недействительных: {counts.get('invalid', 0) + counts.get('error', 0)}"
+        )
+        
+        results_layout = GridLayout(cols=1, spacing=dp(6), size_hint_y=None, padding=[dp(4), dp(4)])
+        results_layout.bind(minimum_height=results_layout.setter('height'))
+        
+        for document in documents:
+            error = document.metadata.get('error') if isinstance(document.metadata, dict) else None
+            color = self.viewmodel.get_status_color(document.status)
+            row = BoxLayout(orientation='vertical', size_hint_y=None, height=dp(44))
+            row.add_widget(BodyLabel(
+                text=document.document_id,
+                size_hint_y=None,
+                height=dp(22),
+                halign='left',
+                bold=True
+            ))
+            row.add_widget(CaptionLabel(
+                text=error or self.viewmodel.get_status_text(document.status),
+                size_hint_y=None,
+                height=dp(18),
+                halign='left',
+                color=(color[0], color[1], color[2], 1.0)
+            ))
+            results_layout.add_widget(row)
+        
+        scroll = ScrollView()
+        scroll.add_widget(results_layout)
+        
+        content = BoxLayout(orientation='vertical', padding=dp(10), spacing=dp(10))
+        content.add_widget(scroll)
+        close_btn = PrimaryButton(text='OK', size_hint_y=None, height=dp(40))
+        content.add_widget(close_btn)
+        
+        popup = Popup(
+            title=f'Результаты проверки ({len(documents)})',
+            content=content,
+            size_hint=(0.9, 0.8)
+        )
+        close_btn.bind(on_press=popup.dismiss)
+        popup.open()
+        
+        # Кэширование успешно проверенных документов для офлайн режима
+        try:
+            from services.offline_cache import OfflineCache
+            cache = OfflineCache()
+            for document in documents:
+                if not (isinstance(document.metadata, dict) and document.metadata.get('error')):
+                    cache.cache_document(document)
+        except Exception as e:
+            Logger.warning(f"Scanner: Не удалось закэшировать документы: {e}")
+    
     def on_loading_changed(self, loading: bool):
         """Обработка изменения состояния загрузки"""
         if loading:
@@ -760,9 +935,9 @@ class ScannerScreen(Screen):
             return
         
         try:
-            from services.pdf_export import PDFExportService
+            from services.pdf_export import get_pdf_export_service
             from design.components import PrimaryButton
-            export_service = PDFExportService()
+            export_service = get_pdf_export_service()
             pdf_path = export_service.export_verification_result(self.last_verified_document)
             
             if pdf_path:
@@ -796,11 +971,21 @@ class ScannerScreen(Screen):
             Logger.error(f"Scanner: Ошибка экспорта PDF: {e}")
             self.status_text_label.text = f'Ошибка: {str(e)}'
     
+    def on_enter(self):
+        """Вызывается при входе на экран: захват камеры"""
+        self.start_camera()
+    
     def on_leave(self):
-        """Вызывается при уходе с экрана"""
+        """Вызывается при уходе с экрана: камера освобождается"""
         self.stop_scanning()
-        if hasattr(self, 'cv2_thread_running'):
-            self.cv2_thread_running = False
-        if self.cv2_camera:
-            self.cv2_camera.release()
-            self.cv2_camera = None
+        self.release_camera()
+    
+    def on_app_pause(self):
+        """Приложение свернуто"""
+        self.stop_scanning()
+        self.release_camera()
+    
+    def on_app_resume(self):
+        """Приложение развернуто"""
+        if self.manager and self.manager.current == self.name:
+            self.start_camera()
@@ -0,0 +1,53 @@
+"""
+Менеджер экранов с ленивым созданием
+Экран (и модуль с его зависимостями) создается при первом переходе на него
+"""
+import importlib
+import time
+from typing import Callable, Dict, Optional
+from kivy.uix.screenmanager import ScreenManager
+from kivy.logger import Logger
+
+
+class LazyScreenManager(ScreenManager):
+    """ScreenManager, строящий зарегистрированные экраны по требованию"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._factories: Dict[str, Callable] = {}
+        self.build_times: Dict[str, float] = {}
+    
+    def register(self, name: str, factory: Optional[Callable] = None, module: Optional[str] = None,
+                 class_name: Optional[str] = None):
+        """
+        Регистрация экрана без его создания
+        
+        Args:
+            name: Имя экрана
+            factory: Функция name -> Screen
+            module: Модуль экрана (импортируется только при первом переходе)
+            class_name: Класс экрана в модуле
+        """
+        if factory is None:
+            def factory(screen_name, module=module, class_name=class_name):
+                screen_class = getattr(importlib.import_module(module), class_name)
+                return screen_class(name=screen_name)
+        self._factories[name] = factory
+    
+    def _build_screen(self, name: str):
+        """Создание зарегистрированного экрана"""
+        factory = self._factories.pop(name)
+        started = time.perf_counter()
+        screen = factory(name)
+        self.build_times[name] = time.perf_counter() - started
+        self.add_widget(screen)
+        Logger.info(f"LazyScreenManager: Экран '{name}' создан за {self.build_times[name] * 1000:.0f} мс")
+        return screen
+    
+    def has_screen(self, name):
+        return name in self._factories or super().has_screen(name)
+    
+    def get_screen(self, name):
+        if name in self._factories and not super().has_screen(name):
+            return self._build_screen(name)
+        return super().get_screen(name)
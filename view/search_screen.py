@@ -4,8 +4,6 @@
 """
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.scrollview import ScrollView
-from kivy.uix.gridlayout import GridLayout
 from kivy.uix.textinput import TextInput
 from kivy.logger import Logger
 from kivy.metrics import dp
@@ -14,6 +12,7 @@ from kivy.clock import Clock
 
 from viewmodel.history_viewmodel import HistoryViewModel
 from model.document_model import VerificationRecord
+from view.record_list import RecordList, CompactRecordRow
 try:
     from design.modern_theme import (
         PRIMARY_COLOR, SURFACE_COLOR, BACKGROUND_COLOR, BORDER_RADIUS,
@@ -36,6 +35,7 @@ class SearchScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.viewmodel = HistoryViewModel()
+        self._search_event = None
         self.build_ui()
     
     def build_ui(self):
@@ -99,32 +99,48 @@ class SearchScreen(Screen):
         self.search_input = search_input
         layout.add_widget(search_input)
         
-        # Результаты поиска
-        scroll = ScrollView()
-        self.results_layout = GridLayout(
-            cols=1,
-            spacing=dp(12),
+        # Результаты поиска: виртуализированный список или заглушка
+        self.results_container = BoxLayout(orientation='vertical')
+        self.results_list = RecordList(
+            status_color=self.viewmodel.get_status_color,
+            status_text=self.viewmodel.get_status_text,
+            on_details=self.open_details,
+            row_class=CompactRecordRow
+        )
+        
+        self.no_results_card = Card(
             size_hint_y=None,
-            padding=[dp(8), dp(8)]
+            height=dp(80),
+            padding=[dp(20), dp(16)]
+        )
+        no_results_label = BodyLabel(
+            text='Ничего не найдено',
+            halign='center',
+            valign='middle',
+            text_size=(None, None)
         )
-        self.results_layout.bind(minimum_height=self.results_layout.setter('height'))
+        no_results_label.bind(texture_size=no_results_label.setter('size'))
+        self.no_results_card.add_widget(no_results_label)
         
-        scroll.add_widget(self.results_layout)
-        layout.add_widget(scroll)
+        self.results_container.add_widget(self.results_list)
+        layout.add_widget(self.results_container)
         
         self.add_widget(layout)
     
     def on_search_text(self, instance, text):
         """Обработка изменения текста поиска"""
         # Задержка для оптимизации
-        Clock.unschedule(self._perform_search)
-        Clock.schedule_once(lambda dt: self._perform_search(text), 0.3)
+        if self._search_event is not None:
+            self._search_event.cancel()
+        self._search_event = Clock.schedule_once(lambda dt: self._perform_search(text), 0.3)
     
     def _perform_search(self, query):
         """Выполнение поиска"""
-        self.results_layout.clear_widgets()
+        self.results_container.clear_widgets()
+        self.results_container.add_widget(self.results_list)
         
         if not query or len(query.strip()) < 2:
+            self.results_list.set_records([])
             return
         
         query_lower = query.lower().strip()
@@ -139,99 +155,20 @@ class SearchScreen(Screen):
         ]
         
         if not filtered:
-            no_results_card = Card(
-                size_hint_y=None,
-                height=dp(80),
-                padding=[dp(20), dp(16)]
-            )
-            no_results_label = BodyLabel(
-                text='Ничего не найдено',
-                halign='center',
-                valign='middle',
-                text_size=(None, None)
-            )
-            no_results_label.bind(texture_size=no_results_label.setter('size'))
-            no_results_card.add_widget(no_results_label)
-            self.results_layout.add_widget(no_results_card)
+            self.results_list.set_records([])
+            self.results_container.clear_widgets()
+            self.results_container.add_widget(self.no_results_card)
+            self.results_container.add_widget(BoxLayout())
             return
         
-        # Отображение результатов
-        for record in filtered[:50]:  # Ограничение до 50 результатов
-            record_widget = self.create_result_widget(record)
-            self.results_layout.add_widget(record_widget)
-    
-    def create_result_widget(self, record: VerificationRecord) -> Card:
-        """Создание виджета результата"""
-        card = Card(
-            size_hint_y=None,
-            height=dp(70),
-            spacing=dp(6),
-            padding=[dp(12), dp(8)]
-        )
-        
-        info_container = BoxLayout(orientation='horizontal', spacing=dp(10))
-        
-        # Индикатор статуса
-        status_color = self.viewmodel.get_status_color(record.status)
-        if len(status_color) == 3:
-            status_color_rgba = (status_color[0], status_color[1], status_color[2], 0.2)
-        else:
-            status_color_rgba = status_color[:3] + (0.2,)
-        
-        status_indicator = BoxLayout(
-            size_hint=(None, None),
-            size=(dp(24), dp(24)),
-            pos_hint={'center_y': 0.5}
-        )
-        
-        with status_indicator.canvas.before:
-            Color(*status_color_rgba)
-            status_circle = RoundedRectangle(
-                size=status_indicator.size,
-                pos=status_indicator.pos,
-                radius=[dp(12), dp(12), dp(12), dp(12)]
-            )
-        
-        # Информация
-        info_layout = BoxLayout(orientation='vertical', size_hint_x=0.8, spacing=dp(2))
-        
-        doc_id_label = BodyLabel(
-            text=record.document_id,
-            size_hint_y=None,
-            height=dp(22),
-            halign='left',
-            bold=True
-        )
-        
-        status_text = self.viewmodel.get_status_text(record.status)
-        status_label = CaptionLabel(
-            text=status_text,
-            size_hint_y=None,
-            height=dp(18),
-            halign='left',
-            color=status_color if len(status_color) >= 4 else status_color + (1.0,)
-        )
-        
-        info_layout.add_widget(doc_id_label)
-        info_layout.add_widget(status_label)
-        
-        info_container.add_widget(status_indicator)
-        info_container.add_widget(info_layout)
-        
-        card.add_widget(info_container)
-        card.record = record
-        card.bind(on_touch_down=lambda instance, touch: self.on_result_touch(instance, touch) if instance.collide_point(*touch.pos) and touch.is_double_tap else False)
-        
-        return card
+        # Отображение результатов (строки создаются только для видимой части)
+        self.results_list.set_records(filtered)
     
-    def on_result_touch(self, instance, touch):
-        """Обработка касания результата"""
-        if hasattr(instance, 'record'):
-            from view.history_screen import HistoryScreen
-            history_screen = self.manager.get_screen('history')
-            history_screen.view_details(instance.record)
-            self.manager.current = 'document_detail'
-        return True
+    def open_details(self, record: VerificationRecord):
+        """Открытие деталей найденной записи"""
+        history_screen = self.manager.get_screen('history')
+        history_screen.view_details(record)
+        self.manager.current = 'document_detail'
     
     def go_back(self, instance):
         """Возврат на предыдущий экран"""
@@ -9,7 +9,7 @@ from kivy.logger import Logger
 from kivy.metrics import dp
 from kivy.graphics import Color, Rectangle
 
-from security.pin_storage import PinStorage
+from security.session_credentials import get_session_credentials
 try:
     from design.modern_theme import PRIMARY_COLOR, BUTTON_HEIGHT
 except ImportError:
@@ -22,7 +22,7 @@ class SettingsScreen(Screen):
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.pin_storage = PinStorage()
+        self.credentials = get_session_credentials()
         self.build_ui()
     
     def build_ui(self):
@@ -100,7 +100,7 @@ class SettingsScreen(Screen):
     
     def clear_pin(self, instance):
         """Очистка сохраненного PIN-кода"""
-        if self.pin_storage.delete_pin():
+        if self.credentials.delete_pin():
             Logger.info("SettingsScreen: PIN-код удален")
     
     def go_back(self, instance):
@@ -7,6 +7,7 @@ from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.gridlayout import GridLayout
 from kivy.logger import Logger
+from kivy.clock import Clock
 from kivy.metrics import dp
 from kivy.graphics import Color, Rectangle, RoundedRectangle
 from datetime import datetime, timedelta
@@ -30,6 +31,10 @@ except ImportError:
 
 from design.components import PrimaryButton, SecondaryButton, TitleLabel, BodyLabel, CaptionLabel, Card
 
+# Издатели в карточке недействительных: сколько показывать и минимум проверок
+ISSUER_TOP = 5
+ISSUER_MIN_CHECKS = 3
+
 
 class StatisticsScreen(Screen):
     """Экран статистики и аналитики"""
@@ -37,6 +42,7 @@ class StatisticsScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.viewmodel = HistoryViewModel()
+        self._refreshing = False
         self.build_ui()
     
     def build_ui(self):
@@ -126,13 +132,57 @@ class StatisticsScreen(Screen):
         self.refresh_stats()
     
     def refresh_stats(self, instance=None):
-        """Обновление статистики"""
-        records = self.viewmodel.get_all_verifications()
+        """Обновление статистики: снимок журнала догружается в фоновом потоке"""
+        if self._refreshing:
+            return
+        self._refreshing = True
+        
+        if not self.stats_layout.children:
+            loading_label = BodyLabel(
+                text='Загрузка статистики...',
+                halign='center',
+                size_hint_y=None,
+                height=dp(60)
+            )
+            self.stats_layout.add_widget(loading_label)
+        
+        self.viewmodel.refresh_history_snapshot(
+            lambda snapshot: Clock.schedule_once(lambda dt: self._on_snapshot_ready(snapshot))
+        )
+    
+    def _on_snapshot_ready(self, snapshot):
+        """Вывод статистики по догруженному снимку (в главном потоке)"""
+        self._refreshing = False
+        
+        # Последние 7 дней
+        today = datetime.now().date()
+        last_7_days = [today - timedelta(days=i) for i in range(7)]
+        issuer_rates = []
+        
+        if snapshot is not None:
+            # Весь журнал: группировки по колонкам снимка
+            total = len(snapshot)
+            status_counts = snapshot.count_by('status')
+            daily_counts = snapshot.count_by_day(start=datetime.combine(last_7_days[-1], datetime.min.time()))
+            issuer_rates = [
+                item for item in snapshot.failure_rates('issuer', min_total=ISSUER_MIN_CHECKS)
+                if item[0] and item[2]
+            ][:ISSUER_TOP]
+        else:
+            records = self.viewmodel.get_all_verifications()
+            total = len(records)
+            status_counts = Counter(r.status for r in records)
+            daily_counts = Counter()
+            for record in records:
+                if record.timestamp:
+                    record_date = record.timestamp.date()
+                    if record_date in last_7_days:
+                        daily_counts[record_date] += 1
         
         # Очистка
         self.stats_layout.clear_widgets()
         
-        if not records:
+        if not total:
             no_data_card = Card(
                 size_hint_y=None,
                 height=dp(100),
@@ -149,23 +199,10 @@ class StatisticsScreen(Screen):
             self.stats_layout.add_widget(no_data_card)
             return
         
-        # Подсчет статистики
-        total = len(records)
-        status_counts = Counter(r.status for r in records)
         valid_count = status_counts.get('valid', 0)
         warning_count = status_counts.get('warning', 0)
         invalid_count = status_counts.get('invalid', 0)
         
-        # Статистика по дням (последние 7 дней)
-        today = datetime.now().date()
-        last_7_days = [today - timedelta(days=i) for i in range(7)]
-        daily_counts = Counter()
-        for record in records:
-            if record.timestamp:
-                record_date = record.timestamp.date()
-                if record_date in last_7_days:
-                    daily_counts[record_date] += 1
-        
         # Карточка общей статистики
         total_card = self.create_stat_card(
             'Всего проверок',
@@ -260,8 +297,39 @@ class StatisticsScreen(Screen):
         
         self.stats_layout.add_widget(activity_card)
         
+        if issuer_rates:
+            self.stats_layout.add_widget(self.create_issuer_card(issuer_rates))
+        
         Logger.info(f"StatisticsScreen: Статистика обновлена, всего записей: {total}")
     
+    def create_issuer_card(self, issuer_rates):
+        """Карточка издателей с наибольшей долей недействительных документов"""
+        card = Card(
+            size_hint_y=None,
+            height=dp(50) + dp(22) * len(issuer_rates),
+            padding=[dp(16), dp(12)]
+        )
+        card.add_widget(TitleLabel(
+            text='Недействительные по издателям',
+            size_hint_y=None,
+            height=dp(30)
+        ))
+        for issuer, checks, failures, rate in issuer_rates:
+            row = BoxLayout(orientation='horizontal', size_hint_y=None, height=dp(20), spacing=dp(8))
+            row.add_widget(CaptionLabel(
+                text=issuer if len(issuer) <= 30 else issuer[:27] + '...',
+                size_hint_x=0.6,
+                halign='left'
+            ))
+            row.add_widget(CaptionLabel(
+                text=f'{failures} из {checks} ({rate:.0%})',
+                size_hint_x=0.4,
+                halign='right',
+                color=STATUS_INVALID
+            ))
+            card.add_widget(row)
+        return card
+    
     def create_stat_card(self, title, value, color):
         """Создание карточки статистики"""
         card = Card(
@@ -303,18 +371,96 @@ class StatisticsScreen(Screen):
         return card
     
     def export_stats(self, instance):
-        """Экспорт статистики"""
+        """Экспорт сводного PDF-отчета по журналу"""
         Logger.info("StatisticsScreen: Экспорт статистики")
-        # Интеграция с экспортом в PDF будет добавлена
         from kivy.uix.popup import Popup
-        from kivy.uix.label import Label
+        from kivy.uix.progressbar import ProgressBar
+        
+        content = BoxLayout(orientation='vertical', padding=dp(10), spacing=dp(10))
+        self.export_label = BodyLabel(
+            text='Выберите период отчета',
+            halign='center'
+        )
+        self.export_progress = ProgressBar(max=1, value=0, size_hint_y=None, height=dp(24))
+        
+        self.export_buttons = BoxLayout(
+            orientation='horizontal',
+            size_hint_y=None,
+            height=dp(40),
+            spacing=dp(8)
+        )
+        self.export_buttons.add_widget(PrimaryButton(
+            text='За сегодня',
+            on_press=lambda x: self._start_export(today_only=True)
+        ))
+        self.export_buttons.add_widget(SecondaryButton(
+            text='Весь журнал',
+            on_press=lambda x: self._start_export(today_only=False)
+        ))
+        
+        self.export_close_button = SecondaryButton(text='Отмена', size_hint_y=None, height=dp(40))
+        
+        content.add_widget(self.export_label)
+        content.add_widget(self.export_progress)
+        content.add_widget(self.export_buttons)
+        content.add_widget(self.export_close_button)
         
-        popup = Popup(
-            title='Экспорт',
-            content=Label(text='Экспорт статистики будет доступен в следующей версии'),
-            size_hint=(0.8, 0.4)
+        self.export_job = None
+        self.export_popup = Popup(
+            title='Экспорт отчета',
+            content=content,
+            size_hint=(0.85, 0.45),
+            auto_dismiss=False
         )
-        popup.open()
+        self.export_close_button.bind(on_press=self._close_export)
+        self.export_popup.open()
+    
+    def _start_export(self, today_only):
+        """Запуск фонового экспорта за выбранный период"""
+        if self.export_job is not None and self.export_job.running:
+            return
+        
+        start = end = None
+        if today_only:
+            start = datetime.combine(datetime.now().date(), datetime.min.time())
+            end = start + timedelta(days=1)
+        
+        self.export_buttons.disabled = True
+        self.export_label.text = 'Подготовка отчета...'
+        self.export_job = self.viewmodel.start_report_export(
+            start,
+            end,
+            on_progress=lambda done, total: Clock.schedule_once(
+                lambda dt: self._on_export_progress(done, total)
+            ),
+            on_complete=lambda path: Clock.schedule_once(
+                lambda dt: self._on_export_complete(path)
+            )
+        )
+    
+    def _on_export_progress(self, done, total):
+        """Обновление прогресса (в главном потоке)"""
+        self.export_progress.max = max(total, 1)
+        self.export_progress.value = done
+        self.export_label.text = f'Обработано записей: {done} из {total}'
+    
+    def _on_export_complete(self, path):
+        """Завершение экспорта (в главном потоке)"""
+        job = self.export_job
+        self.export_close_button.text = 'Закрыть'
+        if path:
+            self.export_label.text = f'PDF создан:\n{path}'
+        elif job is not None and job.cancelled:
+            self.export_label.text = 'Экспорт отменен'
+        else:
+            self.export_label.text = 'Ошибка экспорта PDF\n(проверьте, установлен ли reportlab)'
+        self.export_buttons.disabled = False
+    
+    def _close_export(self, instance):
+        """Отмена выполняющегося экспорта и закрытие окна"""
+        if self.export_job is not None and self.export_job.running:
+            self.export_job.cancel()
+        self.export_popup.dismiss()
     
     def go_back(self, instance):
         """Возврат на предыдущий экран"""
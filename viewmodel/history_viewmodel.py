@@ -1,7 +1,9 @@
 """
 ViewModel для экрана истории верификаций
 """
-from typing import List
+import threading
+from datetime import datetime
+from typing import List, Optional
 from kivy.logger import Logger
 
 from model.document_model import VerificationRecord
@@ -15,18 +17,48 @@ class HistoryViewModel:
         """Инициализация ViewModel"""
         self.storage = Storage()
     
-    def get_all_verifications(self, limit: int = 100) -> List[VerificationRecord]:
+    def get_all_verifications(self, limit: Optional[int] = 100) -> List[VerificationRecord]:
         """
         Получение всех записей верификации
         
         Args:
-            limit: Максимальное количество записей
+            limit: Максимальное количество записей (None - без ограничения)
             
         Returns:
             Список записей
         """
         return self.storage.get_all_verifications(limit)
     
+    def refresh_history_snapshot(self, on_complete):
+        """
+        Догрузка колоночного снимка журнала в фоновом потоке
+        
+        Первое построение снимка на большом журнале занимает секунды,
+        поэтому в главном потоке не выполняется.
+        
+        Args:
+            on_complete: Функция (HistorySnapshot или None, если NumPy недоступен
+                или догрузка не удалась), вызывается из фонового потока
+            
+        Returns:
+            Запущенный поток
+        """
+        from model.history_snapshot import get_history_snapshot
+        
+        def run():
+            snapshot = get_history_snapshot(self.storage)
+            if snapshot is not None:
+                try:
+                    snapshot.refresh()
+                except Exception as e:
+                    Logger.error(f"HistoryViewModel: Ошибка догрузки снимка журнала: {e}")
+                    snapshot = None
+            on_complete(snapshot)
+        
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+    
     def delete_verification(self, record_id: int) -> bool:
         """
         Удаление записи о верификации
@@ -39,6 +71,27 @@ class HistoryViewModel:
         """
         return self.storage.delete_verification(record_id)
     
+    def start_report_export(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                            on_progress=None, on_complete=None):
+        """
+        Запуск фонового экспорта сводного PDF-отчета за период
+        
+        Args:
+            start: Начало периода (включительно)
+            end: Конец периода (не включительно)
+            on_progress: Функция (обработано, всего), вызывается из фонового потока
+            on_complete: Функция (путь или None), вызывается из фонового потока
+            
+        Returns:
+            ReportExportJob (для отмены)
+        """
+        from services.pdf_export import ReportExportJob
+        
+        job = ReportExportJob(self.storage, start, end, on_progress=on_progress, on_complete=on_complete)
+        job.start()
+        Logger.info(f"HistoryViewModel: Запущен экспорт отчета ({start} - {end})")
+        return job
+    
     def clear_all(self) -> bool:
         """
         Очистка всех записей
@@ -3,11 +3,13 @@ ViewModel для экрана сканирования
 """
 from kivy.clock import Clock
 from kivy.logger import Logger
-from typing import Optional, Callable
+from typing import Optional, Callable, List
 
 from model.document_model import DocumentModel, VerificationRecord
 from model.repository import ApiRepository
 from model.storage import Storage
+from services.recent_results import RecentResultsCache
+from security.session_credentials import get_session_credentials
 
 
 class ScannerViewModel:
@@ -17,19 +19,22 @@ class ScannerViewModel:
         """Инициализация ViewModel"""
         self.repository = ApiRepository()
         self.storage = Storage()
+        self.recent_results = RecentResultsCache()
         self.current_document: Optional[DocumentModel] = None
         self.on_status_changed: Optional[Callable] = None
+        self.on_batch_verified: Optional[Callable] = None  # Callback со списком DocumentModel
         self.on_error: Optional[Callable] = None
         self.on_loading: Optional[Callable] = None  # Callback для индикатора загрузки
         self.is_verifying = False
     
-    def verify_document(self, document_id: str, pin_code: Optional[str] = None):
+    def verify_document(self, document_id: str, pin_code: Optional[str] = None, use_cache: bool = True):
         """
         Верификация документа по ID
         
         Args:
             document_id: ID документа из QR-кода
             pin_code: PIN-код для аутентификации (если None, будет получен из хранилища)
+            use_cache: Отвечать из кэша недавних результатов, если документ недавно проверялся
         """
         # Валидация ввода
         document_id = document_id.strip() if document_id else ""
@@ -43,6 +48,10 @@ class ScannerViewModel:
                 self.on_error("ID документа слишком короткий")
             return
         
+        # Повторное сканирование того же кода: ответ из памяти, без сети и новой записи
+        if use_cache and self._answer_from_cache(document_id):
+            return
+        
         if self.is_verifying:
             Logger.warning("ViewModel: Верификация уже выполняется")
             return
@@ -56,9 +65,7 @@ class ScannerViewModel:
         
         # Если PIN не передан, пытаемся получить из хранилища
         if pin_code is None:
-            from security.pin_storage import PinStorage
-            pin_storage = PinStorage()
-            pin_code = pin_storage.get_pin()
+            pin_code = get_session_credentials().get_pin()
         
         # Запуск верификации в отдельном потоке (симуляция через Clock)
         Clock.schedule_once(
@@ -95,7 +102,8 @@ class ScannerViewModel:
                     document_type=document.document_type,
                     issuer=document.issuer
                 )
-                self.storage.save_verification(record)
+                record_id = self.storage.save_verification(record)
+                self.recent_results.put(document, record_id if record_id > 0 else None)
                 
                 # Уведомление View об изменении статуса
                 if self.on_status_changed:
@@ -133,6 +141,129 @@ class ScannerViewModel:
                 self.on_error(error_msg)
             Logger.error(f"ViewModel: {error_msg}")
     
+    def _answer_from_cache(self, document_id: str) -> bool:
+        """
+        Ответ на повторное сканирование из кэша недавних результатов
+        
+        Returns:
+            True если результат найден и отправлен во View
+        """
+        cached = self.recent_results.get(document_id)
+        if cached is None:
+            return False
+        
+        document, record_id = cached
+        if record_id is not None:
+            self.storage.mark_seen_again(record_id)
+        self.current_document = document
+        if self.on_status_changed:
+            self.on_status_changed(document)
+        Logger.info(f"ViewModel: Документ {document_id} недавно проверялся, ответ из кэша")
+        return True
+    
+    def verify_documents_batch(self, document_ids: List[str], pin_code: Optional[str] = None):
+        """
+        Пакетная верификация всех кодов, найденных за одно сканирование
+        
+        Args:
+            document_ids: ID документов (дубликаты и слишком короткие отбрасываются)
+            pin_code: PIN-код для аутентификации (если None, будет получен из хранилища)
+        """
+        unique_ids = []
+        for document_id in document_ids:
+            document_id = document_id.strip() if document_id else ""
+            if len(document_id) >= 3 and document_id not in unique_ids:
+                unique_ids.append(document_id)
+        
+        if not unique_ids:
+            if self.on_error:
+                self.on_error("Не найдено ни одного кода документа")
+            return
+        
+        if self.is_verifying:
+            Logger.warning("ViewModel: Верификация уже выполняется")
+            return
+        
+        # Недавно проверенные документы отвечаются из кэша, в сеть идут только остальные
+        cached = {}
+        for document_id in unique_ids:
+            hit = self.recent_results.get(document_id)
+            if hit is not None:
+                document, record_id = hit
+                if record_id is not None:
+                    self.storage.mark_seen_again(record_id)
+                cached[document_id] = document
+        missing_ids = [document_id for document_id in unique_ids if document_id not in cached]
+        
+        if not missing_ids:
+            if self.on_batch_verified:
+                self.on_batch_verified([cached[document_id] for document_id in unique_ids])
+            return
+        
+        Logger.info(f"ViewModel: Начало пакетной верификации, документов: {len(unique_ids)}")
+        self.is_verifying = True
+        
+        if self.on_loading:
+            self.on_loading(True)
+        
+        if pin_code is None:
+            pin_code = get_session_credentials().get_pin()
+        
+        Clock.schedule_once(
+            lambda dt: self._perform_batch_verification(unique_ids, missing_ids, cached, pin_code),
+            0.1
+        )
+    
+    def _perform_batch_verification(
+        self,
+        document_ids: List[str],
+        missing_ids: List[str],
+        cached: dict,
+        pin_code: Optional[str]
+    ):
+        """Выполнение пакетной верификации одним запросом"""
+        try:
+            documents = self.repository.verify_documents(missing_ids, pin_code)
+        except Exception as e:
+            documents = []
+            Logger.error(f"ViewModel: Ошибка пакетной верификации: {e}")
+        finally:
+            self.is_verifying = False
+            if self.on_loading:
+                self.on_loading(False)
+        
+        if not documents:
+            if self.on_error:
+                self.on_error("Не удалось получить ответ от сервера. Проверьте подключение к интернету.")
+            return
+        
+        # В журнал попадают только ответы без ошибки, как и при одиночной проверке
+        verified = [
+            document for document in documents
+            if not (document.metadata and isinstance(document.metadata, dict) and document.metadata.get('error'))
+        ]
+        record_ids = self.storage.save_verifications([
+            VerificationRecord(
+                document_id=document.document_id,
+                status=document.status,
+                document_type=document.document_type,
+                issuer=document.issuer
+            )
+            for document in verified
+        ])
+        for document, record_id in zip(verified, record_ids):
+            self.recent_results.put(document, record_id)
+        
+        # Порядок результатов совпадает с порядком найденных кодов
+        fetched = dict(zip(missing_ids, documents))
+        documents = [cached.get(document_id) or fetched.get(document_id) for document_id in document_ids]
+        documents = [document for document in documents if document is not None]
+        
+        if self.on_batch_verified:
+            self.on_batch_verified(documents)
+        
+        Logger.info(f"ViewModel: Пакетная верификация завершена, документов: {len(documents)}")
+    
     def get_status_color(self, status: str) -> tuple:
         """
         Получение цвета статуса (RGB)